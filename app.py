@@ -1,7 +1,42 @@
 from __future__ import annotations
 
 import os
+
+import gradio as gr
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
 from modules.ui.gradio_app import build_demo
+from modules.ui.serving import READINESS, start_warmup
+from modules.utils.tracing import start_metrics_server
+
+
+def create_app() -> FastAPI:
+    """
+    Gradio UI + 상태 엔드포인트.
+    - /healthz: 프로세스가 살아 있으면 200, warmup이 재시도까지 다 실패했으면 503 (liveness → 재시작)
+    - /readyz : warmup이 끝났으면 200, 아니면 503 (readiness) + 대기열/p95/거절 수
+    서버는 바로 뜨고 warmup(Qdrant/임베딩/BM25/reranker 로드)은 백그라운드에서 진행.
+    RAG_METRICS_PORT가 있으면 Prometheus /metrics도 여기서 띄움.
+    """
+    app = FastAPI()
+
+    @app.get("/healthz")
+    def healthz():
+        if READINESS.failed:
+            return JSONResponse({"ok": False, "error": READINESS.error}, status_code=503)
+        return {"ok": True}
+
+    @app.get("/readyz")
+    def readyz():
+        status = READINESS.status()
+        return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+    start_metrics_server()
+    start_warmup()
+    return gr.mount_gradio_app(app, build_demo(), path="/")
+
 
 if __name__ == "__main__":
     # 더미로 UI 확인하기 위한 기본값(원하면 쉘에서 export로 덮어쓰기)
@@ -11,5 +46,4 @@ if __name__ == "__main__":
     os.environ.setdefault("QDRANT_COLLECTION", "rfp_recursive_DUMMY")
     os.environ.setdefault("RAG_TOP_K", "3")
 
-    demo = build_demo()
-    demo.launch(server_name="0.0.0.0", server_port=7860)
+    uvicorn.run(create_app(), host="0.0.0.0", port=7860)
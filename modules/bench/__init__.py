@@ -0,0 +1 @@
+# 검색 성능 벤치마크 (python -m modules.bench.suite)
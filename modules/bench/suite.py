@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from modules.bench.synthetic import synthetic_chunks, synthetic_queries
+from modules.paths import PROJECT_ROOT
+from modules.utils.memory import current_rss_mb, peak_rss_mb
+
+
+# 시나리오 = 자식 프로세스에 줄 환경변수 묶음 (RetrieverSettings가 import 때 env를 읽어서 프로세스를 나눔)
+#   "_target": search(기본) | answer (answer_query = 검색 + dummy 생성)
+SCENARIOS: dict[str, dict[str, str]] = {
+    "qdrant": {"RETRIEVAL_BACKEND": "qdrant"},
+    "numpy": {"RETRIEVAL_BACKEND": "numpy"},
+    "qdrant_hybrid": {"RETRIEVAL_BACKEND": "qdrant", "RETRIEVAL_HYBRID": "1"},
+    "numpy_hybrid": {"RETRIEVAL_BACKEND": "numpy", "RETRIEVAL_HYBRID": "1"},
+    "qdrant_rerank": {"RETRIEVAL_BACKEND": "qdrant", "RERANK_BACKEND": "dummy"},
+    "numpy_rerank": {"RETRIEVAL_BACKEND": "numpy", "RERANK_BACKEND": "dummy"},
+    "numpy_answer": {"RETRIEVAL_BACKEND": "numpy", "GENERATOR_BACKEND": "dummy", "_target": "answer"},
+}
+
+
+def _env_list(name: str, default: str) -> tuple:
+    return tuple(s.strip() for s in os.getenv(name, default).split(",") if s.strip())
+
+
+@dataclass(frozen=True)
+class BenchSettings:
+    """
+    벤치마크 설정 (전부 env).
+    - sizes: 합성 컬렉션 크기들 (청크 수). 10k~1M
+    - scenarios: SCENARIOS 이름들
+    - concurrency: 동시 요청 수들 (1 = 쿼리 1개씩 순서대로)
+    - queries: workload마다 보내는 쿼리 수
+    - baseline / threshold: baseline JSON과 비교해서 threshold(비율) 넘게 나빠지면 회귀로 표시
+    """
+    sizes: tuple = tuple(int(s) for s in _env_list("BENCH_SIZES", "10000"))
+    scenarios: tuple = _env_list("BENCH_SCENARIOS", "qdrant,numpy,numpy_hybrid,numpy_rerank,numpy_answer")
+    concurrency: tuple = tuple(int(s) for s in _env_list("BENCH_CONCURRENCY", "1,8"))
+    queries: int = int(os.getenv("BENCH_QUERIES", "200"))
+    k: int = int(os.getenv("BENCH_TOP_K", "5"))
+    dim: int = int(os.getenv("BENCH_DIM", "384"))
+    out_path: str = os.getenv("BENCH_OUT", "outputs/bench/bench_latest.json")
+    baseline: Optional[str] = os.getenv("BENCH_BASELINE") or None
+    threshold: float = float(os.getenv("BENCH_REGRESSION_THRESHOLD", "0.2"))
+
+
+def _collection(size: int) -> str:
+    return f"bench_{size}"
+
+
+def _components(scenario: str) -> set[str]:
+    # 시나리오를 돌리는 데 필요한 인덱스
+    env = SCENARIOS[scenario]
+    needed = {env["RETRIEVAL_BACKEND"]}
+    if env.get("RETRIEVAL_HYBRID") == "1":
+        needed.add("lexical")
+    return needed
+
+
+def latency_summary(latencies: List[float], wall_seconds: float) -> dict:
+    ms = np.asarray(latencies) * 1000
+    return {
+        "queries": len(latencies),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "qps": round(len(latencies) / wall_seconds, 2) if wall_seconds else 0.0,
+    }
+
+
+# ---------------------------------------------------------------------------
+# 자식 프로세스 (BENCH_ROLE로 구분)
+# ---------------------------------------------------------------------------
+def _build(component: str, size: int) -> dict:
+    from modules.embedding.build_qdrant import iter_documents
+    from modules.retrieval.registry import get_registry
+
+    collection = _collection(size)
+    t0 = time.perf_counter()
+
+    if component == "lexical":
+        import pandas as pd
+
+        from modules.retrieval.lexical import build_lexical_index
+
+        build_lexical_index(pd.concat(synthetic_chunks(size), ignore_index=True), collection)
+    else:
+        embeddings = get_registry().get_embeddings()
+        docs = iter_documents(synthetic_chunks(size), "recursive")
+        if component == "numpy":
+            from modules.retrieval.numpy_store import build_numpy_index
+
+            build_numpy_index(docs, embeddings, collection)
+        else:
+            from modules.embedding.qdrant_store import build_qdrant_vectorstore
+
+            build_qdrant_vectorstore(
+                documents=docs,
+                embeddings=embeddings,
+                qdrant_path=Path(os.environ["QDRANT_DIR"]),
+                collection_name=collection,
+                recreate=True,
+                write_manifest=False,
+            )
+
+    return {
+        "size": size,
+        "component": component,
+        "seconds": round(time.perf_counter() - t0, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def _run_workload(fn: Callable[[str], object], queries: List[str], concurrency: int) -> dict:
+    def _timed(q: str) -> float:
+        t0 = time.perf_counter()
+        fn(q)
+        return time.perf_counter() - t0
+
+    t_start = time.perf_counter()
+    if concurrency <= 1:
+        latencies = [_timed(q) for q in queries]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(_timed, queries))
+    return latency_summary(latencies, time.perf_counter() - t_start)
+
+
+def _run(scenario: str, size: int, settings: BenchSettings) -> List[dict]:
+    if SCENARIOS[scenario].get("_target") == "answer":
+        from modules.rag.pipeline import answer_query
+
+        def fn(q):
+            return answer_query(q, k=settings.k)
+    else:
+        from modules.retrieval import search
+
+        def fn(q):
+            return search(q, k=settings.k)
+
+    # 워밍업: 인덱스 로드 / mmap 페이지 / 스레드풀 (측정에서 제외)
+    for q in synthetic_queries(5, seed=99):
+        fn(q)
+
+    records = []
+    for i, concurrency in enumerate(settings.concurrency):
+        # workload마다 다른 쿼리 (결과 캐시를 꺼도 쿼리 임베딩 캐시 등에 안 걸리게)
+        queries = synthetic_queries(settings.queries, seed=1 + i)
+        records.append(
+            {
+                "size": size,
+                "scenario": scenario,
+                "workload": "single" if concurrency <= 1 else f"concurrent_{concurrency}",
+                "concurrency": concurrency,
+                **_run_workload(fn, queries, concurrency),
+                "rss_mb": round(current_rss_mb() or 0.0, 1),
+                "peak_rss_mb": round(peak_rss_mb(), 1),
+            }
+        )
+    return records
+
+
+def _child_main() -> None:
+    settings = BenchSettings()
+    role = os.environ["BENCH_ROLE"]
+    size = int(os.environ["BENCH_SIZE"])
+    if role == "build":
+        result = _build(os.environ["BENCH_COMPONENT"], size)
+    else:
+        result = _run(os.environ["BENCH_SCENARIO"], size, settings)
+    Path(os.environ["BENCH_RESULT_PATH"]).write_text(json.dumps(result), encoding="utf-8")
+
+
+def _spawn(env_overrides: dict[str, str], work: Path) -> object:
+    # 측정은 매번 새 프로세스에서 (RSS/캐시/registry가 이전 측정에 섞이지 않게)
+    result_path = work / f"result_{time.time_ns()}.json"
+    env = {**os.environ, **env_overrides, "BENCH_RESULT_PATH": str(result_path)}
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(PROJECT_ROOT), env.get("PYTHONPATH")) if p)
+    subprocess.run([sys.executable, "-m", "modules.bench.suite"], env=env, cwd=PROJECT_ROOT, check=True)
+    return json.loads(result_path.read_text(encoding="utf-8"))
+
+
+# ---------------------------------------------------------------------------
+# baseline 비교
+# ---------------------------------------------------------------------------
+# (지표, 클수록 나쁨?)
+_SEARCH_METRICS = (("p50_ms", True), ("p95_ms", True), ("p99_ms", True), ("qps", False))
+_BUILD_METRICS = (("seconds", True), ("peak_rss_mb", True))
+
+
+def _diff(key: str, metric: str, base: float, cur: float, higher_is_worse: bool, threshold: float) -> dict:
+    change = (cur - base) / base if base else 0.0
+    worse = change if higher_is_worse else -change
+    return {
+        "key": key,
+        "metric": metric,
+        "baseline": base,
+        "current": cur,
+        "change_pct": round(change * 100, 1),
+        "regressed": worse > threshold,
+    }
+
+
+def compare_reports(current: dict, baseline: dict, *, threshold: float) -> List[dict]:
+    """
+    같은 (size, scenario, workload) / (size, component)끼리 비교.
+    threshold=0.2면 지연·빌드시간이 20% 넘게 늘거나 QPS가 20% 넘게 줄면 regressed=True.
+    baseline에 없는 항목은 건너뜀.
+    """
+    rows = []
+    base_search = {(r["size"], r["scenario"], r["workload"]): r for r in baseline.get("search", [])}
+    for r in current.get("search", []):
+        b = base_search.get((r["size"], r["scenario"], r["workload"]))
+        if b is None:
+            continue
+        key = f"{r['size']}/{r['scenario']}/{r['workload']}"
+        rows.extend(_diff(key, m, b[m], r[m], worse, threshold) for m, worse in _SEARCH_METRICS)
+
+    base_build = {(r["size"], r["component"]): r for r in baseline.get("build", [])}
+    for r in current.get("build", []):
+        b = base_build.get((r["size"], r["component"]))
+        if b is None:
+            continue
+        key = f"{r['size']}/build_{r['component']}"
+        rows.extend(_diff(key, m, b[m], r[m], worse, threshold) for m, worse in _BUILD_METRICS)
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# main
+# ---------------------------------------------------------------------------
+def main():
+    """
+    합성 컬렉션(DummyEmbeddings)으로 search() / answer_query() 지연·처리량 벤치마크.
+
+    BENCH_SIZES=10000,100000 BENCH_SCENARIOS=qdrant,numpy,numpy_hybrid BENCH_CONCURRENCY=1,8 \\
+        PYTHONPATH=$(pwd) python -m modules.bench.suite
+
+    # baseline과 비교 (20% 넘게 나빠진 항목이 있으면 exit code 1)
+    BENCH_BASELINE=outputs/bench/baseline.json PYTHONPATH=$(pwd) python -m modules.bench.suite
+
+    - 크기마다 필요한 인덱스(qdrant/numpy/lexical)를 만들고 빌드 시간·peak RSS 기록
+    - 시나리오 × 동시성마다 p50/p95/p99, QPS, RSS 기록 (결과 캐시는 끄고 측정)
+    - 결과: BENCH_OUT(JSON). 이걸 복사해두면 다음 실행의 BENCH_BASELINE으로 사용
+    - Qdrant local mode는 전체 탐색이라 큰 크기에서 매우 느림 → 100k 이상은 QDRANT_URL(서버) 권장
+    - 벤치용 컬렉션(bench_<size>)과 numpy/lexical 인덱스는 끝나면 삭제 (BENCH_KEEP=1이면 유지)
+    """
+    if os.getenv("BENCH_ROLE"):
+        _child_main()
+        return
+
+    settings = BenchSettings()
+    unknown = [s for s in settings.scenarios if s not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown BENCH_SCENARIOS: {unknown} (가능: {', '.join(SCENARIOS)})")
+
+    from modules.retrieval.lexical import lexical_index_dir
+    from modules.retrieval.numpy_store import numpy_index_dir
+
+    components = sorted(set().union(*(_components(s) for s in settings.scenarios)))
+    work = Path(tempfile.mkdtemp(prefix="rag_bench_"))
+    base_env = {
+        "EMBEDDINGS_BACKEND": "dummy",
+        "DUMMY_EMBEDDING_DIM": str(settings.dim),
+        "EMBEDDING_CACHE": "0",
+        "RETRIEVAL_CACHE": "0",
+        "QDRANT_DIR": str(work / "qdrant"),
+        "RAG_MODE": "recursive",
+    }
+
+    builds: List[dict] = []
+    search: List[dict] = []
+    try:
+        for size in settings.sizes:
+            env = {**base_env, "BENCH_SIZE": str(size), "QDRANT_COLLECTION": _collection(size)}
+            for component in components:
+                print(f"[bench] build size={size} {component}")
+                builds.append(_spawn({**env, "BENCH_ROLE": "build", "BENCH_COMPONENT": component}, work))
+
+            for scenario in settings.scenarios:
+                print(f"[bench] run size={size} {scenario}")
+                overrides = {k: v for k, v in SCENARIOS[scenario].items() if not k.startswith("_")}
+                search.extend(_spawn({**env, **overrides, "BENCH_ROLE": "run", "BENCH_SCENARIO": scenario}, work))
+
+            if os.getenv("BENCH_KEEP", "0") != "1":
+                shutil.rmtree(numpy_index_dir(_collection(size)), ignore_errors=True)
+                shutil.rmtree(lexical_index_dir(_collection(size)), ignore_errors=True)
+    finally:
+        if os.getenv("BENCH_KEEP", "0") != "1":
+            shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "qdrant": "server" if os.getenv("QDRANT_URL") else "local",
+        },
+        "settings": asdict(settings),
+        "build": builds,
+        "search": search,
+    }
+    out_path = Path(settings.out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("\n===== BUILD =====")
+    for r in builds:
+        print(f"size={r['size']:>8} {r['component']:<8} {r['seconds']:>9.2f}s peak_rss={r['peak_rss_mb']}MB")
+    print("\n===== SEARCH =====")
+    for r in search:
+        print(
+            f"size={r['size']:>8} {r['scenario']:<14} {r['workload']:<14} "
+            f"p50={r['p50_ms']:>8.2f}ms p95={r['p95_ms']:>8.2f}ms p99={r['p99_ms']:>8.2f}ms "
+            f"qps={r['qps']:>8.1f} rss={r['rss_mb']}MB"
+        )
+    print(f"saved -> {out_path}")
+
+    if settings.baseline:
+        baseline = json.loads(Path(settings.baseline).read_text(encoding="utf-8"))
+        rows = compare_reports(report, baseline, threshold=settings.threshold)
+        regressions = [r for r in rows if r["regressed"]]
+        print(f"\n===== vs BASELINE ({settings.baseline}, threshold {settings.threshold:.0%}) =====")
+        print(f"compared={len(rows)} regressions={len(regressions)}")
+        for r in regressions:
+            print(f"[REGRESSION] {r['key']} {r['metric']}: {r['baseline']} -> {r['current']} ({r['change_pct']:+}%)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+import numpy as np
+import pandas as pd
+
+
+# 공고문에 자주 나오는 단어들 → BM25/hybrid도 의미 있게 동작하도록 이 어휘로 청크/쿼리를 만듦
+_VOCAB = (
+    "사업 과업 범위 제안 요청 입찰 계약 기간 예산 발주 기관 시스템 구축 고도화 유지보수 운영 "
+    "클라우드 보안 데이터 플랫폼 통합 포털 학사 행정 정보화 전환 인프라 네트워크 서버 "
+    "소프트웨어 개발 분석 설계 구현 시험 이행 검수 교육 기술 지원 인력 일정 산출물 품질 "
+    "관리 요구사항 기능 성능 인터페이스 연계 표준 장애 대응 백업 복구 모니터링 인증 권한 "
+    "AI 빅데이터 ERP GIS API LMS 모바일 웹 접근성 개인정보 암호화 로그 통계 대시보드"
+).split()
+
+_AGENCIES = ("한국교육학술정보원", "조달청", "서울특별시", "국민건강보험공단", "한국전력공사", "대학교 산학협력단")
+
+
+def synthetic_chunks(
+    n: int,
+    *,
+    chunks_per_doc: int = 20,
+    words_per_chunk: int = 40,
+    frame_rows: int = 8192,
+    seed: int = 0,
+) -> Iterator[pd.DataFrame]:
+    """
+    청크 저장소와 같은 컬럼(doc_id/chunk_id/source/text + 공고 필드)의 합성 청크 DF를 frame_rows씩 생성.
+    seed가 같으면 항상 같은 데이터 (벤치 결과를 baseline과 비교 가능하게).
+    """
+    rng = np.random.default_rng(seed)
+    vocab = np.asarray(_VOCAB, dtype=object)
+    base = datetime(2024, 1, 1)
+
+    for start in range(0, n, frame_rows):
+        rows = np.arange(start, min(start + frame_rows, n))
+        doc = rows // chunks_per_doc
+        words = vocab[rng.integers(0, len(vocab), size=(len(rows), words_per_chunk))]
+
+        # 공고 필드는 문서(doc) 단위로 결정 → 같은 공고의 청크는 같은 값
+        doc_rng = (doc * 2654435761) % 1_000_003
+        yield pd.DataFrame(
+            {
+                "doc_id": [f"BENCH-{d:07d}" for d in doc],
+                "chunk_id": rows % chunks_per_doc,
+                "source": [f"bench_{d:07d}" for d in doc],
+                "text": [" ".join(w) for w in words],
+                "budget": (doc_rng % 500 + 1) * 1e7,
+                "agency": [_AGENCIES[d % len(_AGENCIES)] for d in doc],
+                "published_at": [(base + timedelta(days=int(d % 365))).isoformat() for d in doc_rng],
+                "bid_deadline": [(base + timedelta(days=int(d % 365) + 21)).isoformat() for d in doc_rng],
+            }
+        )
+
+
+def synthetic_queries(n: int, *, words_per_query: int = 4, seed: int = 1) -> List[str]:
+    # 어휘에서 뽑은 짧은 질문 (캐시에 걸리지 않게 서로 다른 문장)
+    rng = np.random.default_rng(seed)
+    queries = []
+    for i in range(n):
+        words = [_VOCAB[j] for j in rng.integers(0, len(_VOCAB), size=words_per_query)]
+        queries.append(f"{' '.join(words)} 관련 사업 {i}")
+    return queries
@@ -1,3 +1,18 @@
-from .recursive import chunk_recursive
-from .semantic import load_semantic_chunks
-from .schema import ChunkColumns
+from typing import TYPE_CHECKING
+
+from modules.utils.lazy import lazy_exports
+
+# langchain text splitter / pandas는 청킹 함수를 처음 쓸 때 로드
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "chunk_recursive": ".recursive",
+        "load_semantic_chunks": ".semantic",
+        "ChunkColumns": ".schema",
+    },
+)
+
+if TYPE_CHECKING:
+    from .recursive import chunk_recursive
+    from .semantic import load_semantic_chunks
+    from .schema import ChunkColumns
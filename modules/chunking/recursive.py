@@ -1,10 +1,75 @@
 from __future__ import annotations
 
-from typing import Optional
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
 import pandas as pd
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from modules.chunking.schema import ChunkColumns
+
+
+# 워커 프로세스마다 splitter를 1번만 만들어 재사용 (shard마다 새로 만들지 않게)
+_WORKER_SPLITTER: Optional[RecursiveCharacterTextSplitter] = None
+
+
+def _make_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", " ", ""],
+    )
+
+
+def _split_records(
+    records: Iterable[tuple[str, object, object]],
+    splitter: RecursiveCharacterTextSplitter,
+) -> pd.DataFrame:
+    """
+    (doc_id, text, source) 튜플들을 청킹해서 ChunkColumns 규격 DF로 반환.
+    - 순차(chunk_recursive) / 병렬(iter_chunk_recursive) 둘 다 이 함수 하나로 청킹함
+    """
+    cols = ChunkColumns()
+    rows = []
+    for doc_id, text, source in records:
+        if not isinstance(text, str) or not text.strip():
+            continue
+
+        for i, ch in enumerate(splitter.split_text(text)):
+            rows.append(
+                {
+                    cols.doc_id: doc_id,
+                    cols.chunk_id: i,
+                    cols.text: ch,
+                    cols.source: source,
+                }
+            )
+
+    return pd.DataFrame(rows, columns=[cols.doc_id, cols.chunk_id, cols.text, cols.source])
+
+
+def _to_records(
+    df: pd.DataFrame,
+    *,
+    text_col: str,
+    doc_id_col: str,
+    source_col: Optional[str],
+) -> list[tuple[str, object, object]]:
+    # iterrows 대신 컬럼 단위로 뽑아서 (doc_id, text, source) 튜플로 만듦 (프로세스 간 전송도 가벼움)
+    has_source = bool(source_col) and source_col in df.columns
+    sources = df[source_col].tolist() if has_source else [None] * len(df)
+    return list(zip(df[doc_id_col].astype(str).tolist(), df[text_col].tolist(), sources))
+
+
+def _init_worker(chunk_size: int, chunk_overlap: int) -> None:
+    global _WORKER_SPLITTER
+    _WORKER_SPLITTER = _make_splitter(chunk_size, chunk_overlap)
+
+
+def _chunk_shard(records: list[tuple[str, object, object]]) -> pd.DataFrame:
+    assert _WORKER_SPLITTER is not None, "워커 initializer가 실행되지 않았습니다."
+    return _split_records(records, _WORKER_SPLITTER)
 
 
 def chunk_recursive(
@@ -25,29 +90,55 @@ def chunk_recursive(
       - text: 청크 텍스트
       - source: 출처(있으면 project_id 같은 값)
     """
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        separators=["\n\n", "\n", " ", ""],
-    )
+    splitter = _make_splitter(chunk_size, chunk_overlap)
+    records = _to_records(df_fulltext, text_col=text_col, doc_id_col=doc_id_col, source_col=source_col)
+    return _split_records(records, splitter)
 
-    rows = []
-    for _, row in df_fulltext.iterrows():
-        doc_id = str(row[doc_id_col])
-        text = row[text_col]
 
-        if not isinstance(text, str) or not text.strip():
-            continue
+def iter_chunk_recursive(
+    frames: Iterable[pd.DataFrame],
+    *,
+    text_col: str = "full_text",
+    doc_id_col: str = "공고 번호",
+    chunk_size: int = 1000,
+    chunk_overlap: int = 100,
+    source_col: Optional[str] = "project_id",
+    workers: int = 4,
+    shard_size: int = 64,
+    max_pending: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    대용량 코퍼스용 "병렬 + 스트리밍" Recursive 청킹.
 
-        chunks = splitter.split_text(text)
-        for i, ch in enumerate(chunks):
-            rows.append(
-                {
-                    "doc_id": doc_id,
-                    "chunk_id": i,
-                    "text": ch,
-                    "source": row[source_col] if source_col and source_col in df_fulltext.columns else None,
-                }
-            )
+    - frames: fulltext DF 조각들 (예: read_csv(chunksize=...) 이터레이터)
+    - 문서를 shard_size개씩 묶어서 프로세스 풀에 보내고,
+      끝난 shard의 청크 DF를 입력 순서대로 바로 yield 함 (chunk_recursive와 같은 행 순서)
+    - 동시에 떠 있는 shard는 max_pending개(기본 workers*2)로 제한 → 코퍼스 크기와 무관하게 메모리 일정
+
+    반환되는 DF 조각들의 컬럼은 chunk_recursive와 동일 (ChunkColumns: doc_id/chunk_id/text/source)
+    """
+    workers = max(1, int(workers))
+    max_pending = max_pending or workers * 2
+
+    def _shards() -> Iterator[list[tuple[str, object, object]]]:
+        for frame in frames:
+            records = _to_records(frame, text_col=text_col, doc_id_col=doc_id_col, source_col=source_col)
+            for i in range(0, len(records), shard_size):
+                yield records[i : i + shard_size]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(chunk_size, chunk_overlap),
+    ) as pool:
+        pending: deque[Future] = deque()
+
+        for shard in _shards():
+            pending.append(pool.submit(_chunk_shard, shard))
+
+            # 앞쪽 shard부터 꺼내야 출력 순서가 유지됨
+            while len(pending) >= max_pending:
+                yield pending.popleft().result()
 
-    return pd.DataFrame(rows)
+        while pending:
+            yield pending.popleft().result()
@@ -1,21 +1,67 @@
 from __future__ import annotations
 
+import os
+
 from modules.loader import load_fulltext_df
+from modules.loader.datasets import FULLTEXT_DTYPES
+from modules.loader.chunk_store import ChunkStoreWriter, write_chunk_store
 from modules.chunking import chunk_recursive
+from modules.chunking.recursive import iter_chunk_recursive
 from modules.paths import ProjectPaths
-from modules.utils.io import write_csv
+from modules.utils.io import iter_csv, write_csv, write_csv_stream
+
+
+def _drop_stale_store(paths: ProjectPaths) -> None:
+    # CSV로 다시 청킹하면 예전 .arrow는 지움 (남아 있으면 load_chunks_df가 예전 청크를 읽을 수 있음)
+    if paths.store_chunks_recursive.exists():
+        paths.store_chunks_recursive.unlink()
+        print(f"[OK] removed stale store: {paths.store_chunks_recursive}")
 
 
 def main() -> None:
     paths = ProjectPaths()
 
+    # 저장 형식: arrow(기본, load_chunks_df가 memory-map으로 읽음) | csv(예전 방식)
+    fmt = os.getenv("CHUNK_FORMAT", "arrow").lower()
+    out_path = paths.store_chunks_recursive if fmt == "arrow" else paths.csv_chunks_recursive
+
+    # CHUNK_WORKERS>1 이면 병렬+스트리밍 모드 (대용량 코퍼스용)
+    workers = int(os.getenv("CHUNK_WORKERS", "1"))
+
+    if workers > 1:
+        read_rows = int(os.getenv("CHUNK_READ_ROWS", "1000"))    # fulltext CSV를 몇 행씩 읽을지
+        shard_size = int(os.getenv("CHUNK_SHARD_SIZE", "64"))   # 워커 1번에 보낼 문서 수
+
+        frames = iter_chunk_recursive(
+            iter_csv(paths.csv_fulltext, chunksize=read_rows, dtype=FULLTEXT_DTYPES),
+            workers=workers,
+            shard_size=shard_size,
+        )
+
+        if fmt == "arrow":
+            with ChunkStoreWriter(out_path) as w:
+                for frame in frames:
+                    w.write(frame)
+            n_rows = w.rows
+        else:
+            n_rows = write_csv_stream(frames, out_path)
+            _drop_stale_store(paths)
+
+        print(f"[OK] saved: {out_path}")
+        print(f"rows: {n_rows} (workers={workers}, shard_size={shard_size})")
+        return
+
     df = load_fulltext_df()
     chunks = chunk_recursive(df)
 
-    # 저장 위치: data/data_list_chunks_recursive.csv 로 덮어쓰기
-    write_csv(chunks, paths.csv_chunks_recursive, index=False)
+    # 저장 위치: data/data_list_chunks_recursive.arrow (CHUNK_FORMAT=csv면 .csv) 로 덮어쓰기
+    if fmt == "arrow":
+        write_chunk_store(chunks, out_path)
+    else:
+        write_csv(chunks, out_path, index=False)
+        _drop_stale_store(paths)
 
-    print(f"[OK] saved: {paths.csv_chunks_recursive}")
+    print(f"[OK] saved: {out_path}")
     print("shape:", chunks.shape)
 
 
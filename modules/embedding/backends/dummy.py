@@ -1,43 +1,71 @@
 from __future__ import annotations
 
 import hashlib
-from typing import List
+from typing import List, Sequence
 
 import numpy as np
 from langchain_core.embeddings import Embeddings
 
 
+# splitmix64 상수 (카운터 기반 난수: seed + 위치만으로 값이 정해져서 배치 전체를 한 번에 계산 가능)
+_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_MASK24 = np.uint64(0xFFFFFF)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    # uint64 곱셈은 2^64로 자연스럽게 wrap (C의 splitmix64와 같은 값)
+    x = (x ^ (x >> np.uint64(30))) * _MIX1
+    x = (x ^ (x >> np.uint64(27))) * _MIX2
+    return x ^ (x >> np.uint64(31))
+
+
 class DummyEmbeddings(Embeddings):
     """
     로컬 실행 확인용 더미 임베딩 (LangChain Embeddings 인터페이스 준수)
     - 같은 text -> 항상 같은 벡터(결정적)
     - torch/transformers 없이 동작
+    - embed_matrix: 배치 전체를 (n, dim) float32 행렬로 한 번에 계산 (텍스트별 rng/list 변환 없음)
     """
 
     def __init__(self, dim: int = 1024, normalize: bool = True):
         self.dim = dim
         self.normalize = normalize
+        # 벡터 생성 방식이 바뀌면 이름도 바꿔서 manifest/임베딩 캐시가 예전 벡터를 안 쓰게
+        self.model_name = f"dummy-splitmix-{dim}"
+
+    @staticmethod
+    def _seeds(texts: Sequence[str]) -> np.ndarray:
+        digests = b"".join(hashlib.sha256(t.encode("utf-8")).digest()[:8] for t in texts)
+        return np.frombuffer(digests, dtype=np.uint64)
 
-    def _seed_from_text(self, text: str) -> int:
-        h = hashlib.sha256(text.encode("utf-8")).hexdigest()
-        return int(h[:8], 16)
+    def embed_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        texts -> (len(texts), dim) C-contiguous float32 행렬.
+        원소 (i, j) = splitmix64(seed_i + (j+1)·γ)에서 만든 표준정규값 (Box-Muller).
+        """
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
 
-    def _embed_one(self, text: str) -> List[float]:
-        seed = self._seed_from_text(text)
-        rng = np.random.default_rng(seed)
+        counters = np.arange(1, self.dim + 1, dtype=np.uint64) * _GAMMA
+        bits = _splitmix64(self._seeds(texts)[:, None] + counters[None, :])
 
-        v = rng.standard_normal(self.dim).astype(np.float32)
+        # 상위/하위 24bit로 (0, 1) 균등분포 2개 → 표준정규
+        u1 = ((bits >> np.uint64(40)).astype(np.float32) + 0.5) * np.float32(1.0 / (1 << 24))
+        u2 = ((bits & _MASK24).astype(np.float32) + 0.5) * np.float32(1.0 / (1 << 24))
+        m = np.sqrt(np.float32(-2.0) * np.log(u1))
+        m *= np.cos(np.float32(2.0 * np.pi) * u2)
 
         if self.normalize:
-            norm = np.linalg.norm(v)
-            if norm > 0:
-                v = v / norm
+            norms = np.linalg.norm(m, axis=1, keepdims=True)
+            np.divide(m, norms, out=m, where=norms > 0)
 
-        return v.tolist()
+        return np.ascontiguousarray(m, dtype=np.float32)
 
     # ✅ LangChain이 요구하는 메서드 시그니처
     def embed_query(self, text: str) -> List[float]:
-        return self._embed_one(text)
+        return self.embed_matrix([text])[0].tolist()
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        return [self._embed_one(t) for t in texts]
+        return self.embed_matrix(texts).tolist()
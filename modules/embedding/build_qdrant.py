@@ -1,13 +1,58 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
+from typing import Iterable, Iterator
 
+import pandas as pd
 from langchain_core.documents import Document
 
 from modules.paths import ProjectPaths
-from modules.loader import load_chunks_df
+from modules.loader import attach_project_fields, iter_chunks_df, load_chunks_df, load_project_fields
+from modules.loader.datasets import PROJECT_FIELDS
 from modules.embedding.embedder import get_embeddings
-from modules.embedding.qdrant_store import build_qdrant_vectorstore
+from modules.embedding.qdrant_store import build_qdrant_vectorstore, sync_qdrant_vectorstore
+from modules.utils.memory import peak_rss_mb
+
+
+def iter_documents(frames: Iterable[pd.DataFrame], mode: str) -> Iterator[Document]:
+    # 청크 DF 조각들 -> Document (Qdrant에 넣을 표준 형태). 빈 텍스트는 건너뜀
+    for frame in frames:
+        for row in frame.to_dict("records"):
+            text = str(row.get("text", ""))
+            if not text.strip():
+                continue
+
+            metadata = {
+                "doc_id": row.get("doc_id"),
+                "chunk_id": row.get("chunk_id"),
+                "source": row.get("source"),
+                "mode": mode,
+            }
+            # 공고 필드(사업 금액/발주 기관/날짜)가 join돼 있으면 필터용 payload로 같이 저장
+            for key in PROJECT_FIELDS:
+                value = row.get(key)
+                if value is not None and not pd.isna(value):
+                    metadata[key] = value
+
+            yield Document(page_content=text, metadata=metadata)
+
+
+def with_project_fields(frames: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    # INDEX_PROJECT_FIELDS=1(기본)이면 data_list_base.csv의 공고 필드를 source로 join
+    if os.getenv("INDEX_PROJECT_FIELDS", "1") != "1":
+        yield from frames
+        return
+
+    try:
+        fields = load_project_fields()
+    except FileNotFoundError as e:
+        print(f"[WARN] 공고 필드 join 생략: {e}")
+        yield from frames
+        return
+
+    for frame in frames:
+        yield attach_project_fields(frame, fields)
 
 
 def main() -> None:
@@ -16,26 +61,19 @@ def main() -> None:
     # 1) 어떤 청크를 인덱싱할지 선택
     #    - 지금은 네가 이미 만든 semantic/recursive CSV 둘 다 있으니 둘 중 하나 선택하면 됨
     mode = "recursive"  # "semantic" 으로 바꿔도 됨
-    df = load_chunks_df(mode)
+
+    # INDEX_STREAM=1: 청크를 INDEX_READ_ROWS 행씩 읽어서 바로 색인 (전체 DF/Document 목록을 안 만듦)
+    #   → 청크 수와 상관없이 메모리 일정. manifest도 안 만들어서 incremental과는 같이 못 씀
+    stream = os.getenv("INDEX_STREAM", "0") == "1"
+    read_rows = int(os.getenv("INDEX_READ_ROWS", "8192"))
 
     # 2) Document로 변환 (Qdrant에 넣을 표준 형태)
-    docs = []
-    for _, row in df.iterrows():
-        text = str(row.get("text", ""))
-        if not text.strip():
-            continue
-
-        docs.append(
-            Document(
-                page_content=text,
-                metadata={
-                    "doc_id": row.get("doc_id"),
-                    "chunk_id": row.get("chunk_id"),
-                    "source": row.get("source"),
-                    "mode": mode,
-                },
-            )
-        )
+    if stream:
+        df = None
+        docs = iter_documents(with_project_fields(iter_chunks_df(mode, chunksize=read_rows)), mode)
+    else:
+        df = next(with_project_fields([load_chunks_df(mode)]))
+        docs = list(iter_documents([df], mode))
 
     # 3) bge-m3 임베딩
     embeddings = get_embeddings()  # 나중에 "mps"로 바꿔볼 수 있음
@@ -44,17 +82,53 @@ def main() -> None:
     qdrant_path = Path(paths.outputs_dir) / "qdrant_db"
     collection_name = f"rfp_{mode}_DUMMY"
 
-    store = build_qdrant_vectorstore(
-        documents=docs,
-        embeddings=embeddings,
-        qdrant_path=qdrant_path,
-        collection_name=collection_name,
-        recreate=True,
-    )
+    # 5) 색인 방식
+    #    - full(기본): 컬렉션을 지우고 전부 다시 임베딩
+    #    - incremental: manifest와 비교해서 새로 생기거나 바뀐 청크만 임베딩, 사라진 청크는 삭제
+    index_mode = os.getenv("INDEX_MODE", "full").lower()
+
+    if index_mode == "incremental" and stream:
+        raise ValueError("INDEX_STREAM=1은 INDEX_MODE=full에서만 쓸 수 있습니다 (incremental은 전체 청크 비교가 필요)")
+
+    if index_mode == "incremental":
+        store = sync_qdrant_vectorstore(
+            documents=docs,
+            embeddings=embeddings,
+            qdrant_path=qdrant_path,
+            collection_name=collection_name,
+        )
+    elif index_mode == "full":
+        store = build_qdrant_vectorstore(
+            documents=docs,
+            embeddings=embeddings,
+            qdrant_path=qdrant_path,
+            collection_name=collection_name,
+            recreate=True,
+            write_manifest=not stream,
+        )
+    else:
+        raise ValueError(f"Unknown INDEX_MODE: {index_mode}")
 
-    print("[OK] indexed:", collection_name)
-    print("docs:", len(docs))
+    # BM25 빌드 전에 기록 (BM25는 전체 청크를 올리니까 색인 자체의 메모리와 구분)
+    index_peak_rss = peak_rss_mb()
+
+    # 6) (옵션) hybrid 검색용 BM25 인덱스도 같은 청크로 생성
+    if os.getenv("LEXICAL_INDEX", "0") == "1":
+        from modules.retrieval.lexical import build_lexical_index
+
+        # BM25는 전체 청크가 필요해서 streaming 모드에서도 여기서는 한 번에 읽음
+        df = df if df is not None else next(with_project_fields([load_chunks_df(mode, columns=["doc_id", "chunk_id", "text", "source"])]))
+        lexical_dir = build_lexical_index(df[df["text"].fillna("").astype(str).str.strip() != ""], collection_name, mode=mode)
+        print("[OK] lexical index:", lexical_dir)
+
+    print("[OK] indexed:", collection_name, f"(mode={index_mode})")
+    print("docs:", store.client.count(collection_name).count)
     print("qdrant_path:", qdrant_path)
+    print(f"peak_rss: {index_peak_rss:.1f} MB (index build)")
+
+    cache_stats = getattr(embeddings, "stats", None)
+    if cache_stats is not None:
+        print("embedding_cache:", cache_stats.as_dict())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class EmbeddingCache:
+    """
+    디스크(sqlite) 임베딩 캐시.
+    - key: sha256(namespace + text), namespace = backend|model|normalize
+    - value: float32 벡터 bytes
+    - max_entries를 넘으면 가장 오래 안 쓴(atime) 항목부터 지움 (LRU 근사)
+    """
+
+    # sqlite IN (...) 파라미터 개수 제한 때문에 나눠서 조회
+    _LOOKUP_CHUNK = 500
+
+    def __init__(self, path: Path, *, max_entries: int = 500_000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute(
+            "CREATE TABLE IF NOT EXISTS emb (key TEXT PRIMARY KEY, vec BLOB NOT NULL, atime REAL NOT NULL)"
+        )
+        self._con.execute("CREATE INDEX IF NOT EXISTS emb_atime ON emb (atime)")
+        self._con.commit()
+        self._count = self._con.execute("SELECT COUNT(*) FROM emb").fetchone()[0]
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> str:
+        h = hashlib.sha256()
+        h.update(namespace.encode("utf-8"))
+        h.update(b"\0")
+        h.update(text.encode("utf-8"))
+        return h.hexdigest()
+
+    def get_many(self, keys: List[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        if not keys:
+            return found
+
+        with self._lock:
+            for i in range(0, len(keys), self._LOOKUP_CHUNK):
+                part = keys[i : i + self._LOOKUP_CHUNK]
+                marks = ",".join("?" * len(part))
+                for key, blob in self._con.execute(f"SELECT key, vec FROM emb WHERE key IN ({marks})", part):
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._con.executemany("UPDATE emb SET atime=? WHERE key=?", [(now, k) for k in found])
+                self._con.commit()
+
+            hits = sum(1 for k in keys if k in found)
+            self.stats.hits += hits
+            self.stats.misses += len(keys) - hits
+
+        return found
+
+    def put_many(self, items: dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+
+        now = time.time()
+        rows = [(k, np.asarray(v, dtype=np.float32).tobytes(), now) for k, v in items.items()]
+
+        with self._lock:
+            before = self._con.total_changes
+            self._con.executemany("INSERT OR IGNORE INTO emb (key, vec, atime) VALUES (?, ?, ?)", rows)
+            self._count += self._con.total_changes - before
+
+            if self._count > self.max_entries:
+                self._evict()
+            self._con.commit()
+
+    def _evict(self) -> None:
+        # 한 번에 10% 여유를 만들어서 put마다 eviction이 돌지 않게
+        target = int(self.max_entries * 0.9)
+        n_drop = self._count - target
+        self._con.execute(
+            "DELETE FROM emb WHERE key IN (SELECT key FROM emb ORDER BY atime LIMIT ?)",
+            (n_drop,),
+        )
+        self._count -= n_drop
+        self.stats.evictions += n_drop
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        with self._lock:
+            self._con.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    임베딩 객체(dummy/hf)를 감싸서 디스크 캐시를 먼저 보는 래퍼.
+    - embed_documents: 캐시를 한 번에 조회하고, 없는 텍스트만 모아서 inner 모델에 1번 요청
+    - 같은 텍스트는 컬렉션(recursive/semantic)이 달라도 재사용됨
+    """
+
+    def __init__(
+        self,
+        inner: Embeddings,
+        *,
+        cache: EmbeddingCache,
+        backend: str,
+        model_name: str,
+        normalize: bool,
+    ):
+        self.inner = inner
+        self.cache = cache
+        self.namespace = f"{backend}|{model_name}|normalize={normalize}"
+
+    def __getattr__(self, name: str):
+        # model_name, dim 같은 inner 속성은 그대로 노출
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.cache.stats
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        from modules.embedding.embedder import embed_matrix
+
+        keys = [self.cache.make_key(self.namespace, t) for t in texts]
+        found = self.cache.get_many(keys)
+
+        # 캐시에 없는 텍스트만 (중복 제거해서) 모델에 요청
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = embed_matrix(self.inner, list(missing.values()))
+            computed = dict(zip(missing, vectors))
+            self.cache.put_many(computed)
+            found.update(computed)
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([found[k] for k in keys]).astype(np.float32, copy=False)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_matrix(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        # 모델에 따라 query/document 임베딩이 다를 수 있어서 namespace를 분리
+        key = self.cache.make_key(self.namespace + "|query", text)
+        found = self.cache.get_many([key])
+        if key in found:
+            return found[key].tolist()
+
+        vector = np.asarray(self.inner.embed_query(text), dtype=np.float32)
+        self.cache.put_many({key: vector})
+        return vector.tolist()
+
+
+_CACHES: dict[Path, EmbeddingCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_embedding_cache(path: Path, *, max_entries: Optional[int] = None) -> EmbeddingCache:
+    """
+    같은 파일에 sqlite 연결을 여러 개 만들지 않도록 path별로 1개만 생성.
+    """
+    path = Path(path).resolve()
+    with _CACHES_LOCK:
+        if path not in _CACHES:
+            _CACHES[path] = EmbeddingCache(path, max_entries=max_entries or 500_000)
+        return _CACHES[path]
@@ -1,14 +1,54 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Sequence
 
+import numpy as np
 
-def get_embeddings(*, backend: Optional[str] = None):
+from modules.paths import ProjectPaths
+
+
+def _cache_enabled(backend: str, cache: Optional[bool]) -> bool:
+    if cache is not None:
+        return cache
+    # 기본값: 실제 모델(hf)만 캐시. dummy는 계산이 캐시 조회보다 싸서 기본 off
+    default = "1" if backend == "hf" else "0"
+    return os.getenv("EMBEDDING_CACHE", default) == "1"
+
+
+def _wrap_with_cache(embeddings, *, backend: str, model_name: str, normalize: bool):
+    from modules.embedding.cache import CachedEmbeddings, get_embedding_cache
+
+    cache_path = Path(
+        os.getenv(
+            "EMBEDDING_CACHE_PATH",
+            str(ProjectPaths().outputs_dir / "embedding_cache" / "embeddings.sqlite"),
+        )
+    )
+    max_entries = int(os.getenv("EMBEDDING_CACHE_MAX", "500000"))
+
+    cache = get_embedding_cache(cache_path, max_entries=max_entries)
+    print(f"[Embeddings] cache={cache_path} entries={len(cache)}")
+
+    return CachedEmbeddings(
+        embeddings,
+        cache=cache,
+        backend=backend,
+        model_name=model_name,
+        normalize=normalize,
+    )
+
+
+def get_embeddings(*, backend: Optional[str] = None, cache: Optional[bool] = None):
     """
     backend:
       - "dummy": 로컬 실행 확인용 (torch/transformers 불필요)
       - "hf": HuggingFace (GCP에서 bge-m3 등 실제 임베딩)
+
+    cache:
+      - True면 디스크 임베딩 캐시(outputs/embedding_cache)를 거쳐서 같은 텍스트는 다시 계산하지 않음
+      - None이면 EMBEDDING_CACHE 환경변수 (기본: hf=on, dummy=off)
     """
     backend = backend or os.getenv("EMBEDDINGS_BACKEND", "dummy").lower()
 
@@ -16,9 +56,10 @@ def get_embeddings(*, backend: Optional[str] = None):
         from modules.embedding.backends.dummy import DummyEmbeddings
         dim = int(os.getenv("DUMMY_EMBEDDING_DIM", "1024"))
         print(f"[Embeddings] backend=dummy dim={dim}")
-        return DummyEmbeddings(dim=dim, normalize=True)
+        embeddings = DummyEmbeddings(dim=dim, normalize=True)
+        model_name = embeddings.model_name
 
-    if backend == "hf":
+    elif backend == "hf":
         # ⚠️ GCP에서만 쓰는 걸 권장 (로컬은 torch 이슈가 있으니)
         from langchain_huggingface import HuggingFaceEmbeddings
 
@@ -27,10 +68,42 @@ def get_embeddings(*, backend: Optional[str] = None):
 
         print(f"[Embeddings] backend=hf model={model_name} device={device}")
 
-        return HuggingFaceEmbeddings(
+        embeddings = HuggingFaceEmbeddings(
             model_name=model_name,
             model_kwargs={"device": device},
             encode_kwargs={"normalize_embeddings": True},
         )
 
-    raise ValueError(f"Unknown EMBEDDINGS_BACKEND: {backend}")
+    else:
+        raise ValueError(f"Unknown EMBEDDINGS_BACKEND: {backend}")
+
+    if _cache_enabled(backend, cache):
+        return _wrap_with_cache(embeddings, backend=backend, model_name=model_name, normalize=True)
+    return embeddings
+
+
+def embed_matrix(embeddings, texts: Sequence[str]) -> np.ndarray:
+    """
+    texts -> (len(texts), dim) C-contiguous float32 행렬 (색인용 배치 임베딩).
+
+    - embed_matrix가 있는 백엔드(dummy, 캐시 래퍼)는 그대로 사용
+    - HuggingFaceEmbeddings는 SentenceTransformer.encode에서 numpy로 바로 받음
+    - 그 외 LangChain Embeddings는 embed_documents 결과를 변환
+    """
+    texts = list(texts)
+    fn = getattr(embeddings, "embed_matrix", None)
+    if fn is not None:
+        return np.ascontiguousarray(fn(texts), dtype=np.float32)
+
+    client = getattr(embeddings, "_client", None)
+    if client is not None and hasattr(client, "encode") and not getattr(embeddings, "multi_process", False):
+        # HuggingFaceEmbeddings.embed_documents와 같은 전처리/옵션
+        texts = [t.replace("\n", " ") for t in texts]
+        kwargs = {"show_progress_bar": False, **(getattr(embeddings, "encode_kwargs", None) or {})}
+        kwargs["convert_to_numpy"] = True
+        return np.ascontiguousarray(client.encode(texts, **kwargs), dtype=np.float32)
+
+    vectors = embeddings.embed_documents(texts)
+    if not vectors:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.ascontiguousarray(vectors, dtype=np.float32)
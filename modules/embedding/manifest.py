@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from langchain_core.documents import Document
+
+
+# point id를 (doc_id, chunk_id)에서 결정적으로 만들기 위한 namespace
+# → 같은 청크는 항상 같은 id라서 upsert가 "덮어쓰기"가 됨
+_POINT_NAMESPACE = uuid.UUID("6f1d3a52-8c1e-4b7a-9f0e-2d4c5b6a7e81")
+
+
+def chunk_key(metadata: dict) -> str:
+    return f"{metadata.get('doc_id')}:{metadata.get('chunk_id')}"
+
+
+def point_id(key: str) -> str:
+    return str(uuid.uuid5(_POINT_NAMESPACE, key))
+
+
+def content_hash(doc: Document) -> str:
+    """
+    청크 본문 + metadata 해시. 둘 중 하나라도 바뀌면 다시 임베딩/업서트 대상.
+    """
+    h = hashlib.sha256()
+    h.update(doc.page_content.encode("utf-8"))
+    h.update(json.dumps(doc.metadata, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def embeddings_id(embeddings) -> str:
+    """
+    임베딩 모델 식별자. 모델이 바뀌면 해시가 같아도 벡터가 달라지니 전체 재색인해야 함.
+    (캐시 래퍼(CachedEmbeddings)는 벡터를 바꾸지 않으니 안쪽 모델 기준)
+    """
+    embeddings = getattr(embeddings, "inner", embeddings)
+    name = getattr(embeddings, "model_name", None) or getattr(embeddings, "dim", "")
+    return f"{type(embeddings).__name__}:{name}"
+
+
+@dataclass
+class IndexManifest:
+    """
+    컬렉션에 실제로 들어가 있는 청크 목록 { "doc_id:chunk_id": content_hash }.
+    incremental 색인에서 "무엇이 새로 생겼고/바뀌었고/사라졌는지" 비교하는 기준.
+    """
+    collection_name: str
+    embeddings: str = ""
+    entries: dict[str, str] = field(default_factory=dict)
+
+    @staticmethod
+    def path_for(qdrant_path: Path, collection_name: str) -> Path:
+        return Path(qdrant_path) / "manifests" / f"{collection_name}.json"
+
+    @classmethod
+    def load(cls, qdrant_path: Path, collection_name: str) -> Optional["IndexManifest"]:
+        fp = cls.path_for(qdrant_path, collection_name)
+        if not fp.exists():
+            return None
+        data = json.loads(fp.read_text(encoding="utf-8"))
+        return cls(
+            collection_name=data["collection_name"],
+            embeddings=data.get("embeddings", ""),
+            entries=data.get("entries", {}),
+        )
+
+    def save(self, qdrant_path: Path) -> None:
+        fp = self.path_for(qdrant_path, self.collection_name)
+        fp.parent.mkdir(parents=True, exist_ok=True)
+
+        # 임시 파일에 쓰고 교체 (중간에 죽어도 manifest가 깨지지 않게)
+        tmp = fp.with_name(fp.name + ".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "collection_name": self.collection_name,
+                    "embeddings": self.embeddings,
+                    "entries": self.entries,
+                },
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        tmp.replace(fp)
+
+    @classmethod
+    def delete(cls, qdrant_path: Path, collection_name: str) -> None:
+        cls.path_for(qdrant_path, collection_name).unlink(missing_ok=True)
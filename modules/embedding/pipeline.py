@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import itertools
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+
+@dataclass(frozen=True)
+class PipelineSettings:
+    """
+    색인 파이프라인 설정 (embed 스레드 → bounded queue → upsert 스레드).
+    - batch_size: 한 번에 임베딩/업서트하는 청크 수
+    - embed_workers: 동시에 임베딩하는 배치 수 (hf+GPU면 1~2, dummy/CPU면 코어 수까지)
+    - upsert_workers: 동시에 업서트하는 배치 수 (local mode는 1 권장, Qdrant 서버면 늘려도 됨)
+    - queue_size: 임베딩은 끝났고 업서트를 기다리는 배치 최대 개수 (메모리 상한)
+    """
+    batch_size: int = int(os.getenv("INDEX_BATCH_SIZE", "128"))
+    embed_workers: int = int(os.getenv("INDEX_EMBED_WORKERS", "1"))
+    upsert_workers: int = int(os.getenv("INDEX_UPSERT_WORKERS", "1"))
+    queue_size: int = int(os.getenv("INDEX_QUEUE_SIZE", "4"))
+
+
+@dataclass
+class StageStats:
+    docs: int = 0
+    batches: int = 0
+    busy_seconds: float = 0.0  # 워커들이 실제로 일한 시간의 합
+
+    @property
+    def docs_per_sec(self) -> float:
+        return self.docs / self.busy_seconds if self.busy_seconds else 0.0
+
+
+@dataclass
+class PipelineStats:
+    embed: StageStats = field(default_factory=StageStats)
+    upsert: StageStats = field(default_factory=StageStats)
+    wall_seconds: float = 0.0
+
+    @property
+    def docs(self) -> int:
+        return self.upsert.docs
+
+    def as_dict(self) -> dict:
+        return {
+            "docs": self.docs,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "docs_per_sec": round(self.docs / self.wall_seconds, 1) if self.wall_seconds else 0.0,
+            "embed_docs_per_sec": round(self.embed.docs_per_sec, 1),
+            "embed_busy_seconds": round(self.embed.busy_seconds, 3),
+            "upsert_docs_per_sec": round(self.upsert.docs_per_sec, 1),
+            "upsert_busy_seconds": round(self.upsert.busy_seconds, 3),
+        }
+
+    def report(self) -> str:
+        d = self.as_dict()
+        return (
+            f"docs={d['docs']} wall={d['wall_seconds']}s ({d['docs_per_sec']} docs/s) | "
+            f"embed {d['embed_docs_per_sec']} docs/s (busy {d['embed_busy_seconds']}s) | "
+            f"upsert {d['upsert_docs_per_sec']} docs/s (busy {d['upsert_busy_seconds']}s)"
+        )
+
+
+def iter_batches(documents: Iterable[Document], batch_size: int) -> Iterator[List[Document]]:
+    it = iter(documents)
+    while True:
+        batch = list(itertools.islice(it, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+_DONE = object()
+
+
+def run_index_pipeline(
+    documents: Iterable[Document],
+    *,
+    embed_fn: Callable[[List[Document]], np.ndarray],
+    upsert_fn: Callable[[List[Document], np.ndarray], None],
+    settings: Optional[PipelineSettings] = None,
+) -> PipelineStats:
+    """
+    documents를 batch_size씩 잘라서 embed_fn → upsert_fn. 두 단계를 겹쳐서 실행.
+
+    - 배치 N이 업서트되는 동안 배치 N+1(..N+embed_workers)을 임베딩
+    - 임베딩 결과는 크기 queue_size인 queue에 넣음 → 업서트가 느리면 임베딩이 기다림 (메모리 bounded)
+    - documents는 iterable이면 충분 (전체를 list로 만들지 않음)
+    - 어느 단계든 예외가 나면 나머지를 멈추고 그 예외를 다시 raise
+    """
+    settings = settings or PipelineSettings()
+    stats = PipelineStats()
+    stats_lock = threading.Lock()
+
+    ready: queue.Queue = queue.Queue(maxsize=max(1, settings.queue_size))
+    errors: List[BaseException] = []
+    stop = threading.Event()
+
+    def _embed(batch: List[Document]) -> tuple[List[Document], np.ndarray]:
+        t0 = time.perf_counter()
+        vectors = embed_fn(batch)
+        with stats_lock:
+            stats.embed.busy_seconds += time.perf_counter() - t0
+            stats.embed.docs += len(batch)
+            stats.embed.batches += 1
+        return batch, vectors
+
+    def _upsert_worker() -> None:
+        while True:
+            item = ready.get()
+            if item is _DONE:
+                return
+            if stop.is_set():
+                continue  # 에러 후에는 남은 배치를 버리고 _DONE까지 비우기만
+            batch, vectors = item
+            try:
+                t0 = time.perf_counter()
+                upsert_fn(batch, vectors)
+                with stats_lock:
+                    stats.upsert.busy_seconds += time.perf_counter() - t0
+                    stats.upsert.docs += len(batch)
+                    stats.upsert.batches += 1
+            except BaseException as e:  # noqa: BLE001 - 메인 스레드에서 다시 raise
+                errors.append(e)
+                stop.set()
+
+    def _put(item) -> None:
+        # 업서트 쪽이 죽었으면 queue가 안 비니까 timeout으로 확인하면서 넣기
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    t_start = time.perf_counter()
+    consumers = [
+        threading.Thread(target=_upsert_worker, name=f"index-upsert-{i}", daemon=True)
+        for i in range(max(1, settings.upsert_workers))
+    ]
+    for t in consumers:
+        t.start()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, settings.embed_workers), thread_name_prefix="index-embed") as pool:
+            # 임베딩 중인 배치 수도 제한 (순서대로 꺼내서 queue에 넣음)
+            pending: deque[Future] = deque()
+            for batch in iter_batches(documents, settings.batch_size):
+                if stop.is_set():
+                    break
+                pending.append(pool.submit(_embed, batch))
+                if len(pending) >= max(1, settings.embed_workers):
+                    _put(pending.popleft().result())
+            while pending and not stop.is_set():
+                _put(pending.popleft().result())
+            for fut in pending:
+                fut.cancel()
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        for _ in consumers:
+            ready.put(_DONE)
+        for t in consumers:
+            t.join()
+
+    if errors:
+        raise errors[0]
+
+    stats.wall_seconds = time.perf_counter() - t_start
+    return stats
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+from qdrant_client.http import models
+
+
+Quantization = Literal["none", "int8", "binary"]
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """
+    컬렉션 저장 방식 + 검색 옵션 묶음.
+
+    - quantization: 검색용 압축 벡터 (int8: 1/4 크기, binary: 1/32 크기). RAM에 올려서 후보 검색에 사용
+    - on_disk: 원본 float32 벡터를 디스크(mmap)에 둠 → RAM에는 압축 벡터만
+    - oversampling: 압축 벡터로 limit × oversampling 개 후보를 뽑고
+    - rescore: 그 후보를 원본 벡터로 다시 점수 매겨서 top-k (정확도 복구)
+
+    ⚠️ Qdrant local mode(path=...)는 설정만 저장하고 항상 float32 전체 검색을 함.
+       효과를 보려면 Qdrant 서버(QDRANT_URL)에서 사용.
+    """
+    name: str
+    quantization: Quantization = "none"
+    on_disk: bool = False
+    oversampling: float = 1.0
+    rescore: bool = True
+
+    def vectors_config(self, dim: int) -> models.VectorParams:
+        return models.VectorParams(
+            size=dim,
+            distance=models.Distance.COSINE,
+            on_disk=self.on_disk or None,
+        )
+
+    def quantization_config(self) -> Optional[models.QuantizationConfig]:
+        if self.quantization == "int8":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True,
+                )
+            )
+        if self.quantization == "binary":
+            return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def search_params(self) -> Optional[models.SearchParams]:
+        if self.quantization == "none":
+            return None
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                ignore=False,
+                rescore=self.rescore,
+                oversampling=self.oversampling,
+            )
+        )
+
+    def vector_bytes(self, dim: int) -> dict[str, float]:
+        """
+        벡터 1개당 (RAM, 디스크) 바이트 추정치. 리포트용 (HNSW 그래프/payload 제외).
+        """
+        original = dim * 4
+        compressed = {"none": 0, "int8": dim, "binary": dim / 8}[self.quantization]
+        ram = compressed + (0 if self.on_disk else original)
+        return {"ram": ram, "disk": original + compressed}
+
+
+PROFILES: dict[str, CollectionProfile] = {
+    # 기존과 같은 float32 전체 RAM
+    "float32": CollectionProfile("float32"),
+    # int8 압축은 RAM, 원본은 디스크. 후보 2배 뽑아서 원본으로 rescore
+    "int8": CollectionProfile("int8", quantization="int8", on_disk=True, oversampling=2.0),
+    # binary는 정보 손실이 커서 후보를 더 많이 (bge-m3처럼 1024차원 이상에서 권장)
+    "binary": CollectionProfile("binary", quantization="binary", on_disk=True, oversampling=3.0),
+    # 원본만 디스크 (압축 없음): RAM은 최소, 검색은 디스크 I/O
+    "float32_disk": CollectionProfile("float32_disk", on_disk=True),
+}
+
+
+def get_profile(name: Optional[str] = None) -> CollectionProfile:
+    """
+    QDRANT_PROFILE: float32(기본) | int8 | binary | float32_disk
+    """
+    name = (name or os.getenv("QDRANT_PROFILE", "float32")).lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown QDRANT_PROFILE: {name} (가능: {', '.join(PROFILES)})")
+    return PROFILES[name]
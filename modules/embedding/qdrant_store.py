@@ -1,49 +1,152 @@
 from __future__ import annotations
 
+import dataclasses
+import sqlite3
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
+import numpy as np
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
 from langchain_core.documents import Document
 from langchain_qdrant import QdrantVectorStore
 
+from modules.embedding.embedder import embed_matrix
+from modules.embedding.manifest import (
+    IndexManifest,
+    chunk_key,
+    content_hash,
+    embeddings_id,
+    point_id,
+)
+from modules.embedding.pipeline import PipelineSettings, PipelineStats, run_index_pipeline
+from modules.embedding.profiles import CollectionProfile, get_profile
+from modules.retrieval.cache import bump_collection_version
+from modules.retrieval.filters import PAYLOAD_SCHEMA
+from modules.retrieval.registry import get_registry
+
+
+def _create_collection(
+    client: QdrantClient,
+    collection_name: str,
+    dim: int,
+    profile: Optional[CollectionProfile] = None,
+) -> None:
+    profile = profile or get_profile()
+    try:
+        client.delete_collection(collection_name=collection_name)
+    except Exception:
+        pass
+
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=profile.vectors_config(dim),
+        quantization_config=profile.quantization_config(),
+    )
+
+    # 필터에 쓰는 metadata 필드 인덱스 (서버 Qdrant는 필터를 HNSW 탐색 안에서 바로 적용)
+    # local mode는 경고 1번 후 무시됨
+    for field_name, schema in PAYLOAD_SCHEMA.items():
+        client.create_payload_index(collection_name, field_name=field_name, field_schema=schema)
+
+
+def _collection_dim(client: QdrantClient, collection_name: str) -> int | None:
+    if not client.collection_exists(collection_name):
+        return None
+    params = client.get_collection(collection_name).config.params.vectors
+    return params.size if isinstance(params, models.VectorParams) else None
+
+
+def _payload(doc: Document) -> dict:
+    # QdrantVectorStore.add_documents와 같은 payload 모양 → similarity_search가 그대로 읽음
+    return {
+        QdrantVectorStore.CONTENT_KEY: doc.page_content,
+        QdrantVectorStore.METADATA_KEY: doc.metadata,
+    }
+
+
+def _upsert_matrix(
+    client: QdrantClient,
+    collection_name: str,
+    documents: list[Document],
+    vectors: np.ndarray,
+) -> None:
+    """
+    (n, dim) float32 행렬을 그대로 업서트 (벡터별 Python list를 만들지 않음).
+    - (doc_id, chunk_id)로 만든 결정적 id → 같은 청크를 다시 넣으면 덮어쓰기
+    """
+    client.upload_collection(
+        collection_name=collection_name,
+        vectors=vectors,
+        payload=[_payload(d) for d in documents],
+        ids=[point_id(chunk_key(d.metadata)) for d in documents],
+        batch_size=len(documents),
+        wait=True,
+    )
+
+
+def _pipeline_settings(batch_size: Optional[int], pipeline: Optional[PipelineSettings]) -> PipelineSettings:
+    pipeline = pipeline or PipelineSettings()
+    if batch_size is not None:
+        pipeline = dataclasses.replace(pipeline, batch_size=batch_size)
+    return pipeline
+
+
+def _add_in_batches(
+    client: QdrantClient,
+    collection_name: str,
+    documents: Iterable[Document],
+    embeddings,
+    pipeline: PipelineSettings,
+) -> PipelineStats:
+    # 배치마다: 텍스트 → float32 행렬 1개 → 업서트 1번 (임베딩과 업서트는 겹쳐서 실행)
+    stats = run_index_pipeline(
+        documents,
+        embed_fn=lambda batch: embed_matrix(embeddings, [d.page_content for d in batch]),
+        upsert_fn=lambda batch, vectors: _upsert_matrix(client, collection_name, batch, vectors),
+        settings=pipeline,
+    )
+    print(f"[Index] {collection_name}: {stats.report()}")
+    return stats
+
 
 def build_qdrant_vectorstore(
     *,
-    documents: list[Document],
+    documents: Iterable[Document],
     embeddings,
     qdrant_path: Path,
     collection_name: str,
     recreate: bool = True,
-    batch_size: int = 128,
+    batch_size: Optional[int] = None,
+    pipeline: Optional[PipelineSettings] = None,
+    write_manifest: bool = True,
+    profile: Optional[CollectionProfile] = None,
 ):
     """
     documents -> (임베딩 생성) -> Qdrant 저장
 
     - recreate=True면 매번 컬렉션을 지우고 새로 만듦(개발/실험에 편함)
+    - 넣은 청크 목록은 manifest로 남겨서 다음번 incremental 색인의 기준이 됨
+    - 임베딩/업서트는 파이프라인으로 겹쳐서 실행 (pipeline, 기본: INDEX_* 환경변수)
+    - batch_size를 주면 pipeline.batch_size 대신 사용
+    - profile: 컬렉션 저장 방식 (float32/int8/binary/on-disk, 기본 QDRANT_PROFILE). recreate=True일 때만 적용
+    - documents는 generator여도 됨 (한 번만 순회). write_manifest=False면 청크 수에 비례하는
+      manifest도 안 만들어서 메모리가 배치 크기에만 비례 (대신 다음 incremental은 전체 재색인)
     """
     qdrant_path = Path(qdrant_path)
     qdrant_path.parent.mkdir(parents=True, exist_ok=True)
 
-    client = QdrantClient(path=str(qdrant_path))
+    # 같은 프로세스에서 search()가 쓰는 client와 공유 (local mode는 path당 client 1개만 가능)
+    registry = get_registry()
+    client = registry.get_client(qdrant_path)
 
     # 임베딩 차원 확인(한 번만)
     dim = len(embeddings.embed_query("임베딩 차원 확인"))
 
     if recreate:
-        try:
-            client.delete_collection(collection_name=collection_name)
-        except Exception:
-            pass
-
-        client.create_collection(
-            collection_name=collection_name,
-            vectors_config=models.VectorParams(
-                size=dim,
-                distance=models.Distance.COSINE,
-            ),
-        )
+        _create_collection(client, collection_name, dim, profile)
+        IndexManifest.delete(qdrant_path, collection_name)
+        registry.invalidate(collection_name=collection_name, qdrant_path=qdrant_path)
 
     store = QdrantVectorStore(
         client=client,
@@ -51,8 +154,131 @@ def build_qdrant_vectorstore(
         embedding=embeddings,
     )
 
-    # 배치 삽입
-    for i in range(0, len(documents), batch_size):
-        store.add_documents(documents[i : i + batch_size])
+    # 배치 삽입 (manifest 항목은 넣으면서 같이 기록 → documents를 두 번 순회하지 않음)
+    entries: dict[str, str] = {}
+
+    def _tracked(docs: Iterable[Document]) -> Iterable[Document]:
+        for d in docs:
+            entries[chunk_key(d.metadata)] = content_hash(d)
+            yield d
+
+    _add_in_batches(
+        client,
+        collection_name,
+        _tracked(documents) if write_manifest else documents,
+        embeddings,
+        _pipeline_settings(batch_size, pipeline),
+    )
+
+    if write_manifest:
+        manifest = (None if recreate else IndexManifest.load(qdrant_path, collection_name)) or IndexManifest(
+            collection_name=collection_name,
+            embeddings=embeddings_id(embeddings),
+        )
+        manifest.entries.update(entries)
+        manifest.save(qdrant_path)
+    else:
+        # 예전 manifest가 남아 있으면 incremental이 잘못된 기준으로 비교하니 지움
+        IndexManifest.delete(qdrant_path, collection_name)
+
+    # 검색 결과 캐시가 예전 컬렉션 결과를 돌려주지 않게
+    bump_collection_version(qdrant_path, collection_name)
 
     return store
+
+
+def compact_local_collection(qdrant_path: Path, collection_name: str) -> None:
+    """
+    Qdrant local mode 컬렉션 정리.
+    - local mode는 sqlite에 point를 저장하는데, 삭제해도 파일 크기는 안 줄어듦 → VACUUM
+    - 반드시 해당 path를 연 QdrantClient를 close 한 뒤에 호출
+    """
+    db_path = Path(qdrant_path) / "collection" / collection_name / "storage.sqlite"
+    if not db_path.exists():
+        return
+
+    con = sqlite3.connect(str(db_path))
+    try:
+        con.execute("VACUUM")
+    finally:
+        con.close()
+
+
+def sync_qdrant_vectorstore(
+    *,
+    documents: Iterable[Document],
+    embeddings,
+    qdrant_path: Path,
+    collection_name: str,
+    batch_size: Optional[int] = None,
+    pipeline: Optional[PipelineSettings] = None,
+    compact: bool = True,
+):
+    """
+    incremental 색인: manifest와 비교해서 바뀐 것만 반영.
+
+    - 새 청크 / 내용(metadata 포함)이 바뀐 청크만 임베딩해서 upsert
+    - 이번 documents에 없는 청크(사라진 공고 등)는 컬렉션에서 삭제
+    - 삭제가 있었으면 compact(local sqlite VACUUM)까지
+
+    manifest가 없거나, 임베딩 모델/차원이 바뀌었으면 전체 재색인(build_qdrant_vectorstore)으로 넘김.
+    """
+    qdrant_path = Path(qdrant_path)
+    documents = list(documents)
+    manifest = IndexManifest.load(qdrant_path, collection_name)
+
+    registry = get_registry()
+    client = registry.get_client(qdrant_path)
+    dim = len(embeddings.embed_query("임베딩 차원 확인"))
+
+    if (
+        manifest is None
+        or manifest.embeddings != embeddings_id(embeddings)
+        or _collection_dim(client, collection_name) != dim
+    ):
+        print(f"[Index] full rebuild: {collection_name} (manifest 없음 또는 임베딩 변경)")
+        return build_qdrant_vectorstore(
+            documents=documents,
+            embeddings=embeddings,
+            qdrant_path=qdrant_path,
+            collection_name=collection_name,
+            recreate=True,
+            batch_size=batch_size,
+            pipeline=pipeline,
+        )
+
+    current = {chunk_key(d.metadata): (content_hash(d), d) for d in documents}
+
+    changed = [d for key, (h, d) in current.items() if manifest.entries.get(key) != h]
+    removed = [key for key in manifest.entries if key not in current]
+
+    if changed:
+        _add_in_batches(client, collection_name, changed, embeddings, _pipeline_settings(batch_size, pipeline))
+
+    if removed:
+        client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=[point_id(k) for k in removed]),
+        )
+
+    manifest.entries = {key: h for key, (h, _) in current.items()}
+    manifest.save(qdrant_path)
+    if changed or removed:
+        bump_collection_version(qdrant_path, collection_name)
+
+    print(
+        f"[Index] incremental: {collection_name} "
+        f"upserted={len(changed)} deleted={len(removed)} unchanged={len(current) - len(changed)}"
+    )
+
+    if compact and removed:
+        # VACUUM은 sqlite를 잡고 있는 client를 닫은 뒤에 해야 함 → 닫고 정리 후 다시 열기
+        registry.close(qdrant_path)
+        compact_local_collection(qdrant_path, collection_name)
+        client = registry.get_client(qdrant_path)
+
+    return QdrantVectorStore(
+        client=client,
+        collection_name=collection_name,
+        embedding=embeddings,
+    )
@@ -1,3 +1,11 @@
-from .mixed_eval import main as run_mixed_eval
+from typing import TYPE_CHECKING
+
+from modules.utils.lazy import lazy_exports
+
+# run_mixed_eval은 처음 쓸 때 import → questions/metrics만 쓰는 스크립트는 검색·생성 스택을 안 불러옴
+__getattr__, __dir__ = lazy_exports(__name__, {"run_mixed_eval": ".mixed_eval:main"})
+
+if TYPE_CHECKING:
+    from .mixed_eval import main as run_mixed_eval
 
 __all__ = ["run_mixed_eval"]
@@ -1,33 +1,16 @@
 # modules/eval/judge_eval.py
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 from typing import Dict, Any
 
-
-def judge_dummy(query: str, answer: str) -> Dict[str, Any]:
-    # 로컬 실행 확인용 (의미 있는 평가는 GCP에서)
-    return {
-        "accuracy": 3,
-        "completeness": 3,
-        "professionalism": 3,
-        "rationale": "DUMMY 판사: 로컬 스모크 테스트용 고정 점수",
-    }
+from modules.utils.tracing import span
 
 
-def judge_openai(query: str, answer: str) -> Dict[str, Any]:
-    """
-    PROJECT.ipynb의 G-Eval 아이디어를 .py로 옮긴 버전.
-    - 3가지 기준(정확성/완전성/전문성)
-    - JSON으로만 출력하게 강제 (파싱 쉬움)
-    """
-    from langchain_openai import ChatOpenAI
-
-    model = os.getenv("JUDGE_MODEL", "gpt-5-mini")
-    llm = ChatOpenAI(model=model, temperature=0)
-
-    prompt = f"""
+# G-Eval 판정 프롬프트 ({query}, {answer} 채워서 사용). 바꾸면 eval 캐시의 judge 단계만 다시 계산됨
+JUDGE_PROMPT = """
 당신은 10년 차 입찰 전문 컨설턴트입니다.
 다음 AI 답변을 평가하세요.
 
@@ -51,6 +34,30 @@ def judge_openai(query: str, answer: str) -> Dict[str, Any]:
 }}
 """.strip()
 
+
+def judge_dummy(query: str, answer: str) -> Dict[str, Any]:
+    # 로컬 실행 확인용 (의미 있는 평가는 GCP에서)
+    return {
+        "accuracy": 3,
+        "completeness": 3,
+        "professionalism": 3,
+        "rationale": "DUMMY 판사: 로컬 스모크 테스트용 고정 점수",
+    }
+
+
+def judge_openai(query: str, answer: str) -> Dict[str, Any]:
+    """
+    PROJECT.ipynb의 G-Eval 아이디어를 .py로 옮긴 버전.
+    - 3가지 기준(정확성/완전성/전문성)
+    - JSON으로만 출력하게 강제 (파싱 쉬움)
+    """
+    from langchain_openai import ChatOpenAI
+
+    model = os.getenv("JUDGE_MODEL", "gpt-5-mini")
+    llm = ChatOpenAI(model=model, temperature=0)
+
+    prompt = JUDGE_PROMPT.format(query=query, answer=answer)
+
     resp = llm.invoke(prompt).content.strip()
 
     # 혹시 앞뒤에 잡텍스트 붙으면 JSON만 추출
@@ -62,8 +69,21 @@ def judge_openai(query: str, answer: str) -> Dict[str, Any]:
     return json.loads(resp)
 
 
-def judge(query: str, answer: str) -> Dict[str, Any]:
+def judge_config() -> Dict[str, Any]:
+    """
+    judge 결과에 영향을 주는 설정 (eval 단계 캐시 키용).
+    """
     backend = os.getenv("JUDGE_BACKEND", "dummy").lower()
+    config: Dict[str, Any] = {"backend": backend}
     if backend == "openai":
-        return judge_openai(query, answer)
-    return judge_dummy(query, answer)
+        config["model"] = os.getenv("JUDGE_MODEL", "gpt-5-mini")
+        config["prompt_sha"] = hashlib.sha256(JUDGE_PROMPT.encode("utf-8")).hexdigest()[:16]
+    return config
+
+
+def judge(query: str, answer: str) -> Dict[str, Any]:
+    backend = os.getenv("JUDGE_BACKEND", "dummy").lower()
+    with span("judge", backend=backend):
+        if backend == "openai":
+            return judge_openai(query, answer)
+        return judge_dummy(query, answer)
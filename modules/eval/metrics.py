@@ -2,7 +2,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Set, Dict
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+import pandas as pd
+from langchain_core.documents import Document
+
+
+METRIC_NAMES = ("hit", "mrr", "recall", "precision", "ndcg")
 
 
 @dataclass
@@ -11,21 +18,136 @@ class EvalResult:
     mrr: float
 
 
-def hit_and_mrr_at_k(retrieved_doc_ids: List[str], gold_doc_ids: Set[str], k: int) -> EvalResult:
+def retrieved_ids(docs: Iterable[Document], field: str = "doc_id") -> List[str]:
     """
-    retrieved_doc_ids: retriever 결과에서 doc_id만 뽑은 리스트 (순서 중요)
-    gold_doc_ids: 정답 doc_id 집합 (정답이 1개면 set에 1개)
+    검색 결과 Document → 정답과 비교할 id 목록 (순서 유지, 값이 없는 문서는 건너뜀).
+    - field="doc_id": 공고 번호 정답(run_eval)
+    - field="source": project_id 정답(retrieval_eval / mixed_eval)
+    """
+    return [str(d.metadata.get(field)) for d in docs if d.metadata.get(field)]
+
+
+def relevance_matrix(
+    retrieved: Sequence[Sequence[str]],
+    golds: Sequence[Set[str]],
+    max_k: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (쿼리 수, max_k) bool 행렬 2개.
+    - rel[i, r]: i번째 쿼리의 r+1위 결과가 정답인지
+    - first[i, r]: 그 정답 id가 r+1위에서 "처음" 나왔는지
+      (같은 project의 청크가 여러 개 나와도 recall/nDCG에서는 한 번만 셈)
+    set 조회는 여기서 쿼리 × max_k번만 하고, 나머지 지표 계산은 전부 NumPy.
     """
-    topk = retrieved_doc_ids[:k]
+    n = len(retrieved)
+    rel = np.zeros((n, max_k), dtype=bool)
+    first = np.zeros((n, max_k), dtype=bool)
+    for i, (ids, gold) in enumerate(zip(retrieved, golds)):
+        seen: Set[str] = set()
+        for r, d in enumerate(ids[:max_k]):
+            if d in gold:
+                rel[i, r] = True
+                if d not in seen:
+                    first[i, r] = True
+                    seen.add(d)
+    return rel, first
 
-    # Hit@k
-    hit = 1.0 if any(d in gold_doc_ids for d in topk) else 0.0
 
-    # MRR@k
-    mrr = 0.0
-    for rank, d in enumerate(topk, start=1):
-        if d in gold_doc_ids:
-            mrr = 1.0 / rank
-            break
+@dataclass
+class RetrievalMetrics:
+    """
+    evaluate_rankings() 결과.
+    - ks: 계산한 k 목록
+    - per_query[name]: (쿼리 수, len(ks)) 배열 (name: hit / mrr / recall / precision / ndcg)
+    - first_rank: 쿼리별 첫 정답 순위 (max_k 안에 없으면 -1)
+    """
+    ks: tuple
+    per_query: Dict[str, np.ndarray]
+    first_rank: np.ndarray
+
+    def column(self, name: str, k: int) -> np.ndarray:
+        return self.per_query[name][:, self.ks.index(k)]
+
+    def mean(self, k: int) -> Dict[str, float]:
+        return {name: float(self.column(name, k).mean()) if len(self.first_rank) else 0.0 for name in METRIC_NAMES}
+
+    def to_frame(self) -> pd.DataFrame:
+        # k별 평균 (행: k, 열: 지표)
+        rows = [{"k": k, **self.mean(k)} for k in self.ks]
+        return pd.DataFrame(rows)
+
+
+def evaluate_rankings(
+    retrieved: Sequence[Sequence[str]],
+    golds: Sequence[Set[str]],
+    ks: Iterable[int],
+) -> RetrievalMetrics:
+    """
+    쿼리별 검색 결과 id 목록(max k까지 1번 검색한 것) + 정답 집합 → 모든 k의 Hit/MRR/Recall/Precision/nDCG.
 
-    return EvalResult(hit=hit, mrr=mrr)
+    - Hit@k: top-k에 정답이 하나라도 있으면 1
+    - MRR@k: 첫 정답 순위의 역수 (k 밖이면 0)
+    - Recall@k: top-k에서 찾은 서로 다른 정답 수 / 정답 수
+    - Precision@k: top-k 중 정답 위치 수 / k
+    - nDCG@k: binary relevance, 정답 id는 처음 나온 위치만 gain 1
+
+    k=1..50 곡선도 cumsum 몇 번이라 k 1개와 비용이 거의 같음.
+    """
+    ks = tuple(sorted({int(k) for k in ks}))
+    if not ks or ks[0] < 1:
+        raise ValueError(f"k는 1 이상이어야 합니다: {ks}")
+    max_k = ks[-1]
+
+    rel, first = relevance_matrix(retrieved, golds, max_k)
+    idx = np.asarray(ks) - 1
+    n_gold = np.asarray([len(g) for g in golds], dtype=np.float64)
+
+    rel_cum = np.cumsum(rel, axis=1)[:, idx]
+    found_cum = np.cumsum(first, axis=1)[:, idx]
+
+    # 첫 정답 순위 (1-based, 없으면 -1)
+    has_rel = rel.any(axis=1)
+    first_rank = np.where(has_rel, rel.argmax(axis=1) + 1, -1)
+    in_k = (first_rank[:, None] > 0) & (first_rank[:, None] <= np.asarray(ks)[None, :])
+
+    discount = 1.0 / np.log2(np.arange(2, max_k + 2))
+    dcg = np.cumsum(first * discount, axis=1)[:, idx]
+    ideal_cum = np.concatenate([[0.0], np.cumsum(discount)])
+    idcg = ideal_cum[np.minimum(n_gold[:, None], np.asarray(ks)[None, :]).astype(int)]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_query = {
+            "hit": (rel_cum > 0).astype(np.float64),
+            "mrr": np.where(in_k, 1.0 / np.maximum(first_rank, 1)[:, None], 0.0),
+            "recall": np.where(n_gold[:, None] > 0, found_cum / n_gold[:, None], 0.0),
+            "precision": rel_cum / np.asarray(ks, dtype=np.float64)[None, :],
+            "ndcg": np.where(idcg > 0, dcg / idcg, 0.0),
+        }
+    return RetrievalMetrics(ks=ks, per_query=per_query, first_rank=first_rank)
+
+
+def parse_ks(value: Optional[str], default_k: int) -> tuple:
+    """
+    EVAL_KS 환경변수 → k 목록. "1,3,5,10" 또는 "1-50" 형식, 비어 있으면 (default_k,).
+    """
+    if not value or not value.strip():
+        return (default_k,)
+    ks: Set[int] = set()
+    for part in value.split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            ks.update(range(int(lo), int(hi) + 1))
+        elif part:
+            ks.add(int(part))
+    return tuple(sorted(ks))
+
+
+def hit_and_mrr_at_k(retrieved_doc_ids: List[str], gold_doc_ids: Set[str], k: int) -> EvalResult:
+    """
+    retrieved_doc_ids: retriever 결과에서 doc_id만 뽑은 리스트 (순서 중요)
+    gold_doc_ids: 정답 doc_id 집합 (정답이 1개면 set에 1개)
+    (쿼리 1개용 wrapper. 여러 쿼리/여러 k는 evaluate_rankings 사용)
+    """
+    m = evaluate_rankings([retrieved_doc_ids], [gold_doc_ids], [k])
+    return EvalResult(hit=float(m.per_query["hit"][0, 0]), mrr=float(m.per_query["mrr"][0, 0]))
@@ -3,13 +3,18 @@ from __future__ import annotations
 
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Set, Dict, Any
 
 import pandas as pd
 
-from modules.retrieval import search
-from modules.eval.judge_eval import judge
+from modules.retrieval import retrieval_config, search_many_with_status
+from modules.eval.judge_eval import judge, judge_config
+from modules.eval.metrics import evaluate_rankings, retrieved_ids
+from modules.eval.stage_cache import StageCache, config_hash, docs_fingerprint, docs_from_json, docs_to_json
+from modules.rag.generator import generator_config
+from modules.utils.ratelimit import RateLimiter
 
 # ✅ RAG 답변까지 같이 평가하려면 이 함수가 있어야 함
 from modules.rag import answer_query
@@ -25,30 +30,142 @@ def _parse_gold_projects(s: str) -> Set[str]:
 
 
 def _hit_mrr_at_k(retrieved_projects: List[str], gold_projects: Set[str], k: int):
-    topk = retrieved_projects[:k]
+    # 쿼리 1개용 wrapper (metrics.evaluate_rankings와 같은 계산)
+    m = evaluate_rankings([retrieved_projects], [gold_projects], [k])
+    return float(m.per_query["hit"][0, 0]), float(m.per_query["mrr"][0, 0]), int(m.first_rank[0])
 
-    hit = 1.0 if any(p in gold_projects for p in topk) else 0.0
 
-    mrr = 0.0
-    first_rank = -1
-    for rank, p in enumerate(topk, start=1):
-        if p in gold_projects:
-            mrr = 1.0 / rank
-            first_rank = rank
-            break
+def _record_hash(query: str, docs, *, rag_k: int, gen_config: Dict[str, Any], jdg_config: Dict[str, Any]) -> str:
+    # checkpoint 기록 1개를 결정하는 입력 + 설정 (검색 결과 / 생성 설정 / 판정 설정)
+    return config_hash({
+        "query": query,
+        "docs": docs_fingerprint(docs[:rag_k]),
+        "generation": gen_config,
+        "judge": jdg_config,
+    })
 
-    return hit, mrr, first_rank
+
+def _load_checkpoint(path: Path, expected: Dict[int, str]) -> Dict[int, Dict[str, Any]]:
+    """
+    이전 실행이 남긴 jsonl에서 끝난 쿼리 기록을 읽음 (query_id -> 기록).
+    expected = query_id -> 이번 실행의 _record_hash.
+    중간에 죽어서 잘린 마지막 줄 / 이번 평가셋에 없는 query_id / config_hash가 다른 기록
+    (검색 결과나 생성·판정 설정이 바뀜)은 버림 → 그 쿼리는 다시 계산 (단계 캐시는 그대로 사용).
+    """
+    done: Dict[int, Dict[str, Any]] = {}
+    if not path.exists():
+        return done
+    # 잘린 줄이 한글 중간에서 끊겼을 수 있으니 decode 에러는 무시 (그 줄은 json 파싱에서 탈락)
+    with path.open(encoding="utf-8", errors="replace") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+                qid = int(rec["query_id"])
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                continue
+            if qid in expected and rec.get("config_hash") == expected[qid]:
+                done[qid] = rec
+    return done
+
+
+def _write_jsonl(path: Path, records: List[Dict[str, Any]]) -> None:
+    # 임시 파일에 다 쓰고 교체 → 쓰는 도중 죽어도 기존 파일은 그대로
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    tmp.replace(path)
+
+
+def _retrieve_cached(queries: List[str], *, top_k: int, cache: StageCache) -> List[List[Any]]:
+    # 1) Retrieval: 캐시에 없는 쿼리만 모아서 batch 검색
+    config = retrieval_config(k=top_k)
+    keys = [config_hash({"query": q, "config": config}) for q in queries]
+    cached = [cache.get("retrieval", key) for key in keys]
+
+    missing = [i for i, c in enumerate(cached) if c is None]
+    found, complete = search_many_with_status([queries[i] for i in missing], k=top_k) if missing else ([], [])
+
+    all_docs = [docs_from_json(c) if c is not None else None for c in cached]
+    for i, docs, ok in zip(missing, found, complete):
+        # rerank budget fallback(ANN 순서)은 저장 안 함 → 다음 실행에서 다시 검색
+        if ok:
+            cache.put("retrieval", keys[i], docs_to_json(docs))
+        all_docs[i] = docs
+    return all_docs
+
+
+def _generate_and_judge(
+    qid: int,
+    query: str,
+    docs,
+    *,
+    rag_k: int,
+    generate_limiter: RateLimiter,
+    judge_limiter: RateLimiter,
+    cache: StageCache,
+    gen_config: Dict[str, Any],
+    jdg_config: Dict[str, Any],
+    record_hash: str,
+) -> Dict[str, Any]:
+    # 2) RAG 답변 생성(더미 가능) + G-Eval 판정 (워커 스레드에서 실행)
+    #    각 단계는 (입력 + 설정) 해시로 캐시 → 바뀐 단계부터만 다시 계산
+    used = docs[:rag_k]
+    gen_key = config_hash({"query": query, "docs": docs_fingerprint(used), "config": gen_config})
+    answer = cache.get("generation", gen_key)
+    if answer is None:
+        generate_limiter.acquire()
+        answer, _ = answer_query(query, k=rag_k, docs=used)
+        cache.put("generation", gen_key, answer)
+
+    judge_key = config_hash({"query": query, "answer": answer, "config": jdg_config})
+    j = cache.get("judge", judge_key)
+    if j is None:
+        judge_limiter.acquire()
+        j = judge(query, answer)
+        cache.put("judge", judge_key, j)
+
+    return {
+        "query_id": qid,
+        "query_text": query,
+        "answer": answer,
+        "judge": j,
+        "config_hash": record_hash,
+    }
 
 
 def main():
+    """
+    Retrieval(Hit/MRR) + 답변 G-Eval 혼합 평가.
+
+    EVAL_WORKERS=8 EVAL_GENERATE_RPM=60 EVAL_JUDGE_RPM=60 PYTHONPATH=$(pwd) python -m modules.eval.mixed_eval
+
+    - 생성/판정은 EVAL_WORKERS개 스레드로 동시에 (1이면 순서대로)
+    - EVAL_GENERATE_RPM / EVAL_JUDGE_RPM: 분당 호출 수 제한 (0이면 제한 없음)
+    - 끝난 쿼리는 바로 jsonl에 1줄씩 기록 → 중간에 죽어도 다시 실행하면 끝난 query_id는 건너뜀
+      (기록마다 config_hash를 남겨서 검색 결과나 생성·판정 설정이 바뀐 쿼리는 다시 계산, EVAL_RESUME=0이면 처음부터)
+    - 마지막에 jsonl/csv를 평가셋 순서로 다시 써서 결과 파일은 순차 실행과 같음
+    - 단계(retrieval / generation / judge) 결과는 EVAL_CACHE_PATH(sqlite)에 (입력 + 설정) 해시로 저장
+      → judge 모델만 바꾸면 retrieval/generation은 캐시에서, 프롬프트만 바꾸면 retrieval만 캐시에서
+      (EVAL_CACHE=0이면 끔)
+    """
     eval_path = os.getenv("EVAL_PATH", "data/eval_queries.csv")
     top_k = int(os.getenv("EVAL_TOP_K", "5"))
     rag_k = int(os.getenv("RAG_TOP_K", str(top_k)))
+    workers = max(1, int(os.getenv("EVAL_WORKERS", "1")))
+    resume = os.getenv("EVAL_RESUME", "1") == "1"
+    generate_limiter = RateLimiter(float(os.getenv("EVAL_GENERATE_RPM", "0")))
+    judge_limiter = RateLimiter(float(os.getenv("EVAL_JUDGE_RPM", "0")))
 
     out_csv = os.getenv("EVAL_OUT", "outputs/eval_mixed_results.csv")
     out_jsonl = os.getenv("EVAL_JUDGMENTS_OUT", "outputs/eval_mixed_judgments.jsonl")
+    cache = StageCache(
+        Path(os.getenv("EVAL_CACHE_PATH", "outputs/eval_cache/stages.sqlite")),
+        enabled=os.getenv("EVAL_CACHE", "1") == "1",
+    )
 
     df = pd.read_csv(eval_path)
+    query_ids = [int(q) for q in df["query_id"]]
 
     rows: List[Dict[str, Any]] = []
     judgments_fp = Path(out_jsonl)
@@ -57,55 +174,105 @@ def main():
     hits, mrrs = [], []
     accs, comps, profs = [], [], []
 
-    with judgments_fp.open("w", encoding="utf-8") as fjsonl:
-        for i, row in df.iterrows():
-            qid = int(row["query_id"])
-            query = str(row["query_text"])
-            gold = _parse_gold_projects(row["gold_project_ids"])
-
-            # 1) Retrieval 평가용 검색
-            docs = search(query, k=top_k)
-            retrieved_projects = [str(d.metadata.get("source")) for d in docs if d.metadata.get("source")]
-
-            hit, mrr, first_rank = _hit_mrr_at_k(retrieved_projects, gold, k=top_k)
-            hits.append(hit)
-            mrrs.append(mrr)
-
-            # 2) RAG 답변 생성(더미 가능) + G-Eval 판정
-            answer, used_docs = answer_query(query, k=rag_k, docs=docs[:rag_k])
-            j = judge(query, answer)
-
-            acc = int(j.get("accuracy", 0))
-            comp = int(j.get("completeness", 0))
-            prof = int(j.get("professionalism", 0))
-
-            accs.append(acc); comps.append(comp); profs.append(prof)
-
-            # jsonl 저장(원문 로그)
-            fjsonl.write(json.dumps({
-                "query_id": qid,
-                "query_text": query,
-                "answer": answer,
-                "judge": j,
-            }, ensure_ascii=False) + "\n")
-
-            rows.append({
-                "query_id": qid,
-                "query_text": query,
-                "gold_project_ids": "|".join(sorted(gold)),
-                f"retrieved_projects_top{top_k}": "|".join(retrieved_projects[:top_k]),
-                f"hit@{top_k}": hit,
-                f"mrr@{top_k}": mrr,
-                "first_gold_rank": first_rank,
-
-                # ✅ G-Eval 점수도 같은 row에 합침
-                "g_eval_accuracy": acc,
-                "g_eval_completeness": comp,
-                "g_eval_professionalism": prof,
-                "g_eval_rationale": str(j.get("rationale", ""))[:300],  # 너무 길면 잘라 저장
-            })
-
-            print(f"[{i+1}/{len(df)}] id={qid} hit={hit:.0f} mrr={mrr:.3f} | G(acc={acc}, comp={comp}, prof={prof})")
+    # 1) Retrieval 평가용 검색 (쿼리 전체를 batch로 한 번에)
+    all_docs = _retrieve_cached(df["query_text"].astype(str).tolist(), top_k=top_k, cache=cache)
+
+    gen_config = generator_config()
+    jdg_config = judge_config()
+    queries = df["query_text"].astype(str).tolist()
+    record_hashes = {
+        qid: _record_hash(query, docs, rag_k=rag_k, gen_config=gen_config, jdg_config=jdg_config)
+        for qid, query, docs in zip(query_ids, queries, all_docs)
+    }
+
+    # 이어하기: 설정이 같은 끝난 기록만 남겨서 checkpoint를 다시 씀 (잘린 마지막 줄 / 바뀐 설정 제거)
+    done = _load_checkpoint(judgments_fp, record_hashes) if resume else {}
+    _write_jsonl(judgments_fp, [done[q] for q in query_ids if q in done])
+    if done:
+        print(f"[Resume] {len(done)}/{len(df)} 완료된 쿼리 건너뜀 ({out_jsonl})")
+
+    todo = [
+        (qid, query, docs)
+        for qid, query, docs in zip(query_ids, queries, all_docs)
+        if qid not in done
+    ]
+    with judgments_fp.open("a", encoding="utf-8") as fjsonl, ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _generate_and_judge,
+                qid,
+                query,
+                docs,
+                rag_k=rag_k,
+                generate_limiter=generate_limiter,
+                judge_limiter=judge_limiter,
+                cache=cache,
+                gen_config=gen_config,
+                jdg_config=jdg_config,
+                record_hash=record_hashes[qid],
+            )
+            for qid, query, docs in todo
+        ]
+        try:
+            for fut in as_completed(futures):
+                rec = fut.result()
+                done[rec["query_id"]] = rec
+
+                # jsonl 저장(원문 로그) = checkpoint. 끝나는 순서대로 바로 기록
+                fjsonl.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                fjsonl.flush()
+
+                j = rec["judge"]
+                print(
+                    f"[{len(done)}/{len(df)}] id={rec['query_id']} "
+                    f"| G(acc={j.get('accuracy', 0)}, comp={j.get('completeness', 0)}, prof={j.get('professionalism', 0)})"
+                )
+        except BaseException:
+            # 남은 쿼리는 취소 (이미 끝난 건 checkpoint에 남아 있음)
+            for f in futures:
+                f.cancel()
+            raise
+
+    # Retrieval 지표는 쿼리 전체를 한 번에 (metrics.evaluate_rankings)
+    all_retrieved = [retrieved_ids(docs, "source") for docs in all_docs]
+    golds = [_parse_gold_projects(g) for g in df["gold_project_ids"]]
+    metrics = evaluate_rankings(all_retrieved, golds, [top_k])
+
+    for i, ((_, row), retrieved_projects, gold) in enumerate(zip(df.iterrows(), all_retrieved, golds)):
+        qid = int(row["query_id"])
+        query = str(row["query_text"])
+
+        hit = float(metrics.column("hit", top_k)[i])
+        mrr = float(metrics.column("mrr", top_k)[i])
+        first_rank = int(metrics.first_rank[i])
+        hits.append(hit)
+        mrrs.append(mrr)
+
+        j = done[qid]["judge"]
+        acc = int(j.get("accuracy", 0))
+        comp = int(j.get("completeness", 0))
+        prof = int(j.get("professionalism", 0))
+
+        accs.append(acc); comps.append(comp); profs.append(prof)
+
+        rows.append({
+            "query_id": qid,
+            "query_text": query,
+            "gold_project_ids": "|".join(sorted(gold)),
+            f"retrieved_projects_top{top_k}": "|".join(retrieved_projects[:top_k]),
+            f"hit@{top_k}": hit,
+            f"mrr@{top_k}": mrr,
+            "first_gold_rank": first_rank,
+
+            # ✅ G-Eval 점수도 같은 row에 합침
+            "g_eval_accuracy": acc,
+            "g_eval_completeness": comp,
+            "g_eval_professionalism": prof,
+            "g_eval_rationale": str(j.get("rationale", ""))[:300],  # 너무 길면 잘라 저장
+        })
+
+    # 끝나는 순서대로 쌓인 jsonl을 평가셋 순서로 정리 (순차 실행과 같은 파일)
+    _write_jsonl(judgments_fp, [done[q] for q in query_ids])
 
     out_df = pd.DataFrame(rows)
     Path(out_csv).parent.mkdir(parents=True, exist_ok=True)
@@ -118,8 +285,11 @@ def main():
     print(f"G-Eval accuracy avg={sum(accs)/len(accs):.3f}")
     print(f"G-Eval completeness avg={sum(comps)/len(comps):.3f}")
     print(f"G-Eval professionalism avg={sum(profs)/len(profs):.3f}")
+    for stage, stats in cache.summary().items():
+        print(f"cache[{stage}] hits={stats['hits']} misses={stats['misses']}")
     print(f"saved -> {out_csv}")
     print(f"saved -> {out_jsonl}")
+    cache.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from modules.embedding.build_qdrant import iter_documents, with_project_fields
+from modules.embedding.embedder import embed_matrix
+from modules.embedding.profiles import get_profile
+from modules.embedding.qdrant_store import build_qdrant_vectorstore
+from modules.eval.retrieval_eval import hit_mrr_at_k, parse_gold_projects
+from modules.loader import iter_chunks_df
+from modules.retrieval import RetrieverSettings, get_registry, search_by_vectors
+from modules.retrieval.cache import normalize_query
+from modules.retrieval.retriever import get_qdrant_path
+
+
+def main():
+    """
+    컬렉션 profile(float32 / int8 / binary ...)별로 같은 청크를 색인하고
+    메모리(추정) / 검색 지연(p50, p95) / Hit@k / MRR@k 를 한 표로 비교.
+
+    PROFILE_REPORT_PROFILES=float32,int8,binary EVAL_TOP_K=5 PYTHONPATH=$(pwd) python -m modules.eval.profile_report
+
+    - 컬렉션 이름: {QDRANT_COLLECTION}__{profile}
+    - 지연은 쿼리 임베딩을 뺀 ANN 검색만 (쿼리 1개씩)
+    - local mode에서는 profile이 적용되지 않아서 결과가 모두 같음 → QDRANT_URL(서버)로 실행
+    """
+    settings = RetrieverSettings()
+    eval_path = os.getenv("EVAL_PATH", "data/eval_queries.csv")
+    k = int(os.getenv("EVAL_TOP_K", "5"))
+    out_path = os.getenv("REPORT_OUT", "outputs/eval_profile_report.csv")
+    profiles = [p.strip() for p in os.getenv("PROFILE_REPORT_PROFILES", "float32,int8,binary").split(",") if p.strip()]
+
+    df = pd.read_csv(eval_path)
+    queries = [normalize_query(str(q)) for q in df["query_text"]]
+    golds = [parse_gold_projects(g) for g in df["gold_project_ids"]]
+
+    registry = get_registry()
+    qdrant_path = get_qdrant_path(settings)
+    embeddings = registry.get_embeddings()
+    query_vectors = embed_matrix(embeddings, queries)
+    dim = query_vectors.shape[1]
+
+    if not os.getenv("QDRANT_URL"):
+        print("[WARN] Qdrant local mode: quantization/on-disk 설정이 적용되지 않습니다 (QDRANT_URL 권장)")
+
+    rows = []
+    for name in profiles:
+        profile = get_profile(name)
+        collection_name = f"{settings.collection_name}__{profile.name}"
+
+        t0 = time.perf_counter()
+        store = build_qdrant_vectorstore(
+            documents=iter_documents(with_project_fields(iter_chunks_df(settings.mode)), settings.mode),
+            embeddings=embeddings,
+            qdrant_path=qdrant_path,
+            collection_name=collection_name,
+            recreate=True,
+            write_manifest=False,
+            profile=profile,
+        )
+        build_seconds = time.perf_counter() - t0
+        n_points = store.client.count(collection_name).count
+
+        params = profile.search_params()
+        latencies, hits, mrrs = [], [], []
+        for vector, gold in zip(query_vectors, golds):
+            t0 = time.perf_counter()
+            docs = search_by_vectors([vector], k=k, collection_name=collection_name, params=params)[0]
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+            retrieved = [str(d.metadata["source"]) for d in docs if d.metadata.get("source")]
+            hit, mrr = hit_mrr_at_k(retrieved, gold, k=k)
+            hits.append(hit)
+            mrrs.append(mrr)
+
+        size = profile.vector_bytes(dim)
+        rows.append(
+            {
+                "profile": profile.name,
+                "collection": collection_name,
+                "points": n_points,
+                "ram_mb_est": round(size["ram"] * n_points / 2**20, 2),
+                "disk_mb_est": round(size["disk"] * n_points / 2**20, 2),
+                "build_s": round(build_seconds, 2),
+                "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+                "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+                f"hit@{k}": round(float(np.mean(hits)), 4),
+                f"mrr@{k}": round(float(np.mean(mrrs)), 4),
+            }
+        )
+
+    out_df = pd.DataFrame(rows)
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    out_df.to_csv(out_path, index=False, encoding="utf-8-sig")
+
+    print("\n===== PROFILE REPORT =====")
+    print(out_df.to_string(index=False))
+    print(f"saved -> {out_path}")
+
+
+if __name__ == "__main__":
+    main()
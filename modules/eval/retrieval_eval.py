@@ -6,7 +6,8 @@ from typing import List, Set
 
 import pandas as pd
 
-from modules.retrieval import search
+from modules.eval.metrics import evaluate_rankings, parse_ks, retrieved_ids
+from modules.retrieval import search_many
 
 
 def parse_gold_projects(s: str) -> Set[str]:
@@ -19,23 +20,21 @@ def parse_gold_projects(s: str) -> Set[str]:
 
 
 def hit_mrr_at_k(retrieved_projects: List[str], gold_projects: Set[str], k: int):
-    topk = retrieved_projects[:k]
-
-    hit = 1.0 if any(p in gold_projects for p in topk) else 0.0
-
-    mrr = 0.0
-    for rank, p in enumerate(topk, start=1):
-        if p in gold_projects:
-            mrr = 1.0 / rank
-            break
-
-    return hit, mrr
+    # 쿼리 1개용 wrapper (metrics.evaluate_rankings와 같은 계산)
+    m = evaluate_rankings([retrieved_projects], [gold_projects], [k])
+    return float(m.per_query["hit"][0, 0]), float(m.per_query["mrr"][0, 0])
 
 
 def main():
+    """
+    project_id 정답 기준 retrieval 평가.
+    EVAL_KS="1-20"처럼 주면 max k로 1번만 검색해서 k별 Hit/MRR/Recall/Precision/nDCG 곡선도 저장.
+    """
     eval_path = os.getenv("EVAL_PATH", "data/eval_queries.csv")
     k = int(os.getenv("EVAL_TOP_K", "5"))
+    ks = tuple(sorted(set(parse_ks(os.getenv("EVAL_KS"), k)) | {k}))
     out_path = os.getenv("EVAL_OUT", "outputs/eval_retrieval_results.csv")
+    curve_path = os.getenv("EVAL_CURVE_OUT", "outputs/eval_retrieval_curve.csv")
 
     df = pd.read_csv(eval_path)
     required = {"query_id", "query_text", "gold_project_ids"}
@@ -43,25 +42,20 @@ def main():
         raise ValueError(f"eval csv 컬럼이 부족합니다. 필요: {sorted(required)}")
 
     rows = []
-    hits, mrrs = [], []
 
-    for i, row in df.iterrows():
-        qid = row["query_id"]
-        query = str(row["query_text"])
-        gold = parse_gold_projects(row["gold_project_ids"])
+    # 쿼리 전체를 한 번에 임베딩 + batch 검색 (가장 큰 k로 1번, 작은 k는 잘라서 계산)
+    all_docs = search_many(df["query_text"].astype(str).tolist(), k=ks[-1])
 
-        docs = search(query, k=k)
+    # ✅ project_id는 metadata['source']로 저장해둔 상태
+    all_retrieved = [retrieved_ids(docs, "source") for docs in all_docs]
+    golds = [parse_gold_projects(g) for g in df["gold_project_ids"]]
+    metrics = evaluate_rankings(all_retrieved, golds, ks)
+    hits = metrics.column("hit", k)
+    mrrs = metrics.column("mrr", k)
 
-        # ✅ project_id는 metadata['source']로 저장해둔 상태
-        retrieved_projects = []
-        for d in docs:
-            p = d.metadata.get("source")
-            if p:
-                retrieved_projects.append(str(p))
-
-        hit, mrr = hit_mrr_at_k(retrieved_projects, gold, k=k)
-        hits.append(hit)
-        mrrs.append(mrr)
+    for (i, row), retrieved_projects, gold, hit, mrr in zip(df.iterrows(), all_retrieved, golds, hits, mrrs):
+        qid = row["query_id"]
+        query = str(row["query_text"])
 
         rows.append(
             {
@@ -86,6 +80,13 @@ def main():
     print(f"MRR@{k}={sum(mrrs)/len(mrrs):.4f}")
     print(f"saved -> {out_path}")
 
+    if len(ks) > 1:
+        curve = metrics.to_frame()
+        curve.to_csv(curve_path, index=False, encoding="utf-8-sig")
+        print("\n===== METRICS BY K =====")
+        print(curve.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+        print(f"saved -> {curve_path}")
+
 
 if __name__ == "__main__":
     main()
@@ -5,8 +5,8 @@ import os
 import pandas as pd
 from typing import Set, List
 
-from modules.retrieval import search
-from modules.eval.metrics import hit_and_mrr_at_k
+from modules.retrieval import search_many
+from modules.eval.metrics import evaluate_rankings, parse_ks, retrieved_ids
 
 
 def _parse_gold(value: str) -> Set[str]:
@@ -31,6 +31,9 @@ def main():
     # 환경변수로 eval 파일 지정 가능하게
     eval_path = os.getenv("EVAL_PATH", "data/eval_questions.csv")
     k = int(os.getenv("EVAL_TOP_K", "5"))
+    # EVAL_KS="1,3,5,10" / "1-20": max k로 1번만 검색해서 k별 지표 표 출력 (EVAL_CURVE_OUT에 저장)
+    ks = tuple(sorted(set(parse_ks(os.getenv("EVAL_KS"), k)) | {k}))
+    curve_path = os.getenv("EVAL_CURVE_OUT", "")
 
     df = pd.read_csv(eval_path)
 
@@ -40,28 +43,33 @@ def main():
     if "question" not in df.columns or "gold_doc_id" not in df.columns:
         raise ValueError("eval csv에는 최소한 'question', 'gold_doc_id' 컬럼이 필요합니다.")
 
-    hits = []
-    mrrs = []
+    # retriever 호출(환경변수로 컬렉션 바뀜) - 질문 전체를 batch로 한 번에
+    all_docs = search_many(df["question"].astype(str).tolist(), k=ks[-1])
 
-    for i, row in df.iterrows():
-        q = str(row["question"])
-        gold = _parse_gold(row["gold_doc_id"])
-
-        docs = search(q, k=k)  # retriever 호출(환경변수로 컬렉션 바뀜)
-        retrieved_doc_ids: List[str] = [str(d.metadata.get("doc_id")) for d in docs if d.metadata.get("doc_id")]
-
-        res = hit_and_mrr_at_k(retrieved_doc_ids, gold, k=k)
-        hits.append(res.hit)
-        mrrs.append(res.mrr)
+    retrieved: List[List[str]] = [retrieved_ids(docs, "doc_id") for docs in all_docs]
+    golds: List[Set[str]] = [_parse_gold(g) for g in df["gold_doc_id"]]
+    metrics = evaluate_rankings(retrieved, golds, ks)
+    hits = metrics.column("hit", k)
+    mrrs = metrics.column("mrr", k)
 
+    for (i, row), hit, mrr in zip(df.iterrows(), hits, mrrs):
+        q = str(row["question"])
         # 진행 로그 (원하면 끌 수 있음)
-        print(f"[{i+1}/{len(df)}] hit={res.hit:.0f} mrr={res.mrr:.3f} q={q[:30]}...")
+        print(f"[{i+1}/{len(df)}] hit={hit:.0f} mrr={mrr:.3f} q={q[:30]}...")
 
     print("\n===== EVAL SUMMARY =====")
     print(f"count = {len(df)}")
     print(f"Hit@{k} = {sum(hits)/len(hits):.4f}")
     print(f"MRR@{k} = {sum(mrrs)/len(mrrs):.4f}")
 
+    if len(ks) > 1:
+        curve = metrics.to_frame()
+        print("\n===== METRICS BY K =====")
+        print(curve.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+        if curve_path:
+            curve.to_csv(curve_path, index=False, encoding="utf-8-sig")
+            print(f"saved -> {curve_path}")
+
 
 if __name__ == "__main__":
     main()
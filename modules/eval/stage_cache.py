@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from langchain_core.documents import Document
+
+from modules.embedding.cache import CacheStats
+
+
+def config_hash(payload: Dict[str, Any]) -> str:
+    # 입력 + 설정 dict → 내용 주소(sha256). 키 순서와 상관없이 같은 값이면 같은 해시
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def docs_to_json(docs: Iterable[Document]) -> List[dict]:
+    return [{"page_content": d.page_content, "metadata": d.metadata} for d in docs]
+
+
+def docs_from_json(items: Iterable[dict]) -> List[Document]:
+    return [Document(page_content=x["page_content"], metadata=x["metadata"]) for x in items]
+
+
+def docs_fingerprint(docs: Iterable[Document]) -> List[str]:
+    # 생성 단계 키용: 문서 내용이 같으면 같은 값 (metadata의 _id 등 검색 부산물은 제외)
+    return [hashlib.sha256((d.page_content or "").encode("utf-8")).hexdigest()[:16] for d in docs]
+
+
+class StageCache:
+    """
+    eval 단계별(retrieval / generation / judge) 결과 캐시 (sqlite, JSON 값).
+    - key = config_hash(입력 + 그 단계에 영향을 주는 설정)
+      → 예: judge 모델만 바꾸면 retrieval/generation 키는 그대로라서 캐시에서 나옴
+    - 단계별 hit/miss를 stats에 기록 (summary에 출력)
+    - 여러 스레드에서 같이 써도 됨
+    """
+
+    def __init__(self, path: Path, *, enabled: bool = True):
+        self.path = Path(path)
+        self.enabled = enabled
+        self.stats: Dict[str, CacheStats] = defaultdict(CacheStats)
+        self._lock = threading.Lock()
+        self._con: Optional[sqlite3.Connection] = None
+        if enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._con = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute(
+                "CREATE TABLE IF NOT EXISTS artifact ("
+                "stage TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, created REAL NOT NULL, "
+                "PRIMARY KEY (stage, key))"
+            )
+            self._con.commit()
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        value = None
+        if self._con is not None:
+            with self._lock:
+                row = self._con.execute(
+                    "SELECT value FROM artifact WHERE stage=? AND key=?", (stage, key)
+                ).fetchone()
+            value = json.loads(row[0]) if row else None
+        with self._lock:
+            if value is None:
+                self.stats[stage].misses += 1
+            else:
+                self.stats[stage].hits += 1
+        return value
+
+    def put(self, stage: str, key: str, value: Any) -> None:
+        if self._con is None:
+            return
+        text = json.dumps(value, ensure_ascii=False, default=str)
+        with self._lock:
+            self._con.execute(
+                "INSERT OR REPLACE INTO artifact (stage, key, value, created) VALUES (?, ?, ?, ?)",
+                (stage, key, text, time.time()),
+            )
+            self._con.commit()
+
+    def summary(self) -> Dict[str, dict]:
+        with self._lock:
+            return {stage: s.as_dict() for stage, s in self.stats.items()}
+
+    def close(self) -> None:
+        if self._con is not None:
+            self._con.close()
+            self._con = None
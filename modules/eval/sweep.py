@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from modules.embedding.embedder import embed_matrix
+from modules.eval.metrics import METRIC_NAMES, evaluate_rankings, parse_ks, retrieved_ids
+from modules.eval.retrieval_eval import parse_gold_projects
+from modules.retrieval import RetrieverSettings, get_registry, search_by_vectors
+from modules.retrieval.cache import normalize_query
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """
+    sweep 1칸 = (컬렉션, 검색 backend, 임베딩 backend).
+    k는 EVAL_KS로 모든 칸에 같이 적용 (max k로 1번 검색 → 작은 k는 잘라서 계산).
+    """
+    collection: str
+    backend: str = "qdrant"
+    embeddings: str = "dummy"
+
+    @property
+    def name(self) -> str:
+        return f"{self.collection}/{self.backend}/{self.embeddings}"
+
+
+def _expand(spec) -> List[dict]:
+    # {"collection": [...], "backend": [...]} → 모든 조합 / [{...}, {...}] → 그대로
+    if isinstance(spec, list):
+        return [dict(x) for x in spec]
+    keys = list(spec)
+    values = [v if isinstance(v, list) else [v] for v in spec.values()]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def load_grid(value: str, *, default: SweepConfig) -> List[SweepConfig]:
+    """
+    SWEEP_GRID → 설정 목록. JSON 문자열 또는 JSON 파일 경로.
+      - {"collection": ["rfp_recursive_bge_m3", "rfp_semantic_bge_m3"], "backend": ["qdrant", "numpy"]}
+        → 모든 조합
+      - [{"collection": "rfp_recursive_DUMMY", "embeddings": "dummy"}, {"collection": "rfp_recursive_bge_m3", "embeddings": "hf"}]
+        → 적은 것만
+    빠진 키는 default(QDRANT_COLLECTION / RETRIEVAL_BACKEND / EMBEDDINGS_BACKEND) 값.
+    """
+    text = value.strip()
+    if not text.startswith(("{", "[")):
+        text = Path(text).read_text(encoding="utf-8")
+
+    configs: List[SweepConfig] = []
+    for item in _expand(json.loads(text)):
+        unknown = set(item) - {"collection", "backend", "embeddings"}
+        if unknown:
+            raise ValueError(f"SWEEP_GRID에 모르는 키: {sorted(unknown)}")
+        config = SweepConfig(
+            collection=str(item.get("collection", default.collection)),
+            backend=str(item.get("backend", default.backend)).lower(),
+            embeddings=str(item.get("embeddings", default.embeddings)).lower(),
+        )
+        if config not in configs:
+            configs.append(config)
+    return configs
+
+
+def main():
+    """
+    여러 설정(컬렉션 / 검색 backend / 임베딩 backend × k)의 retrieval 지표와 시간을 한 표로 비교.
+
+    SWEEP_GRID='{"collection": ["rfp_recursive_DUMMY", "rfp_semantic_DUMMY"], "backend": ["qdrant", "numpy"]}' \\
+    EVAL_KS="1,3,5,10" PYTHONPATH=$(pwd) python -m modules.eval.sweep
+
+    - 평가 쿼리는 임베딩 backend당 1번만 임베딩 (같은 backend를 쓰는 설정끼리 공유)
+    - 설정마다 max k로 1번만 검색하고 작은 k는 잘라서 계산 (metrics.evaluate_rankings)
+    - 검색은 dense만 (hybrid/rerank 비교는 RETRIEVAL_HYBRID / RERANK_BACKEND로 retrieval_eval)
+    - 없는 컬렉션/인덱스는 [WARN] 출력 후 건너뜀
+    - embed_s: 그 임베딩 backend의 쿼리 임베딩 시간(공유), search_s: 설정별 batch 검색 시간
+    """
+    settings = RetrieverSettings()
+    eval_path = os.getenv("EVAL_PATH", "data/eval_queries.csv")
+    k = int(os.getenv("EVAL_TOP_K", "5"))
+    ks = tuple(sorted(set(parse_ks(os.getenv("EVAL_KS"), k)) | {k}))
+    out_path = os.getenv("SWEEP_OUT", "outputs/eval_sweep.csv")
+
+    default = SweepConfig(
+        collection=settings.collection_name,
+        backend=settings.backend,
+        embeddings=os.getenv("EMBEDDINGS_BACKEND", "dummy").lower(),
+    )
+    grid = os.getenv("SWEEP_GRID", "")
+    configs = load_grid(grid, default=default) if grid.strip() else [default]
+
+    df = pd.read_csv(eval_path)
+    queries = [normalize_query(str(q)) for q in df["query_text"]]
+    golds = [parse_gold_projects(g) for g in df["gold_project_ids"]]
+
+    by_embeddings: Dict[str, List[SweepConfig]] = defaultdict(list)
+    for config in configs:
+        by_embeddings[config.embeddings].append(config)
+
+    registry = get_registry()
+    rows = []
+    for embeddings_backend, group in by_embeddings.items():
+        # 1) 쿼리 임베딩: backend당 1번
+        t0 = time.perf_counter()
+        query_vectors = embed_matrix(registry.get_embeddings(embeddings_backend), queries)
+        embed_seconds = time.perf_counter() - t0
+
+        for config in group:
+            # 2) 검색: 설정당 max k로 1번 (첫 호출의 client 열기/인덱스 로딩은 시간에서 뺌)
+            try:
+                search_by_vectors(
+                    query_vectors[:1],
+                    k=1,
+                    collection_name=config.collection,
+                    backend=config.backend,
+                    embeddings_backend=config.embeddings,
+                )
+            except (ValueError, FileNotFoundError) as e:
+                print(f"[WARN] {config.name} 건너뜀: {e}")
+                continue
+
+            t0 = time.perf_counter()
+            all_docs = search_by_vectors(
+                query_vectors,
+                k=ks[-1],
+                collection_name=config.collection,
+                backend=config.backend,
+                embeddings_backend=config.embeddings,
+            )
+            search_seconds = time.perf_counter() - t0
+
+            # 3) 지표: 모든 k를 한 번에
+            metrics = evaluate_rankings([retrieved_ids(docs, "source") for docs in all_docs], golds, ks)
+            for kk in ks:
+                means = metrics.mean(kk)
+                rows.append(
+                    {
+                        "collection": config.collection,
+                        "backend": config.backend,
+                        "embeddings": config.embeddings,
+                        "k": kk,
+                        **{name: round(means[name], 4) for name in METRIC_NAMES},
+                        "embed_s": round(embed_seconds, 3),
+                        "search_s": round(search_seconds, 3),
+                        "search_ms_per_query": round(search_seconds * 1000 / max(len(queries), 1), 3),
+                    }
+                )
+            print(f"[Sweep] {config.name} done ({search_seconds:.3f}s, {len(queries)} queries, k={ks[-1]})")
+
+    out_df = pd.DataFrame(rows)
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    out_df.to_csv(out_path, index=False, encoding="utf-8-sig")
+
+    print("\n===== SWEEP REPORT =====")
+    print(out_df.to_string(index=False))
+    print(f"saved -> {out_path}")
+
+
+if __name__ == "__main__":
+    main()
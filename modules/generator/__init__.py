@@ -1,3 +1,13 @@
-from .llm import generate_answer
+from typing import TYPE_CHECKING
 
-__all__ = ["generate_answer"]
+from modules.utils.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {"generate_answer": ".llm", "agenerate_answer": ".llm", "stream_answer": ".llm"},
+)
+
+if TYPE_CHECKING:
+    from .llm import generate_answer, agenerate_answer, stream_answer
+
+__all__ = ["generate_answer", "agenerate_answer", "stream_answer"]
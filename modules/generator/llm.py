@@ -2,9 +2,12 @@
 from __future__ import annotations
 
 import os
-from typing import List
+import re
+from typing import Iterator, List, Optional
 from langchain_core.documents import Document
 
+from modules.utils.aio import env_timeout, run_blocking
+
 
 def generate_answer_dummy(question: str, docs: List[Document]) -> str:
     """
@@ -31,16 +34,17 @@ def generate_answer_dummy(question: str, docs: List[Document]) -> str:
     return "\n".join(lines)
 
 
-def generate_answer(question: str, docs: List[Document]) -> str:
+def stream_answer(question: str, docs: List[Document]) -> Iterator[str]:
     """
-    backend에 따라 더미/실제 LLM을 선택.
-    - 로컬: dummy
-    - GCP : openai/hf 등으로 확장 가능
+    backend에 따라 더미/실제 LLM을 선택해서 답변을 토큰(텍스트 조각) 단위로 yield.
+    - 로컬: dummy (완성된 더미 답변을 단어 단위로 잘라서)
+    - GCP : openai/hf 등의 stream 응답 조각을 그대로 yield 하도록 확장
     """
     backend = os.getenv("GENERATOR_BACKEND", "dummy").lower()
 
     if backend == "dummy":
-        return generate_answer_dummy(question, docs)
+        yield from re.findall(r"\s*\S+|\s+", generate_answer_dummy(question, docs))
+        return
 
     # TODO: GCP에서 실제 LLM 붙일 때 여기 확장
     # if backend == "openai":
@@ -49,3 +53,14 @@ def generate_answer(question: str, docs: List[Document]) -> str:
     #     ...
 
     raise ValueError(f"Unknown GENERATOR_BACKEND: {backend}")
+
+
+def generate_answer(question: str, docs: List[Document]) -> str:
+    # stream_answer를 끝까지 받아서 한 번에 반환
+    return "".join(stream_answer(question, docs))
+
+
+async def agenerate_answer(question: str, docs: List[Document], *, timeout: Optional[float] = None) -> str:
+    # async 버전: 블로킹 LLM 호출을 공용 스레드풀로 (timeout 기본 RAG_GENERATE_TIMEOUT)
+    timeout = timeout if timeout is not None else env_timeout("RAG_GENERATE_TIMEOUT")
+    return await run_blocking(generate_answer, question, docs, timeout=timeout)
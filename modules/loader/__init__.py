@@ -1,4 +1,32 @@
 # CSV 로드
 # pdf_list 경로 -> 로컬 경로로 변경
+# (pandas는 로더 함수를 처음 쓸 때 import)
 
-from .datasets import load_base_df, load_fulltext_df, load_chunks_df
+from typing import TYPE_CHECKING
+
+from modules.utils.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        name: ".datasets"
+        for name in (
+            "load_base_df",
+            "load_fulltext_df",
+            "load_chunks_df",
+            "iter_chunks_df",
+            "load_project_fields",
+            "attach_project_fields",
+        )
+    },
+)
+
+if TYPE_CHECKING:
+    from .datasets import (
+        load_base_df,
+        load_fulltext_df,
+        load_chunks_df,
+        iter_chunks_df,
+        load_project_fields,
+        attach_project_fields,
+    )
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+
+from modules.chunking.schema import ChunkColumns
+from modules.paths import ProjectPaths
+from modules.utils.io import ensure_dir, read_csv
+
+
+_COLS = ChunkColumns()
+
+# 청크 저장소 스키마 고정: CSV처럼 doc_id가 int/float로 바뀌는 일이 없게
+CHUNK_SCHEMA = pa.schema(
+    [
+        pa.field(_COLS.doc_id, pa.string(), nullable=False),
+        pa.field(_COLS.chunk_id, pa.int32(), nullable=False),
+        pa.field(_COLS.text, pa.large_string()),
+        pa.field(_COLS.source, pa.string()),
+    ]
+)
+
+# CSV에서 읽을 때도 같은 타입으로 맞추기 위한 dtype
+CSV_DTYPES = {_COLS.doc_id: str, _COLS.source: str}
+
+
+def coerce_chunk_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    청크 DF를 CHUNK_SCHEMA 컬럼/타입으로 정리.
+    - 스키마에 없는 컬럼은 버리고, 없는 컬럼은 None으로 채움
+    - doc_id가 비어 있으면(NaN) "" (astype(str)처럼 "nan"이라는 가짜 id를 만들지 않음)
+    """
+    out = pd.DataFrame(index=df.index)
+    for name in CHUNK_SCHEMA.names:
+        out[name] = df[name] if name in df.columns else None
+
+    out[_COLS.doc_id] = out[_COLS.doc_id].astype("string").fillna("")
+    out[_COLS.chunk_id] = out[_COLS.chunk_id].astype("int32")
+    return out.reset_index(drop=True)
+
+
+# 한 record batch 최대 행 수 → iter_chunk_store가 이 크기 이상을 한 번에 메모리에 올리지 않음
+_MAX_BATCH_ROWS = 8192
+
+
+def _to_batch(df: pd.DataFrame) -> pa.RecordBatch:
+    return pa.RecordBatch.from_pandas(coerce_chunk_df(df), schema=CHUNK_SCHEMA, preserve_index=False)
+
+
+class ChunkStoreWriter:
+    """
+    청크 DF 조각을 받아서 Arrow IPC 파일로 이어 쓰는 writer.
+    - 스트리밍 청킹(iter_chunk_recursive) 결과를 메모리에 모으지 않고 바로 저장할 때 사용
+    - 압축 없이 저장 → 읽을 때 memory-map으로 복사 없이 열림
+
+    with ChunkStoreWriter(path) as w:
+        for frame in frames:
+            w.write(frame)
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.rows = 0
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._sink: Optional[pa.OSFile] = None
+        self._writer: Optional[pa.ipc.RecordBatchFileWriter] = None
+
+    def __enter__(self) -> "ChunkStoreWriter":
+        ensure_dir(self.path.parent)
+        self._sink = pa.OSFile(str(self._tmp_path), "wb")
+        self._writer = pa.ipc.new_file(self._sink, CHUNK_SCHEMA)
+        return self
+
+    def write(self, df: pd.DataFrame) -> None:
+        assert self._writer is not None, "with ChunkStoreWriter(...) 안에서만 write 가능합니다."
+        if df.empty:
+            return
+        for start in range(0, len(df), _MAX_BATCH_ROWS):
+            self._writer.write_batch(_to_batch(df.iloc[start : start + _MAX_BATCH_ROWS]))
+        self.rows += len(df)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        assert self._writer is not None and self._sink is not None
+        self._writer.close()
+        self._sink.close()
+
+        # 실패하면 기존 저장소는 그대로 두고 임시 파일만 정리
+        if exc_type is None:
+            self._tmp_path.replace(self.path)
+        else:
+            self._tmp_path.unlink(missing_ok=True)
+
+
+def write_chunk_store(df: pd.DataFrame, path: Path) -> int:
+    with ChunkStoreWriter(path) as w:
+        w.write(df)
+    return w.rows
+
+
+def open_chunk_table(path: Path, columns: Optional[Sequence[str]] = None) -> pa.Table:
+    """
+    Arrow IPC 청크 저장소를 memory-map으로 열어 pa.Table로 반환 (복사 없음).
+    columns를 주면 그 컬럼만 선택.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"청크 저장소 파일이 없습니다: {path}")
+
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    if columns is not None:
+        table = table.select(list(columns))
+    return table
+
+
+def read_chunk_store(path: Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    # memory-map 여는 건 바로지만 to_pandas()는 고른 컬럼을 전부 pandas로 변환함
+    # → text까지 다 읽으면 파일 크기만큼 시간/메모리. 빠르게 쓰려면 columns로 필요한 것만
+    return open_chunk_table(path, columns).to_pandas()
+
+
+def iter_chunk_store(
+    path: Path,
+    *,
+    batch_size: int = 1024,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    저장소를 batch_size 행씩 DF로 나눠서 yield (전체를 pandas로 올리지 않음).
+    - memory-map 대신 record batch 단위로 읽음 → 읽은 페이지가 RSS에 쌓이지 않아서
+      파일 크기와 상관없이 메모리 사용량이 (record batch 1개 + batch_size 행)으로 고정
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"청크 저장소 파일이 없습니다: {path}")
+
+    with pa.OSFile(str(path), "rb") as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(list(columns))
+            for start in range(0, batch.num_rows, batch_size):
+                yield batch.slice(start, batch_size).to_pandas()
+
+
+def convert_csv_to_store(csv_path: Path, store_path: Path) -> int:
+    df = read_csv(csv_path, dtype=CSV_DTYPES)
+    return write_chunk_store(df, store_path)
+
+
+def main() -> None:
+    """
+    기존 data_list_chunks_*.csv 를 Arrow 저장소(.arrow)로 변환.
+    PYTHONPATH=$(pwd) python -m modules.loader.chunk_store
+    """
+    paths = ProjectPaths()
+
+    pairs = [
+        (paths.csv_chunks_recursive, paths.store_chunks_recursive),
+        (paths.csv_chunks_semantic, paths.store_chunks_semantic),
+    ]
+    for csv_path, store_path in pairs:
+        if not csv_path.exists():
+            print(f"[SKIP] CSV 없음: {csv_path}")
+            continue
+        n = convert_csv_to_store(csv_path, store_path)
+        print(f"[OK] {csv_path.name} -> {store_path.name} rows={n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,20 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Iterator, Literal, Optional, Sequence
 import ast
 
 import pandas as pd
 
 from modules.paths import ProjectPaths
-from modules.utils.io import read_csv
+from modules.utils.io import iter_csv, read_csv
 
 
 ChunkMode = Literal["recursive", "semantic"]
 
+# load_project_fields로 청크 metadata에 붙는 공고 필드
+PROJECT_FIELDS = ("budget", "agency", "published_at", "bid_deadline")
+
 
 def _parse_list_cell(cell: object) -> list[str]:
     """
@@ -151,6 +154,10 @@ def load_base_df(
     return df
 
 
+# id 컬럼은 항상 문자열로 읽음. 추론에 맡기면 NaN이 섞인 조각(chunksize 읽기)만 float이 돼서 "123.0"이 됨
+FULLTEXT_DTYPES = {"공고 번호": str, "project_id": str}
+
+
 def load_fulltext_df(
     paths: Optional[ProjectPaths] = None,
 ) -> pd.DataFrame:
@@ -159,25 +166,121 @@ def load_fulltext_df(
     - 보통 fulltext는 이미 텍스트로 정리된 상태라 pdf_list 복구가 필요 없는 경우가 많아요.
     """
     paths = paths or ProjectPaths()
-    return read_csv(paths.csv_fulltext)
+    return read_csv(paths.csv_fulltext, dtype=FULLTEXT_DTYPES)
+
+
+def load_project_fields(paths: Optional[ProjectPaths] = None) -> pd.DataFrame:
+    """
+    청크 metadata에 붙일 공고 필드 (project_id 기준 1행).
+      budget(float, 원) / agency / published_at / bid_deadline (ISO 8601 문자열)
+    검색 필터(SearchFilters)가 이 이름을 그대로 씀.
+    """
+    from modules.retrieval.filters import to_payload_datetime
+
+    paths = paths or ProjectPaths()
+    base = read_csv(
+        paths.csv_base,
+        usecols=["project_id", "사업 금액", "발주 기관", "공개 일자", "입찰 참여 마감일"],
+        dtype={"project_id": str, "발주 기관": str},
+    )
+
+    fields = pd.DataFrame(
+        {
+            "source": base["project_id"],
+            "budget": pd.to_numeric(base["사업 금액"], errors="coerce"),
+            "agency": base["발주 기관"].str.strip(),
+            "published_at": base["공개 일자"].map(lambda v: to_payload_datetime(v) if isinstance(v, str) else None),
+            "bid_deadline": base["입찰 참여 마감일"].map(lambda v: to_payload_datetime(v) if isinstance(v, str) else None),
+        }
+    )
+    return fields.drop_duplicates("source").reset_index(drop=True)
+
+
+def attach_project_fields(chunks: pd.DataFrame, fields: pd.DataFrame) -> pd.DataFrame:
+    # 청크 DF에 공고 필드를 source(project_id)로 left join (행 순서 유지)
+    return chunks.merge(fields, on="source", how="left", sort=False)
+
+
+def chunk_paths(mode: ChunkMode, paths: Optional[ProjectPaths] = None) -> tuple[Path, Path]:
+    """
+    mode별 (Arrow 저장소 경로, CSV 경로) 반환.
+    """
+    paths = paths or ProjectPaths()
+
+    if mode == "recursive":
+        return paths.store_chunks_recursive, paths.csv_chunks_recursive
+    if mode == "semantic":
+        return paths.store_chunks_semantic, paths.csv_chunks_semantic
+
+    raise ValueError(f"mode는 'recursive' 또는 'semantic' 이어야 합니다. 현재: {mode}")
+
+
+def _use_chunk_store(store_path: Path, csv_path: Path) -> bool:
+    """
+    Arrow 저장소를 읽을지 CSV를 읽을지. 저장소가 CSV보다 오래됐으면 CSV
+    (CHUNK_FORMAT=csv로 다시 청킹했거나 CSV를 밖에서 다시 만든 경우 → 저장소는 예전 청크).
+    고른 쪽을 로그로 남김.
+    """
+    use_store = store_path.exists()
+    if use_store and csv_path.exists() and store_path.stat().st_mtime < csv_path.stat().st_mtime:
+        print(
+            f"[WARN] 청크 저장소가 CSV보다 오래됨 → CSV 사용: {csv_path} "
+            "(다시 변환: python -m modules.loader.chunk_store)"
+        )
+        use_store = False
+    print(f"[Chunks] {'store' if use_store else 'csv'}: {store_path if use_store else csv_path}")
+    return use_store
 
 
 def load_chunks_df(
     mode: ChunkMode,
     paths: Optional[ProjectPaths] = None,
+    *,
+    columns: Optional[Sequence[str]] = None,
 ) -> pd.DataFrame:
     """
-    청킹 결과 CSV 로드.
+    청킹 결과 로드.
 
     mode:
-      - "recursive"  -> data_list_chunks_recursive.csv
-      - "semantic"   -> data_list_chunks_semantic.csv
+      - "recursive"  -> data_list_chunks_recursive.arrow (없거나 .csv보다 오래됐으면 .csv)
+      - "semantic"   -> data_list_chunks_semantic.arrow (없거나 .csv보다 오래됐으면 .csv)
+
+    columns:
+      - 필요한 컬럼만 읽고 싶을 때 (예: ["doc_id", "source"])
+      - Arrow 저장소는 memory-map이라 안 쓰는 컬럼(text 등)은 아예 읽지 않음
+      - ⚠️ 빠른 경로는 columns를 줄 때만. 안 주면 text 포함 전체 컬럼을 pandas로 변환하므로
+        CSV보다는 빠르지만 청크 전체 크기만큼 시간/메모리가 듦 (전체가 필요하면 iter_chunks_df)
     """
-    paths = paths or ProjectPaths()
+    from modules.loader.chunk_store import CSV_DTYPES, read_chunk_store
 
-    if mode == "recursive":
-        return read_csv(paths.csv_chunks_recursive)
-    if mode == "semantic":
-        return read_csv(paths.csv_chunks_semantic)
+    store_path, csv_path = chunk_paths(mode, paths)
 
-    raise ValueError(f"mode는 'recursive' 또는 'semantic' 이어야 합니다. 현재: {mode}")
+    if _use_chunk_store(store_path, csv_path):
+        return read_chunk_store(store_path, columns)
+
+    # 저장소가 없거나 오래됐으면 CSV로 (python -m modules.loader.chunk_store 로 변환 가능)
+    usecols = list(columns) if columns is not None else None
+    return read_csv(csv_path, dtype=CSV_DTYPES, usecols=usecols)
+
+
+def iter_chunks_df(
+    mode: ChunkMode,
+    paths: Optional[ProjectPaths] = None,
+    *,
+    chunksize: int = 8192,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    load_chunks_df의 스트리밍 버전: chunksize 행씩 DF를 yield.
+    청크가 아무리 많아도 한 번에 메모리에 올라가는 건 chunksize 행뿐 (색인 streaming 모드용).
+    """
+    from modules.loader.chunk_store import CSV_DTYPES, iter_chunk_store
+
+    store_path, csv_path = chunk_paths(mode, paths)
+
+    if _use_chunk_store(store_path, csv_path):
+        yield from iter_chunk_store(store_path, batch_size=chunksize, columns=columns)
+        return
+
+    usecols = list(columns) if columns is not None else None
+    yield from iter_csv(csv_path, chunksize, dtype=CSV_DTYPES, usecols=usecols)
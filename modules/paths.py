@@ -22,6 +22,10 @@ class ProjectPaths:
     csv_chunks_semantic: Path = data_dir / "data_list_chunks_semantic.csv"
     csv_fulltext: Path = data_dir / "data_list_fulltext.csv"
 
+    # 청크 저장소(Arrow IPC, memory-map으로 읽음) - 있고 CSV보다 새로우면 CSV 대신 사용
+    store_chunks_recursive: Path = data_dir / "data_list_chunks_recursive.arrow"
+    store_chunks_semantic: Path = data_dir / "data_list_chunks_semantic.arrow"
+
     # 출력 폴더
     outputs_dir: Path = PROJECT_ROOT / "outputs"
     logs_dir: Path = outputs_dir / "logs"
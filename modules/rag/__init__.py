@@ -1,5 +1,19 @@
 # modules/rag/__init__.py
-from .pipeline import answer_query  # 너 프로젝트에 맞는 파일/함수명으로 연결
+from typing import TYPE_CHECKING
 
-__all__ = ["answer_query"]
+from modules.utils.lazy import lazy_exports
 
+# 처음 쓸 때 pipeline(검색 + 생성 스택)을 import
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "answer_query": ".pipeline",
+        "answer_query_async": ".pipeline",
+        "answer_query_stream": ".pipeline",
+    },
+)
+
+if TYPE_CHECKING:
+    from .pipeline import answer_query, answer_query_async, answer_query_stream
+
+__all__ = ["answer_query", "answer_query_async", "answer_query_stream"]
@@ -1,38 +1,107 @@
 from __future__ import annotations
 
+import hashlib
+import inspect
 import os
-from typing import List
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional
 from langchain_core.documents import Document
 
+from modules.utils.aio import env_timeout, run_blocking
+from modules.utils.tracing import span
+
+
+def _dummy_answer(query: str, docs: List[Document]) -> str:
+    # ✅ 로컬 실행 확인용: docs 메타데이터만 요약해주고 끝
+    topk_lines = []
+    for i, d in enumerate(docs[:3], start=1):
+        meta = d.metadata or {}
+        doc_id = meta.get("doc_id", "")
+        chunk_id = meta.get("chunk_id", "")
+        source = meta.get("source", "")
+        preview = (d.page_content or "").replace("\n", " ")[:180]
+        topk_lines.append(f"- [{i}] doc_id={doc_id}, chunk_id={chunk_id}, source={source} :: {preview}...")
+
+    return (
+        "※ [DUMMY ANSWER] (로컬 실행 확인용)\n"
+        f"질문: {query}\n\n"
+        "참고한 문서 Top-k 요약:\n"
+        + "\n".join(topk_lines)
+        + "\n\n"
+        "최종 답변(더미): 위 문서들을 근거로 요구사항/조건/유지보수/네트워크 등 항목이 포함됩니다."
+    )
+
+
+def _dummy_tokens(text: str) -> Iterator[str]:
+    # 단어(+앞 공백) 단위로 잘라서 LLM 스트리밍 흉내. GENERATOR_DUMMY_DELAY_MS로 토큰 간격 지정 (UI 확인용)
+    delay = float(os.getenv("GENERATOR_DUMMY_DELAY_MS", "0")) / 1000
+    for token in re.findall(r"\s*\S+|\s+", text):
+        if delay > 0:
+            time.sleep(delay)
+        yield token
+
+
+def stream_answer(query: str, docs: List[Document]) -> Iterator[str]:
+    """
+    답변을 토큰(텍스트 조각) 단위로 yield. 다 이어붙이면 generate_answer() 결과와 같음.
+
+    - trace에는 generate(전체) span과 별도로 first_token span(생성 시작 → 첫 토큰, TTFT)을 기록
+    - 실제 LLM backend를 붙일 때는 여기서 stream=True 응답의 조각을 그대로 yield
+    """
+    backend = os.getenv("GENERATOR_BACKEND", "dummy").lower()
+
+    with span("generate", backend=backend, docs=len(docs)) as s:
+        # 생성 시작 → 첫 토큰 (빈 응답 / 예외여도 with가 span을 닫음)
+        with span("first_token", backend=backend):
+            if backend == "dummy":
+                tokens = _dummy_tokens(_dummy_answer(query, docs))
+            else:
+                # 나중에 GCP에서 진짜 LLM 붙일 때 확장
+                raise ValueError(f"Unknown GENERATOR_BACKEND={backend}")
+            first = next(tokens, None)
+
+        if first is None:
+            s.set(tokens=0)
+            return
+        yield first
+
+        n = 1
+        for token in tokens:
+            n += 1
+            yield token
+        s.set(tokens=n)
+
 
 def generate_answer(query: str, docs: List[Document]) -> str:
     """
-    답변 생성기 공통 인터페이스.
+    답변 생성기 공통 인터페이스 (stream_answer를 끝까지 받아서 한 번에 반환).
 
     - 로컬(VSCode)에서는 GENERATOR_BACKEND=dummy 로 실행 확인만 한다.
     - GCP에서는 openai 등으로 바꿔 끼울 수 있게 구조만 잡아둔다.
     """
+    return "".join(stream_answer(query, docs))
+
+
+def generator_config() -> Dict[str, Any]:
+    """
+    답변에 영향을 주는 설정 (eval 단계 캐시 키용).
+    프롬프트/답변 템플릿은 _dummy_answer 안에 있어서 그 코드의 해시를 prompt_sha로 씀
+    (템플릿을 고치면 캐시된 답변을 안 쓰고 다시 생성).
+    """
     backend = os.getenv("GENERATOR_BACKEND", "dummy").lower()
+    source = inspect.getsource(_dummy_answer)
+    return {
+        "backend": backend,
+        "model": os.getenv("GENERATOR_MODEL", ""),
+        "prompt_sha": hashlib.sha256(source.encode("utf-8")).hexdigest()[:16],
+    }
+
 
-    if backend == "dummy":
-        # ✅ 로컬 실행 확인용: docs 메타데이터만 요약해주고 끝
-        topk_lines = []
-        for i, d in enumerate(docs[:3], start=1):
-            meta = d.metadata or {}
-            doc_id = meta.get("doc_id", "")
-            chunk_id = meta.get("chunk_id", "")
-            source = meta.get("source", "")
-            preview = (d.page_content or "").replace("\n", " ")[:180]
-            topk_lines.append(f"- [{i}] doc_id={doc_id}, chunk_id={chunk_id}, source={source} :: {preview}...")
-
-        return (
-            "※ [DUMMY ANSWER] (로컬 실행 확인용)\n"
-            f"질문: {query}\n\n"
-            "참고한 문서 Top-k 요약:\n"
-            + "\n".join(topk_lines)
-            + "\n\n"
-            "최종 답변(더미): 위 문서들을 근거로 요구사항/조건/유지보수/네트워크 등 항목이 포함됩니다."
-        )
-
-    # 나중에 GCP에서 진짜 LLM 붙일 때 확장
-    raise ValueError(f"Unknown GENERATOR_BACKEND={backend}")
+async def agenerate_answer(query: str, docs: List[Document], *, timeout: Optional[float] = None) -> str:
+    """
+    generate_answer의 async 버전. LLM 호출은 공용 스레드풀에서 실행.
+    - timeout(초, 기본 RAG_GENERATE_TIMEOUT)을 넘기면 asyncio.TimeoutError
+    """
+    timeout = timeout if timeout is not None else env_timeout("RAG_GENERATE_TIMEOUT")
+    return await run_blocking(generate_answer, query, docs, timeout=timeout)
@@ -1,15 +1,88 @@
 # modules/rag/pipeline.py
 from __future__ import annotations
-from typing import List, Tuple, Optional
+import asyncio
+import time
+from typing import Iterator, List, Tuple, Optional
 from langchain_core.documents import Document
 
-from modules.retrieval import search
-from modules.rag.generator import generate_answer
+from modules.retrieval import search, asearch
+from modules.rag.generator import generate_answer, agenerate_answer, stream_answer
+from modules.utils.aio import env_timeout, iterate_in_context
+from modules.utils.tracing import trace_request
 
 def answer_query(query: str, k: int = 3, docs: Optional[List[Document]] = None) -> Tuple[str, List[Document]]:
     # docs가 들어오면 검색 재사용, 없으면 검색 수행
-    if docs is None:
-        docs = search(query, k=k)
+    with trace_request("answer_query", k=k):
+        if docs is None:
+            docs = search(query, k=k)
 
-    answer = generate_answer(query, docs)
-    return answer, docs
+        answer = generate_answer(query, docs)
+        return answer, docs
+
+
+def _answer_stream(
+    query: str,
+    k: int,
+    docs: Optional[List[Document]],
+    rerank: Optional[bool],
+) -> Iterator[Tuple[str, List[Document]]]:
+    with trace_request("answer_query", k=k, stream=True) as request:
+        t0 = time.perf_counter()
+        if rerank is not None:
+            request.set(rerank=rerank)
+        if docs is None:
+            docs = search(query, k=k, rerank=rerank)
+
+        # 검색이 끝나면 바로 1번 yield → UI가 답변 생성 전에 참고 문서부터 보여줌
+        yield "", docs
+
+        n = 0
+        for token in stream_answer(query, docs):
+            if n == 0:
+                # 요청 시작 → 첫 토큰 (사용자가 체감하는 TTFT). 전체 시간은 trace의 duration_ms
+                request.set(ttft_ms=round((time.perf_counter() - t0) * 1000, 3))
+            n += 1
+            yield token, docs
+
+
+def answer_query_stream(
+    query: str,
+    k: int = 3,
+    docs: Optional[List[Document]] = None,
+    *,
+    rerank: Optional[bool] = None,
+) -> Iterator[Tuple[str, List[Document]]]:
+    """
+    answer_query의 스트리밍 버전. (토큰, docs)를 yield.
+    - 첫 yield는 ("", docs): 검색 직후 (참고 문서/인용 먼저 표시용)
+    - 그 다음부터 답변 토큰(텍스트 조각). 다 이어붙이면 answer_query의 answer와 같음
+    - trace에는 요청 attrs에 ttft_ms, generate span과 별도로 first_token span이 기록됨
+    - rerank=False면 rerank 단계를 건너뜀 (과부하 때 간소화 모드, None이면 RERANK_BACKEND 설정대로)
+    next()를 다른 스레드에서 불러도 되게 iterate_in_context로 감쌈 (Gradio async 핸들러용).
+    """
+    return iterate_in_context(_answer_stream(query, k, docs, rerank))
+
+
+async def answer_query_async(
+    query: str,
+    k: int = 3,
+    docs: Optional[List[Document]] = None,
+    *,
+    timeout: Optional[float] = None,
+) -> Tuple[str, List[Document]]:
+    """
+    answer_query의 async 버전 (이벤트 루프 1개로 여러 사용자 요청 처리용).
+    - 검색/생성은 각각 RAG_SEARCH_TIMEOUT / RAG_GENERATE_TIMEOUT 으로 제한
+    - timeout(초, 기본 RAG_TIMEOUT)은 검색+생성 전체 제한
+    - 요청 task가 취소되면 진행 중인 단계도 같이 취소됨
+    """
+    timeout = timeout if timeout is not None else env_timeout("RAG_TIMEOUT")
+
+    async def _run() -> Tuple[str, List[Document]]:
+        used_docs = docs if docs is not None else await asearch(query, k=k)
+        answer = await agenerate_answer(query, used_docs)
+        return answer, used_docs
+
+    # trace를 먼저 열어야 wait_for가 만드는 task(context 복사)에서도 같은 trace에 기록됨
+    with trace_request("answer_query", k=k, mode="async"):
+        return await asyncio.wait_for(_run(), timeout)
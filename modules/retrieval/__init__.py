@@ -1,10 +1,40 @@
-from .retriever import search, get_vectorstore, RetrieverSettings
-from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
-@lru_cache(maxsize=1)
-def get_retriever():
-    # qdrant 연결 + embeddings 생성 1회
-    ...
-    return retriever
+from modules.utils.lazy import lazy_exports
 
-__all__ = ["search", "get_vectorstore", "RetrieverSettings"]
+# 공개 이름 → 하위 모듈. 처음 쓸 때 import (qdrant_client / langchain_qdrant는 검색할 때만 로드)
+_EXPORTS = {
+    "search": ".retriever",
+    "asearch": ".retriever",
+    "search_many": ".retriever",
+    "search_many_with_status": ".retriever",
+    "search_by_vectors": ".retriever",
+    "get_vectorstore": ".retriever",
+    "retrieval_config": ".retriever",
+    "RetrieverSettings": ".retriever",
+    "get_registry": ".registry",
+    "cache_stats": ".cache",
+    "clear_caches": ".cache",
+    "SearchFilters": ".filters",
+    "warmup": ".startup",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .retriever import search, asearch, search_many, search_many_with_status, search_by_vectors, get_vectorstore, retrieval_config, RetrieverSettings
+    from .registry import get_registry
+    from .cache import cache_stats, clear_caches
+    from .filters import SearchFilters
+    from .startup import warmup
+
+
+def get_retriever(*, k: Optional[int] = None, collection_name: Optional[str] = None):
+    # qdrant 연결 + embeddings는 registry에서 1회만 생성됨
+    from .retriever import RetrieverSettings, get_vectorstore
+
+    k = k if k is not None else RetrieverSettings().k
+    store = get_vectorstore(collection_name=collection_name)
+    return store.as_retriever(search_kwargs={"k": k})
+
+__all__ = ["search", "asearch", "search_many", "search_many_with_status", "search_by_vectors", "get_vectorstore", "retrieval_config", "get_retriever", "get_registry", "RetrieverSettings", "cache_stats", "clear_caches", "SearchFilters", "warmup"]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from langchain_core.documents import Document
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from modules.embedding.backends.dummy import DummyEmbeddings
+from modules.embedding.embedder import embed_matrix
+from modules.retrieval.numpy_store import NumpyIndex
+
+
+def _documents(n: int):
+    for i in range(n):
+        yield Document(
+            page_content=f"bench chunk {i} 사업 과업 범위 {i % 97}",
+            metadata={"doc_id": f"d{i // 20}", "chunk_id": i % 20, "source": f"p{i // 20}"},
+        )
+
+
+def _percentile_ms(latencies: list[float], q: float) -> float:
+    return round(float(np.percentile(latencies, q)) * 1000, 3)
+
+
+def _bench(fn, queries: np.ndarray, *, batch: int, repeat: int) -> dict:
+    # 쿼리 batch개씩 repeat번 → 쿼리 1개당 지연(p50/p95)과 QPS
+    fn(queries[:batch])  # warmup (mmap 페이지/첫 호출 비용 제외)
+    latencies = []
+    t_all = time.perf_counter()
+    for r in range(repeat):
+        chunk = queries[(r * batch) % len(queries) :][:batch]
+        t0 = time.perf_counter()
+        fn(chunk)
+        latencies.append((time.perf_counter() - t0) / len(chunk))
+    wall = time.perf_counter() - t_all
+    return {
+        "p50_ms": _percentile_ms(latencies, 50),
+        "p95_ms": _percentile_ms(latencies, 95),
+        "qps": round(repeat * batch / wall, 1),
+    }
+
+
+def main():
+    """
+    NumPy 완전 탐색 vs Qdrant 검색 속도 비교 (쿼리 임베딩 제외, 검색만).
+    컬렉션 크기를 키워가며 어느 지점부터 Qdrant가 빨라지는지(crossover)를 찾음.
+
+    BENCH_SIZES=1000,10000,50000 BENCH_DIM=384 BENCH_BATCH=1,32 PYTHONPATH=$(pwd) python -m modules.retrieval.bench_numpy
+
+    - 벡터는 DummyEmbeddings (결정적) → 실행마다 같은 데이터
+    - BENCH_DTYPE=float16이면 NumPy 쪽을 float16 행렬로 (메모리 절반)
+    - QDRANT_URL이 있으면 Qdrant 서버(HNSW)와 비교, 없으면 local mode(Python 전체 탐색)와 비교
+      local mode는 HNSW가 없어서 보통 어떤 크기에서도 numpy가 빠름 → crossover는 서버 기준으로 보기
+    - 결과: BENCH_OUT(csv) + 화면 출력
+    """
+    sizes = [int(s) for s in os.getenv("BENCH_SIZES", "1000,10000,50000").split(",") if s.strip()]
+    batches = [int(s) for s in os.getenv("BENCH_BATCH", "1,32").split(",") if s.strip()]
+    dim = int(os.getenv("BENCH_DIM", "384"))
+    k = int(os.getenv("BENCH_TOP_K", "10"))
+    repeat = int(os.getenv("BENCH_REPEAT", "50"))
+    dtype = os.getenv("BENCH_DTYPE", "float32")
+    out_path = os.getenv("BENCH_OUT", "outputs/bench_numpy_vs_qdrant.csv")
+    url = os.getenv("QDRANT_URL")
+    qdrant_name = "qdrant_server" if url else "qdrant_local"
+
+    embeddings = DummyEmbeddings(dim=dim)
+    queries = embed_matrix(embeddings, [f"bench query {i}" for i in range(max(batches) * 8)])
+
+    rows = []
+    work = Path(tempfile.mkdtemp(prefix="bench_numpy_"))
+    try:
+        for n in sizes:
+            np_dir = work / f"numpy_{n}"
+            t0 = time.perf_counter()
+            NumpyIndex.build(_documents(n), embeddings, np_dir, dtype=dtype, batch_size=2048)
+            numpy_build = time.perf_counter() - t0
+            index = NumpyIndex.load(np_dir, "bench")
+
+            t0 = time.perf_counter()
+            if url:
+                client = QdrantClient(url=url, api_key=os.getenv("QDRANT_API_KEY") or None)
+            else:
+                client = QdrantClient(path=str(work / f"qdrant_{n}"))
+            collection = f"bench_numpy_{n}"
+            if client.collection_exists(collection):
+                client.delete_collection(collection)
+            client.create_collection(
+                collection,
+                vectors_config=models.VectorParams(size=dim, distance=models.Distance.COSINE),
+            )
+            # 같은 벡터를 그대로 넣음 (정규화는 Qdrant COSINE이 알아서)
+            client.upload_collection(collection, vectors=np.asarray(index.vectors, dtype=np.float32), batch_size=4096, wait=True)
+            qdrant_build = time.perf_counter() - t0
+
+            def _numpy(qs):
+                return index.search_vectors(qs, k=k)
+
+            def _qdrant(qs):
+                return client.query_batch_points(
+                    collection,
+                    requests=[models.QueryRequest(query=q.tolist(), limit=k) for q in qs],
+                )
+
+            for batch in batches:
+                for backend, fn, build_s in (("numpy", _numpy, numpy_build), (qdrant_name, _qdrant, qdrant_build)):
+                    rows.append(
+                        {
+                            "size": n,
+                            "batch": batch,
+                            "backend": backend,
+                            "build_s": round(build_s, 2),
+                            **_bench(fn, queries, batch=batch, repeat=repeat),
+                        }
+                    )
+            if url:
+                client.delete_collection(collection)
+            client.close()
+            print(f"[bench] size={n} done")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    df = pd.DataFrame(rows)
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(out_path, index=False)
+
+    print(f"\n===== NUMPY vs {qdrant_name.upper()} =====")
+    print(df.to_string(index=False))
+
+    # crossover: batch별로 Qdrant p50이 NumPy보다 처음 작아지는 크기
+    for batch in batches:
+        pivot = df[df["batch"] == batch].pivot(index="size", columns="backend", values="p50_ms")
+        faster = pivot.index[pivot[qdrant_name] < pivot["numpy"]]
+        where = f"size≈{int(faster[0])}" if len(faster) else f"없음 (≤{max(sizes)}에서는 numpy가 빠름)"
+        print(f"crossover(batch={batch}): {where}")
+    print(f"saved -> {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# modules/retrieval/cache.py
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional
+
+from modules.embedding.cache import CacheStats
+
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 키용 쿼리 정규화: 유니코드(NFKC) 통일 + 공백 정리.
+    ("EIP3.0  사업 " 과 "EIP3.0 사업" 을 같은 질문으로 봄)
+    """
+    return _SPACES.sub(" ", unicodedata.normalize("NFKC", query or "")).strip()
+
+
+class TTLCache:
+    """
+    크기 제한 + TTL 있는 메모리 LRU 캐시 (스레드 안전).
+    - maxsize를 넘으면 가장 오래 안 쓴 항목부터 버림
+    - ttl(초)이 지난 항목은 get 때 miss로 처리 (0이면 만료 없음)
+    """
+
+    def __init__(self, *, maxsize: int, ttl: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.stats.misses += 1
+                return None
+
+            stored_at, value = item
+            if self.ttl and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                self.stats.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# 쿼리 임베딩: (임베딩 모델, 정규화된 쿼리) -> 벡터
+QUERY_EMBEDDING_CACHE = TTLCache(
+    maxsize=int(os.getenv("QUERY_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("QUERY_CACHE_TTL", "3600")),
+)
+
+# 검색 결과: (qdrant path, 컬렉션, 컬렉션 버전, k, 옵션, filters, 정규화된 쿼리) -> List[Document]
+RESULT_CACHE = TTLCache(
+    maxsize=int(os.getenv("RESULT_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("RESULT_CACHE_TTL", "600")),
+)
+
+
+def cache_stats() -> dict:
+    return {
+        "query_embedding": {**QUERY_EMBEDDING_CACHE.stats.as_dict(), "size": len(QUERY_EMBEDDING_CACHE)},
+        "result": {**RESULT_CACHE.stats.as_dict(), "size": len(RESULT_CACHE)},
+    }
+
+
+def clear_caches() -> None:
+    QUERY_EMBEDDING_CACHE.clear()
+    RESULT_CACHE.clear()
+
+
+# ---------------------------------------------------------------------------
+# 컬렉션 버전: 색인이 바뀔 때마다 +1 → 결과 캐시 키에 들어가서 예전 결과는 자동으로 안 쓰임
+# (파일로 남겨서 다른 프로세스에서 다시 색인해도 Gradio 서버가 알아챔)
+# ---------------------------------------------------------------------------
+
+_VERSIONS: dict[Path, tuple[tuple[int, int], int]] = {}
+_VERSIONS_LOCK = threading.Lock()
+
+
+def _version_path(qdrant_path: Path, collection_name: str) -> Path:
+    return Path(qdrant_path) / "versions" / f"{collection_name}.version"
+
+
+def collection_version(qdrant_path: Path, collection_name: str) -> int:
+    """
+    현재 컬렉션 버전 (한 번도 색인 안 했으면 0). 파일이 안 바뀌었으면 stat 1번으로 끝.
+    """
+    fp = _version_path(qdrant_path, collection_name)
+    try:
+        st = fp.stat()
+    except FileNotFoundError:
+        return 0
+
+    stamp = (st.st_ino, st.st_mtime_ns)
+    with _VERSIONS_LOCK:
+        cached = _VERSIONS.get(fp)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+    try:
+        version = int(fp.read_text(encoding="utf-8").strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+    with _VERSIONS_LOCK:
+        _VERSIONS[fp] = (stamp, version)
+    return version
+
+
+def bump_collection_version(qdrant_path: Path, collection_name: str) -> int:
+    """
+    컬렉션에 쓰기(추가/삭제/재생성)가 끝나면 호출.
+    """
+    fp = _version_path(qdrant_path, collection_name)
+    fp.parent.mkdir(parents=True, exist_ok=True)
+
+    with _VERSIONS_LOCK:
+        _VERSIONS.pop(fp, None)
+    version = collection_version(qdrant_path, collection_name) + 1
+
+    # 임시 파일에 쓰고 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않게)
+    tmp = fp.with_name(fp.name + ".tmp")
+    tmp.write_text(str(version), encoding="utf-8")
+    tmp.replace(fp)
+    return version
@@ -0,0 +1,145 @@
+# modules/retrieval/filters.py
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple, Union
+
+from qdrant_client.http import models
+
+
+DateLike = Union[str, date, datetime]
+
+# 청크 metadata에 들어가는 공고 필드 (data_list_base.csv → build_qdrant에서 join)
+#   budget: 사업 금액(원, float) / agency: 발주 기관 / published_at: 공개 일자 / bid_deadline: 입찰 참여 마감일
+PAYLOAD_SCHEMA: dict[str, models.PayloadSchemaType] = {
+    "metadata.doc_id": models.PayloadSchemaType.KEYWORD,
+    "metadata.source": models.PayloadSchemaType.KEYWORD,
+    "metadata.budget": models.PayloadSchemaType.FLOAT,
+    "metadata.agency": models.PayloadSchemaType.KEYWORD,
+    "metadata.published_at": models.PayloadSchemaType.DATETIME,
+    "metadata.bid_deadline": models.PayloadSchemaType.DATETIME,
+}
+
+
+def to_datetime(value: Optional[DateLike]) -> Optional[datetime]:
+    # "2024-10-04", "2024-10-04 13:51:00", date, datetime -> datetime (timezone 없음)
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value)).replace(tzinfo=None)
+
+
+def _is_date_only(value: DateLike) -> bool:
+    if isinstance(value, datetime):
+        return False
+    return isinstance(value, date) or len(str(value).strip()) == 10
+
+
+def upper_bound(value: Optional[DateLike]) -> Optional[datetime]:
+    # "2024-10-31"까지 → 그날 23:59:59.999999까지 포함
+    dt = to_datetime(value)
+    if dt is not None and _is_date_only(value):
+        dt += timedelta(days=1) - timedelta(microseconds=1)
+    return dt
+
+
+def to_payload_datetime(value: Optional[DateLike]) -> Optional[str]:
+    # payload에 저장하는 형식 (Qdrant datetime index가 읽을 수 있는 ISO 8601)
+    dt = to_datetime(value)
+    return dt.isoformat() if dt is not None else None
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """
+    search(..., filters=SearchFilters(...))에 넘기는 구조화 필터.
+    Qdrant filter로 바뀌어서 ANN 검색 "안에서" 적용됨 (top-k를 뽑은 뒤 거르는 게 아님).
+
+    - budget_min / budget_max: 사업 금액 범위(원, 경계 포함)
+    - agencies: 발주 기관 (여러 개면 그 중 하나)
+    - published_from / published_to: 공개 일자 범위
+    - deadline_from / deadline_to: 입찰 참여 마감일 범위
+    - sources: project_id (여러 개면 그 중 하나)
+
+    frozen이라 결과 캐시 키로 그대로 씀.
+    """
+    budget_min: Optional[float] = None
+    budget_max: Optional[float] = None
+    agencies: Tuple[str, ...] = ()
+    published_from: Optional[DateLike] = None
+    published_to: Optional[DateLike] = None
+    deadline_from: Optional[DateLike] = None
+    deadline_to: Optional[DateLike] = None
+    sources: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        # 리스트로 넘겨도 hash 가능하게 tuple로
+        object.__setattr__(self, "agencies", tuple(self.agencies))
+        object.__setattr__(self, "sources", tuple(self.sources))
+
+    def is_empty(self) -> bool:
+        return all(getattr(self, f.name) in (None, ()) for f in fields(self))
+
+    def to_qdrant(self) -> Optional[models.Filter]:
+        must: list[models.FieldCondition] = []
+
+        if self.budget_min is not None or self.budget_max is not None:
+            must.append(
+                models.FieldCondition(
+                    key="metadata.budget",
+                    range=models.Range(gte=self.budget_min, lte=self.budget_max),
+                )
+            )
+        if self.agencies:
+            must.append(models.FieldCondition(key="metadata.agency", match=models.MatchAny(any=list(self.agencies))))
+        if self.sources:
+            must.append(models.FieldCondition(key="metadata.source", match=models.MatchAny(any=list(self.sources))))
+
+        for key, lo, hi in (
+            ("metadata.published_at", self.published_from, self.published_to),
+            ("metadata.bid_deadline", self.deadline_from, self.deadline_to),
+        ):
+            if lo is not None or hi is not None:
+                must.append(
+                    models.FieldCondition(
+                        key=key,
+                        range=models.DatetimeRange(gte=to_datetime(lo), lte=upper_bound(hi)),
+                    )
+                )
+
+        return models.Filter(must=must) if must else None
+
+    def matches(self, metadata: dict) -> bool:
+        """
+        같은 조건을 Python으로 확인 (BM25 결과처럼 Qdrant 밖에서 온 Document용).
+        필드가 없는 청크는 조건이 있으면 탈락.
+        """
+        budget = metadata.get("budget")
+        if self.budget_min is not None and (budget is None or budget < self.budget_min):
+            return False
+        if self.budget_max is not None and (budget is None or budget > self.budget_max):
+            return False
+        if self.agencies and metadata.get("agency") not in self.agencies:
+            return False
+        if self.sources and metadata.get("source") not in self.sources:
+            return False
+
+        for key, lo, hi in (
+            ("published_at", self.published_from, self.published_to),
+            ("bid_deadline", self.deadline_from, self.deadline_to),
+        ):
+            if lo is None and hi is None:
+                continue
+            value = to_datetime(metadata.get(key))
+            if value is None:
+                return False
+            if lo is not None and value < to_datetime(lo):
+                return False
+            if hi is not None and value > upper_bound(hi):
+                return False
+
+        return True
@@ -0,0 +1,37 @@
+# modules/retrieval/fusion.py
+from __future__ import annotations
+
+from typing import List, Sequence
+
+from langchain_core.documents import Document
+
+
+def doc_key(doc: Document) -> str:
+    # 같은 청크인지 판단하는 키 (dense/lexical 결과를 합칠 때 사용)
+    meta = doc.metadata or {}
+    return f"{meta.get('doc_id')}:{meta.get('chunk_id')}"
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Sequence[List[Document]],
+    *,
+    k: int,
+    rrf_k: int = 60,
+) -> List[Document]:
+    """
+    Reciprocal Rank Fusion: score(d) = Σ 1 / (rrf_k + rank)
+    - 점수 스케일이 다른 검색기(dense cosine / BM25)를 순위만으로 합칠 수 있음
+    - 같은 청크가 여러 리스트에 있으면 먼저 나온 리스트의 Document를 사용 (dense 메타 유지)
+    """
+    scores: dict[str, float] = {}
+    docs: dict[str, Document] = {}
+
+    for ranked in ranked_lists:
+        for rank, doc in enumerate(ranked, start=1):
+            key = doc_key(doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            docs.setdefault(key, doc)
+
+    # 점수가 같으면 먼저 등장한 순서 유지 (sorted는 stable)
+    order = sorted(scores, key=lambda key: -scores[key])
+    return [docs[key] for key in order[:k]]
@@ -0,0 +1,369 @@
+# modules/retrieval/lexical.py
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from langchain_core.documents import Document
+
+from modules.paths import ProjectPaths
+
+
+# 검색에 쓸 품사: 명사류 / 외국어(EIP, UICC) / 숫자(3.0) / 어근 / 한자
+_KIWI_TAGS = ("NNG", "NNP", "NNB", "NR", "SL", "SN", "SH", "XR")
+_SIMPLE_TOKEN = re.compile(r"[가-힣]+|[A-Za-z]+|[0-9]+(?:\.[0-9]+)?")
+
+# 청크 DF에 있으면 docs 테이블에 같이 저장하는 공고 필드 (modules.loader.datasets.PROJECT_FIELDS)
+_FIELD_TYPES = {
+    "budget": pa.float64(),
+    "agency": pa.string(),
+    "published_at": pa.string(),
+    "bid_deadline": pa.string(),
+}
+
+
+class KiwiTokenizer:
+    """
+    Kiwi 형태소 분석 기반 토크나이저 (kiwipiepy는 처음 쓸 때 import).
+    - 조사/어미는 버리고 명사·외국어·숫자 위주로 남김
+    """
+    name = "kiwi"
+
+    def __init__(self, num_workers: int = -1):
+        from kiwipiepy import Kiwi
+
+        self._kiwi = Kiwi(num_workers=num_workers)
+
+    def _filter(self, tokens) -> List[str]:
+        return [t.form.lower() for t in tokens if t.tag.startswith(_KIWI_TAGS)]
+
+    def tokenize(self, text: str) -> List[str]:
+        return self._filter(self._kiwi.tokenize(text))
+
+    def tokenize_many(self, texts: Iterable[str]) -> Iterable[List[str]]:
+        # 여러 문서를 넘기면 Kiwi가 내부 스레드로 병렬 처리 (num_workers=-1: 코어 수만큼)
+        for tokens in self._kiwi.tokenize(texts):
+            yield self._filter(tokens)
+
+
+class SimpleTokenizer:
+    """
+    kiwipiepy 없는 환경용 정규식 토크나이저 (한글 덩어리 / 영문 / 숫자).
+    """
+    name = "simple"
+
+    def tokenize(self, text: str) -> List[str]:
+        return [t.lower() for t in _SIMPLE_TOKEN.findall(text)]
+
+    def tokenize_many(self, texts: Iterable[str]) -> Iterable[List[str]]:
+        for text in texts:
+            yield self.tokenize(text)
+
+
+_TOKENIZERS: dict[str, object] = {}
+_TOKENIZERS_LOCK = threading.Lock()
+
+
+def get_tokenizer(name: Optional[str] = None):
+    name = (name or os.getenv("LEXICAL_TOKENIZER", "kiwi")).lower()
+    with _TOKENIZERS_LOCK:
+        if name not in _TOKENIZERS:
+            if name == "kiwi":
+                _TOKENIZERS[name] = KiwiTokenizer(num_workers=int(os.getenv("LEXICAL_WORKERS", "-1")))
+            elif name == "simple":
+                _TOKENIZERS[name] = SimpleTokenizer()
+            else:
+                raise ValueError(f"Unknown LEXICAL_TOKENIZER: {name}")
+        return _TOKENIZERS[name]
+
+
+def lexical_index_dir(collection_name: str, paths: Optional[ProjectPaths] = None) -> Path:
+    paths = paths or ProjectPaths()
+    return Path(paths.outputs_dir) / "lexical" / collection_name
+
+
+# save() 때 남겨둘 build 디렉터리 수 (방금 만든 것 + 직전 것: 직전 meta.json을 읽고 로드 중인 프로세스용)
+_KEEP_BUILDS = 2
+_INDEX_FILES = ("indptr.npy", "doc_idx.npy", "weight.npy", "docs.arrow", "terms.json")
+
+
+class LexicalIndex:
+    """
+    BM25 역색인 (배열 기반 CSR postings).
+
+    - terms: 단어 목록 (term id = 위치)
+    - indptr[t]:indptr[t+1] 구간이 단어 t의 postings
+    - doc_idx: postings의 문서 번호 (int32)
+    - weight: postings의 BM25 가중치 (idf·tf 정규화까지 build 때 미리 계산, float32)
+    - docs: 문서 번호 → (doc_id, chunk_id, source, mode, text)
+
+    검색은 "쿼리 단어들의 postings 구간을 더하기"만 하면 돼서 몇 ms 안에 끝남.
+    디스크에는 build-<시각>/ 아래 .npy(memory-map으로 로드) + docs.arrow, 어느 build를 쓸지는 meta.json.
+    """
+
+    def __init__(
+        self,
+        *,
+        terms: List[str],
+        indptr: np.ndarray,
+        doc_idx: np.ndarray,
+        weight: np.ndarray,
+        docs: pa.Table,
+        tokenizer: str,
+    ):
+        self.vocab = {t: i for i, t in enumerate(terms)}
+        self.terms = terms
+        self.indptr = indptr
+        self.doc_idx = doc_idx
+        self.weight = weight
+        self.docs = docs
+        self.tokenizer = tokenizer
+
+    @property
+    def n_docs(self) -> int:
+        return self.docs.num_rows
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        *,
+        tokenizer: Optional[str] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        mode: str = "recursive",
+    ) -> "LexicalIndex":
+        """
+        청크 DF(doc_id/chunk_id/text/source)로 BM25 인덱스 생성. 토큰화는 여기서 1번만.
+        """
+        tok = get_tokenizer(tokenizer)
+        texts = df["text"].fillna("").astype(str).tolist()
+
+        vocab: dict[str, int] = {}
+        rows_t: List[int] = []
+        rows_d: List[int] = []
+        rows_tf: List[int] = []
+        doc_len = np.zeros(len(texts), dtype=np.float32)
+
+        for d, tokens in enumerate(tok.tokenize_many(texts)):
+            doc_len[d] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                rows_t.append(vocab.setdefault(term, len(vocab)))
+                rows_d.append(d)
+                rows_tf.append(tf)
+
+        term_ids = np.asarray(rows_t, dtype=np.int64)
+        doc_idx = np.asarray(rows_d, dtype=np.int32)
+        tf = np.asarray(rows_tf, dtype=np.float32)
+
+        # term id 순으로 정렬해서 CSR 모양으로 (같은 term 안에서는 문서 순서 유지)
+        order = np.argsort(term_ids, kind="stable")
+        term_ids, doc_idx, tf = term_ids[order], doc_idx[order], tf[order]
+
+        n_terms = len(vocab)
+        df_count = np.bincount(term_ids, minlength=n_terms)
+        indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(df_count, out=indptr[1:])
+
+        n_docs = len(texts)
+        avgdl = float(doc_len.mean()) if n_docs else 0.0
+        idf = np.log1p((n_docs - df_count + 0.5) / (df_count + 0.5)).astype(np.float32)
+
+        norm = k1 * (1.0 - b + b * doc_len[doc_idx] / max(avgdl, 1e-9))
+        weight = (idf[term_ids] * tf * (k1 + 1.0) / (tf + norm)).astype(np.float32)
+
+        terms = [""] * n_terms
+        for term, i in vocab.items():
+            terms[i] = term
+
+        columns = {
+            "doc_id": pa.array(df["doc_id"].astype(str).tolist(), pa.string()),
+            "chunk_id": pa.array(df["chunk_id"].astype("int64").tolist(), pa.int64()),
+            "source": pa.array(df["source"].where(df["source"].notna(), None).tolist(), pa.string()),
+            "mode": pa.array([mode] * n_docs, pa.string()),
+        }
+        # 공고 필드가 join돼 있으면 같이 저장 (hybrid 검색에서 BM25 결과에도 같은 필터 적용)
+        for name, typ in _FIELD_TYPES.items():
+            if name in df.columns:
+                columns[name] = pa.array(df[name].astype(object).where(df[name].notna(), None).tolist(), typ)
+        columns["text"] = pa.array(texts, pa.large_string())
+        docs = pa.table(columns)
+
+        return cls(
+            terms=terms,
+            indptr=indptr,
+            doc_idx=doc_idx,
+            weight=weight,
+            docs=docs,
+            tokenizer=tok.name,
+        )
+
+    def save(self, out_dir: Path) -> None:
+        """
+        out_dir/build-<시각>/에 파일을 다 쓰고, 마지막에 meta.json(어느 build인지)을 tmp → replace로 교체.
+        - 검색 중인 프로세스가 memory-map한 파일을 덮어쓰지 않음 (제자리에서 덮어쓰면 SIGBUS)
+        - 로드하는 쪽은 meta.json 1개로 build 디렉터리를 고르니 새/예전 파일이 섞이지 않음
+        - build는 최근 _KEEP_BUILDS개만 남김 (지워도 이미 열린 memory-map은 계속 읽힘)
+        """
+        out_dir = Path(out_dir)
+        build = f"build-{time.time_ns()}"
+        build_dir = out_dir / build
+        build_dir.mkdir(parents=True)
+
+        np.save(build_dir / "indptr.npy", self.indptr)
+        np.save(build_dir / "doc_idx.npy", self.doc_idx)
+        np.save(build_dir / "weight.npy", self.weight)
+        feather.write_feather(self.docs, str(build_dir / "docs.arrow"), compression="uncompressed")
+        (build_dir / "terms.json").write_text(json.dumps(self.terms, ensure_ascii=False), encoding="utf-8")
+
+        # meta.json을 마지막에 바꿔서 "완성된 인덱스"의 표시로 사용
+        meta_tmp = out_dir / "meta.json.tmp"
+        meta_tmp.write_text(
+            json.dumps({"tokenizer": self.tokenizer, "n_docs": self.n_docs, "build": build, "built_at": time.time()}),
+            encoding="utf-8",
+        )
+        meta_tmp.replace(out_dir / "meta.json")
+
+        builds = sorted(p for p in out_dir.glob("build-*") if p.is_dir())
+        for old in builds[:-_KEEP_BUILDS]:
+            shutil.rmtree(old, ignore_errors=True)
+        # 예전 형식(out_dir 바로 아래에 저장된 파일) 정리
+        for name in _INDEX_FILES:
+            (out_dir / name).unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, out_dir: Path) -> "LexicalIndex":
+        out_dir = Path(out_dir)
+        meta = json.loads((out_dir / "meta.json").read_text(encoding="utf-8"))
+        # meta에 build가 없으면 예전 형식 (out_dir 바로 아래 파일)
+        out_dir = out_dir / meta["build"] if "build" in meta else out_dir
+
+        with pa.memory_map(str(out_dir / "docs.arrow"), "r") as source:
+            docs = pa.ipc.open_file(source).read_all()
+
+        return cls(
+            terms=json.loads((out_dir / "terms.json").read_text(encoding="utf-8")),
+            indptr=np.load(out_dir / "indptr.npy", mmap_mode="r"),
+            doc_idx=np.load(out_dir / "doc_idx.npy", mmap_mode="r"),
+            weight=np.load(out_dir / "weight.npy", mmap_mode="r"),
+            docs=docs,
+            tokenizer=meta["tokenizer"],
+        )
+
+    def score(self, query: str) -> np.ndarray:
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        term_ids = {self.vocab[t] for t in get_tokenizer(self.tokenizer).tokenize(query) if t in self.vocab}
+        for t in term_ids:
+            s, e = self.indptr[t], self.indptr[t + 1]
+            # 한 단어의 postings 안에서 문서 번호는 중복이 없어서 fancy-index 덧셈으로 충분
+            scores[self.doc_idx[s:e]] += self.weight[s:e]
+        return scores
+
+    def search(self, query: str, *, k: int, where: Optional[Callable[[dict], bool]] = None) -> List[Document]:
+        """
+        BM25 top-k. where(metadata)를 주면 점수 순으로 보면서 조건에 맞는 것만 k개.
+        """
+        scores = self.score(query)
+        hit = np.flatnonzero(scores)
+        if hit.size == 0:
+            return []
+
+        if where is None:
+            if hit.size > k:
+                hit = hit[np.argpartition(-scores[hit], k - 1)[:k]]
+            top = hit[np.argsort(-scores[hit], kind="stable")]
+            return [self._document(int(i)) for i in top]
+
+        docs: List[Document] = []
+        for i in hit[np.argsort(-scores[hit], kind="stable")]:
+            doc = self._document(int(i))
+            if where(doc.metadata):
+                docs.append(doc)
+                if len(docs) == k:
+                    break
+        return docs
+
+    def _document(self, i: int) -> Document:
+        row = {name: self.docs.column(name)[i].as_py() for name in self.docs.column_names}
+        # 없는 공고 필드는 metadata에서 빼서 Qdrant 결과와 모양을 맞춤
+        for name in _FIELD_TYPES:
+            if row.get(name) is None:
+                row.pop(name, None)
+        return Document(
+            page_content=row.pop("text") or "",
+            metadata=row,
+        )
+
+
+_INDEXES: dict[Path, tuple[float, LexicalIndex]] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_lexical_index(collection_name: str) -> Optional[LexicalIndex]:
+    """
+    컬렉션의 BM25 인덱스를 (프로세스당 1번) 로드. 없으면 None.
+    - 다시 build되면(meta.json 수정시각 변경) 자동으로 새로 로드
+    """
+    out_dir = lexical_index_dir(collection_name)
+    meta_fp = out_dir / "meta.json"
+    if not meta_fp.exists():
+        return None
+
+    mtime = meta_fp.stat().st_mtime
+    with _INDEXES_LOCK:
+        cached = _INDEXES.get(out_dir)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, LexicalIndex.load(out_dir))
+            _INDEXES[out_dir] = cached
+        return cached[1]
+
+
+def lexical_index_version(collection_name: str) -> int:
+    # 인덱스를 다시 만들면 바뀌는 값 (meta.json 수정시각, 없으면 0) → 검색 결과 캐시 키에 사용
+    try:
+        return (lexical_index_dir(collection_name) / "meta.json").stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def build_lexical_index(df: pd.DataFrame, collection_name: str, *, mode: str = "recursive") -> Path:
+    index = LexicalIndex.build(df, mode=mode)
+    out_dir = lexical_index_dir(collection_name)
+    index.save(out_dir)
+    return out_dir
+
+
+def main() -> None:
+    """
+    청크 저장소로 BM25 인덱스 생성.
+    RAG_MODE=recursive QDRANT_COLLECTION=rfp_recursive_DUMMY PYTHONPATH=$(pwd) python -m modules.retrieval.lexical
+    """
+    from modules.loader import attach_project_fields, load_chunks_df, load_project_fields
+    from modules.retrieval.retriever import RetrieverSettings
+
+    settings = RetrieverSettings()
+    df = load_chunks_df(settings.mode, columns=["doc_id", "chunk_id", "text", "source"])
+    df = df[df["text"].fillna("").astype(str).str.strip() != ""]
+    try:
+        df = attach_project_fields(df, load_project_fields())
+    except FileNotFoundError as e:
+        print(f"[WARN] 공고 필드 join 생략: {e}")
+
+    t0 = time.perf_counter()
+    out_dir = build_lexical_index(df, settings.collection_name, mode=settings.mode)
+    print(f"[OK] lexical index: {out_dir} docs={len(df)} ({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
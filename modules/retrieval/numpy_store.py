@@ -0,0 +1,353 @@
+# modules/retrieval/numpy_store.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+from langchain_core.documents import Document
+
+from modules.embedding.embedder import embed_matrix
+from modules.embedding.manifest import chunk_key, embeddings_id, point_id
+from modules.embedding.pipeline import iter_batches
+from modules.paths import ProjectPaths
+from modules.retrieval.filters import SearchFilters, upper_bound, to_datetime
+
+
+# payload 테이블에 컬럼으로 따로 두는 필드 (필터 mask를 벡터화해서 계산)
+_FILTER_COLUMNS = {
+    "source": pa.string(),
+    "budget": pa.float64(),
+    "agency": pa.string(),
+    "published_at": pa.timestamp("us"),
+    "bid_deadline": pa.timestamp("us"),
+}
+
+# 한 번에 곱하는 행 수 (block × 쿼리 수 점수 행렬만 메모리에 올라감)
+_BLOCK_ROWS = 32_768
+
+
+def numpy_index_dir(collection_name: str, paths: Optional[ProjectPaths] = None) -> Path:
+    paths = paths or ProjectPaths()
+    return Path(paths.outputs_dir) / "numpy_index" / collection_name
+
+
+def _payload_batch(documents: List[Document]) -> pa.RecordBatch:
+    metas = [d.metadata or {} for d in documents]
+    columns = {
+        "id": pa.array([point_id(chunk_key(m)) for m in metas], pa.string()),
+        "text": pa.array([d.page_content for d in documents], pa.large_string()),
+        "metadata": pa.array([json.dumps(m, ensure_ascii=False, default=str) for m in metas], pa.string()),
+    }
+    for name, typ in _FILTER_COLUMNS.items():
+        values = [m.get(name) for m in metas]
+        if pa.types.is_timestamp(typ):
+            values = [to_datetime(v) for v in values]
+        columns[name] = pa.array(values, typ)
+    return pa.RecordBatch.from_pydict(columns)
+
+
+class NumpyIndex:
+    """
+    Qdrant 대신 쓰는 in-process 완전 탐색(exact) 인덱스.
+
+    - vectors.npy: 정규화된 (n, dim) float32/float16 행렬 → memory-map으로 열어서 시작이 즉시
+    - payload.arrow: 행 번호 → id / text / metadata(JSON) + 필터용 컬럼(source, budget, agency, 날짜)
+    - 검색: 쿼리 행렬과 block 단위 행렬곱 → argpartition으로 top-k (cosine = 내적)
+
+    코퍼스가 수십만 청크 이하면 HNSW 없이도 정확하고 빠름 (Qdrant local mode의 client/lock 비용 없음).
+    """
+
+    def __init__(self, *, vectors: np.ndarray, payload: pa.Table, collection_name: str, meta: dict):
+        self.vectors = vectors
+        self.payload = payload
+        self.collection_name = collection_name
+        self.meta = meta
+
+    @property
+    def size(self) -> int:
+        return int(self.vectors.shape[0])
+
+    @classmethod
+    def build(
+        cls,
+        documents: Iterable[Document],
+        embeddings,
+        out_dir: Path,
+        *,
+        dtype: str = "float32",
+        batch_size: int = 256,
+    ) -> int:
+        """
+        documents를 배치로 임베딩해서 out_dir에 저장. documents는 generator여도 됨 (한 번만 순회).
+        반환: 저장한 벡터 수
+        """
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        raw_path = out_dir / "vectors.raw.tmp"
+        payload_tmp = out_dir / "payload.arrow.tmp"
+
+        n, dim = 0, None
+        writer = None
+        with open(raw_path, "wb") as raw, pa.OSFile(str(payload_tmp), "wb") as sink:
+            for batch in iter_batches(documents, batch_size):
+                m = embed_matrix(embeddings, [d.page_content for d in batch])
+                norms = np.linalg.norm(m, axis=1, keepdims=True)
+                np.divide(m, norms, out=m, where=norms > 0)
+                raw.write(m.astype(dtype, copy=False).tobytes())
+
+                record = _payload_batch(batch)
+                if writer is None:
+                    writer = pa.ipc.new_file(sink, record.schema)
+                writer.write_batch(record)
+
+                n += len(batch)
+                dim = m.shape[1]
+            if writer is not None:
+                writer.close()
+
+        dim = dim or 0
+        # 원시 바이트 → .npy (헤더 + 같은 바이트). block 단위로 복사해서 메모리 일정
+        vectors = np.lib.format.open_memmap(out_dir / "vectors.npy.tmp", mode="w+", dtype=dtype, shape=(n, dim))
+        if n:
+            raw_vectors = np.memmap(raw_path, dtype=dtype, mode="r", shape=(n, dim))
+            for start in range(0, n, _BLOCK_ROWS):
+                vectors[start : start + _BLOCK_ROWS] = raw_vectors[start : start + _BLOCK_ROWS]
+            del raw_vectors
+        vectors.flush()
+        del vectors
+        raw_path.unlink()
+
+        (out_dir / "vectors.npy.tmp").replace(out_dir / "vectors.npy")
+        if n:
+            payload_tmp.replace(out_dir / "payload.arrow")
+        else:
+            payload_tmp.unlink(missing_ok=True)
+            feather.write_feather(pa.table({"id": pa.array([], pa.string())}), str(out_dir / "payload.arrow"))
+
+        # meta.json을 마지막에 써서 "완성된 인덱스"의 표시로 사용
+        (out_dir / "meta.json").write_text(
+            json.dumps(
+                {
+                    "count": n,
+                    "dim": dim,
+                    "dtype": dtype,
+                    "embeddings": embeddings_id(embeddings),
+                    "built_at": time.time(),
+                }
+            ),
+            encoding="utf-8",
+        )
+        return n
+
+    @classmethod
+    def load(cls, out_dir: Path, collection_name: str) -> "NumpyIndex":
+        out_dir = Path(out_dir)
+        meta = json.loads((out_dir / "meta.json").read_text(encoding="utf-8"))
+        with pa.memory_map(str(out_dir / "payload.arrow"), "r") as source:
+            payload = pa.ipc.open_file(source).read_all()
+        return cls(
+            vectors=np.load(out_dir / "vectors.npy", mmap_mode="r"),
+            payload=payload,
+            collection_name=collection_name,
+            meta=meta,
+        )
+
+    def check_embeddings(self, embeddings) -> None:
+        """
+        검색에 쓸 임베딩 모델이 build 때와 같은지 확인 (meta.json의 embeddings / dim).
+        다르면 차원이 같아도 점수가 의미 없으니 ValueError (Qdrant 경로처럼 바로 실패).
+        """
+        built = self.meta.get("embeddings")
+        current = embeddings_id(embeddings)
+        if built is not None and built != current:
+            raise ValueError(
+                f"NumPy 인덱스 임베딩 모델 불일치: {self.collection_name} index={built} query={current} "
+                "(EMBEDDINGS_BACKEND를 맞추거나 python -m modules.retrieval.numpy_store 로 다시 build)"
+            )
+
+    def filter_mask(self, filters: Optional[SearchFilters]) -> Optional[np.ndarray]:
+        """
+        SearchFilters → 행별 bool mask (pyarrow compute로 벡터화). 조건이 없으면 None.
+        """
+        if filters is None or filters.is_empty() or "source" not in self.payload.column_names:
+            return None
+
+        t = self.payload
+        conds = []
+        if filters.budget_min is not None:
+            conds.append(pc.greater_equal(t["budget"], filters.budget_min))
+        if filters.budget_max is not None:
+            conds.append(pc.less_equal(t["budget"], filters.budget_max))
+        if filters.agencies:
+            conds.append(pc.is_in(t["agency"], value_set=pa.array(filters.agencies, pa.string())))
+        if filters.sources:
+            conds.append(pc.is_in(t["source"], value_set=pa.array(filters.sources, pa.string())))
+
+        for column, lo, hi in (
+            ("published_at", filters.published_from, filters.published_to),
+            ("bid_deadline", filters.deadline_from, filters.deadline_to),
+        ):
+            if lo is not None:
+                conds.append(pc.greater_equal(t[column], pa.scalar(to_datetime(lo), pa.timestamp("us"))))
+            if hi is not None:
+                conds.append(pc.less_equal(t[column], pa.scalar(upper_bound(hi), pa.timestamp("us"))))
+
+        mask = conds[0]
+        for c in conds[1:]:
+            mask = pc.and_(mask, c)
+        # null(필드 없음)은 탈락
+        return pc.fill_null(mask, False).to_numpy(zero_copy_only=False)
+
+    def search_vectors(
+        self,
+        queries: np.ndarray,
+        *,
+        k: int,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[List[tuple[int, float]]]:
+        """
+        (m, dim) 쿼리 행렬 → 쿼리별 [(행 번호, cosine 점수)] 점수 내림차순 top-k.
+        filters가 있으면 조건에 맞는 행만 곱함 (후보가 적을수록 빨라짐).
+        """
+        q = np.ascontiguousarray(queries, dtype=np.float32)
+        if q.ndim == 1:
+            q = q[None, :]
+        dim = self.meta.get("dim", self.vectors.shape[1])
+        if self.size and q.shape[1] != dim:
+            raise ValueError(
+                f"NumPy 인덱스 차원 불일치: {self.collection_name} index dim={dim} query dim={q.shape[1]} "
+                "(build 때와 같은 임베딩 모델로 검색해야 함)"
+            )
+        norms = np.linalg.norm(q, axis=1, keepdims=True)
+        np.divide(q, norms, out=q, where=norms > 0)
+
+        mask = self.filter_mask(filters)
+        rows = np.flatnonzero(mask) if mask is not None else None
+        n = self.size if rows is None else rows.size
+        if n == 0 or k <= 0:
+            return [[] for _ in range(q.shape[0])]
+
+        best_idx = np.empty((q.shape[0], 0), dtype=np.int64)
+        best_score = np.empty((q.shape[0], 0), dtype=np.float32)
+
+        for start in range(0, n, _BLOCK_ROWS):
+            if rows is None:
+                idx = np.arange(start, min(start + _BLOCK_ROWS, n))
+                block = self.vectors[start : start + _BLOCK_ROWS]
+            else:
+                idx = rows[start : start + _BLOCK_ROWS]
+                block = self.vectors[idx]
+
+            if block.dtype != np.float32:
+                # float16은 BLAS 행렬곱이 없어서 block마다 float32로 올려서 곱함 (저장/메모리만 절반)
+                block = block.astype(np.float32)
+            scores = q @ block.T  # (m, block)
+            kk = min(k, scores.shape[1])
+            part = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+
+            best_idx = np.concatenate([best_idx, idx[part]], axis=1)
+            best_score = np.concatenate([best_score, np.take_along_axis(scores, part, axis=1)], axis=1)
+            if best_idx.shape[1] > k:
+                keep = np.argpartition(-best_score, k - 1, axis=1)[:, :k]
+                best_idx = np.take_along_axis(best_idx, keep, axis=1)
+                best_score = np.take_along_axis(best_score, keep, axis=1)
+
+        # 점수 내림차순 (같으면 행 번호 순 → 결과가 항상 같게)
+        order = np.lexsort((best_idx, -best_score), axis=1) if best_idx.shape[1] else best_idx
+        best_idx = np.take_along_axis(best_idx, order, axis=1)
+        best_score = np.take_along_axis(best_score, order, axis=1)
+        return [list(zip(i.tolist(), s.tolist())) for i, s in zip(best_idx, best_score)]
+
+    def document(self, i: int) -> Document:
+        # QdrantVectorStore.similarity_search와 같은 모양 (metadata에 _id, _collection_name)
+        metadata = json.loads(self.payload["metadata"][i].as_py())
+        metadata["_id"] = self.payload["id"][i].as_py()
+        metadata["_collection_name"] = self.collection_name
+        return Document(page_content=self.payload["text"][i].as_py() or "", metadata=metadata)
+
+    def search_by_vectors(
+        self,
+        queries: np.ndarray,
+        *,
+        k: int,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[List[Document]]:
+        return [[self.document(i) for i, _ in hits] for hits in self.search_vectors(queries, k=k, filters=filters)]
+
+
+_INDEXES: dict[Path, tuple[int, NumpyIndex]] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def numpy_index_version(collection_name: str) -> int:
+    # 다시 build하면 바뀌는 값 (meta.json 수정시각, 없으면 0) → 검색 결과 캐시 키에 사용
+    try:
+        return (numpy_index_dir(collection_name) / "meta.json").stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def get_numpy_index(collection_name: str) -> NumpyIndex:
+    """
+    컬렉션의 NumPy 인덱스를 (프로세스당 1번) 로드. 다시 build되면 자동으로 새로 로드.
+    """
+    out_dir = numpy_index_dir(collection_name)
+    version = numpy_index_version(collection_name)
+    if not version:
+        raise FileNotFoundError(
+            f"NumPy 인덱스가 없습니다: {out_dir} (python -m modules.retrieval.numpy_store 로 생성)"
+        )
+
+    with _INDEXES_LOCK:
+        cached = _INDEXES.get(out_dir)
+        if cached is None or cached[0] != version:
+            cached = (version, NumpyIndex.load(out_dir, collection_name))
+            _INDEXES[out_dir] = cached
+        return cached[1]
+
+
+def build_numpy_index(
+    documents: Iterable[Document],
+    embeddings,
+    collection_name: str,
+    *,
+    dtype: Optional[str] = None,
+    batch_size: int = 256,
+) -> Path:
+    dtype = dtype or os.getenv("NUMPY_INDEX_DTYPE", "float32")
+    out_dir = numpy_index_dir(collection_name)
+    NumpyIndex.build(documents, embeddings, out_dir, dtype=dtype, batch_size=batch_size)
+    return out_dir
+
+
+def main() -> None:
+    """
+    청크 저장소로 NumPy 인덱스 생성 (RETRIEVAL_BACKEND=numpy 검색용).
+    RAG_MODE=recursive QDRANT_COLLECTION=rfp_recursive_DUMMY NUMPY_INDEX_DTYPE=float16 \\
+        PYTHONPATH=$(pwd) python -m modules.retrieval.numpy_store
+    """
+    from modules.embedding.build_qdrant import iter_documents, with_project_fields
+    from modules.loader import iter_chunks_df
+    from modules.retrieval.registry import get_registry
+    from modules.retrieval.retriever import RetrieverSettings
+
+    settings = RetrieverSettings()
+    embeddings = get_registry().get_embeddings()
+    docs = iter_documents(with_project_fields(iter_chunks_df(settings.mode)), settings.mode)
+
+    t0 = time.perf_counter()
+    out_dir = build_numpy_index(docs, embeddings, settings.collection_name)
+    meta = json.loads((out_dir / "meta.json").read_text(encoding="utf-8"))
+    print(f"[OK] numpy index: {out_dir} count={meta['count']} dtype={meta['dtype']} ({time.perf_counter() - t0:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
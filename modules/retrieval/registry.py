@@ -0,0 +1,132 @@
+# modules/retrieval/registry.py
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from qdrant_client import QdrantClient
+from langchain_qdrant import QdrantVectorStore
+
+from modules.embedding.embedder import get_embeddings
+
+
+def _path_key(qdrant_path: Path) -> str:
+    return str(Path(qdrant_path).resolve())
+
+
+def _is_closed(client: QdrantClient) -> bool:
+    # local mode client는 close() 후 재사용 불가 → 다시 열어야 함
+    return bool(getattr(getattr(client, "_client", None), "closed", False))
+
+
+class VectorStoreRegistry:
+    """
+    프로세스 전체에서 Qdrant client / 임베딩 / VectorStore를 1번만 만들어 재사용하는 저장소.
+
+    - client: qdrant path 당 1개 (local mode는 같은 path를 두 client가 동시에 못 엶)
+    - embeddings: backend(dummy/hf) 당 1개 (hf는 bge-m3 로딩이 무거움)
+    - store: (qdrant path, collection, backend) 당 1개
+
+    search()가 매 쿼리마다 client/모델을 새로 만들지 않게 하는 게 목적.
+    스레드 안전 (Gradio 워커, eval 병렬 실행에서 같이 써도 됨).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clients: dict[str, QdrantClient] = {}
+        self._embeddings: dict[str, object] = {}
+        self._stores: dict[tuple[str, str, str], QdrantVectorStore] = {}
+
+    def get_client(self, qdrant_path: Path) -> QdrantClient:
+        """
+        qdrant_path의 local mode client.
+        QDRANT_URL이 있으면 대신 Qdrant 서버에 연결 (quantization/on-disk profile은 서버에서만 적용됨).
+        key는 path 그대로 써서 invalidate/close는 두 경우 모두 같게 동작.
+        """
+        key = _path_key(qdrant_path)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None or _is_closed(client):
+                url = os.getenv("QDRANT_URL")
+                if url:
+                    client = QdrantClient(url=url, api_key=os.getenv("QDRANT_API_KEY"))
+                else:
+                    Path(qdrant_path).mkdir(parents=True, exist_ok=True)
+                    client = QdrantClient(path=key)
+                self._clients[key] = client
+            return client
+
+    def get_embeddings(self, backend: Optional[str] = None):
+        backend = (backend or os.getenv("EMBEDDINGS_BACKEND", "dummy")).lower()
+        with self._lock:
+            if backend not in self._embeddings:
+                self._embeddings[backend] = get_embeddings(backend=backend)
+            return self._embeddings[backend]
+
+    def get_store(
+        self,
+        *,
+        qdrant_path: Path,
+        collection_name: str,
+        backend: Optional[str] = None,
+    ) -> QdrantVectorStore:
+        backend = (backend or os.getenv("EMBEDDINGS_BACKEND", "dummy")).lower()
+        key = (_path_key(qdrant_path), collection_name, backend)
+
+        with self._lock:
+            store = self._stores.get(key)
+            if store is not None and not _is_closed(store.client):
+                return store
+
+            store = QdrantVectorStore(
+                client=self.get_client(qdrant_path),
+                collection_name=collection_name,
+                embedding=self.get_embeddings(backend),
+            )
+            self._stores[key] = store
+            return store
+
+    def invalidate(
+        self,
+        *,
+        collection_name: Optional[str] = None,
+        qdrant_path: Optional[Path] = None,
+    ) -> None:
+        """
+        캐시된 store를 버림 (client/임베딩은 유지).
+        컬렉션을 지우고 다시 만들었을 때 호출. 인자를 안 주면 전부.
+        """
+        path_key = _path_key(qdrant_path) if qdrant_path is not None else None
+        with self._lock:
+            for key in list(self._stores):
+                if path_key is not None and key[0] != path_key:
+                    continue
+                if collection_name is not None and key[1] != collection_name:
+                    continue
+                del self._stores[key]
+
+    def close(self, qdrant_path: Optional[Path] = None) -> None:
+        """
+        client를 닫고 관련 store도 버림. qdrant_path를 안 주면 전부 닫음.
+        (local sqlite를 VACUUM 하거나 다른 프로세스에 path를 넘겨줄 때)
+        """
+        path_key = _path_key(qdrant_path) if qdrant_path is not None else None
+        with self._lock:
+            self.invalidate(qdrant_path=qdrant_path)
+            for key in list(self._clients):
+                if path_key is not None and key != path_key:
+                    continue
+                self._clients.pop(key).close()
+
+
+_REGISTRY = VectorStoreRegistry()
+
+# 인터프리터 종료 직전에 닫아두면 local mode client의 __del__ 경고가 안 뜸
+atexit.register(_REGISTRY.close)
+
+
+def get_registry() -> VectorStoreRegistry:
+    return _REGISTRY
@@ -0,0 +1,184 @@
+# modules/retrieval/rerank.py
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+
+class DummyReranker:
+    """
+    로컬/오프라인 테스트용 결정적 reranker (DummyEmbeddings와 같은 역할).
+    - 점수 = 쿼리/본문 글자 bigram 집합의 코사인 유사도
+    - 같은 (query, text) -> 항상 같은 점수, 모델 다운로드 없음
+    """
+    name = "dummy"
+
+    @staticmethod
+    def _bigrams(text: str) -> set[str]:
+        s = "".join(text.lower().split())
+        return {s[i : i + 2] for i in range(len(s) - 1)}
+
+    def predict(self, pairs: Sequence[Tuple[str, str]], batch_size: int = 32) -> List[float]:
+        scores = []
+        for query, text in pairs:
+            q, t = self._bigrams(query), self._bigrams(text)
+            scores.append(len(q & t) / math.sqrt(len(q) * len(t)) if q and t else 0.0)
+        return scores
+
+
+class HFReranker:
+    """
+    sentence-transformers CrossEncoder (예: BAAI/bge-reranker-v2-m3).
+    ⚠️ GCP에서만 쓰는 걸 권장 (torch 필요)
+    """
+
+    def __init__(self, model_name: str, device: str = "cpu", max_length: int = 512):
+        from sentence_transformers import CrossEncoder
+
+        self.name = model_name
+        self._model = CrossEncoder(model_name, device=device, max_length=max_length)
+
+    def predict(self, pairs: Sequence[Tuple[str, str]], batch_size: int = 32) -> List[float]:
+        scores = self._model.predict(list(pairs), batch_size=batch_size, show_progress_bar=False)
+        return [float(s) for s in scores]
+
+
+_RERANKERS: dict[str, object] = {}
+_RERANKERS_LOCK = threading.Lock()
+
+
+def get_reranker(backend: Optional[str] = None):
+    """
+    backend:
+      - "dummy": 결정적 bigram 점수 (로컬 실행 확인용)
+      - "hf": CrossEncoder (RERANK_MODEL, 기본 BAAI/bge-reranker-v2-m3)
+      - "none": reranker 없음 → 여기서 ValueError (search()는 rerank 단계를 건너뜀)
+    프로세스당 1번만 로드.
+    """
+    backend = (backend or os.getenv("RERANK_BACKEND", "dummy")).lower()
+    with _RERANKERS_LOCK:
+        if backend not in _RERANKERS:
+            if backend == "dummy":
+                _RERANKERS[backend] = DummyReranker()
+            elif backend == "hf":
+                model_name = os.getenv("RERANK_MODEL", "BAAI/bge-reranker-v2-m3")
+                device = os.getenv("RERANK_DEVICE", os.getenv("EMBEDDING_DEVICE", "cpu"))
+                print(f"[Reranker] backend=hf model={model_name} device={device}")
+                _RERANKERS[backend] = HFReranker(model_name, device=device)
+            elif backend == "none":
+                raise ValueError("RERANK_BACKEND=none: reranker가 설정되지 않음 (dummy 또는 hf로 설정)")
+            else:
+                raise ValueError(f"Unknown RERANK_BACKEND: {backend}")
+        return _RERANKERS[backend]
+
+
+class PairScoreCache:
+    """
+    (reranker, query, text) -> 점수 LRU 캐시. 같은 질문을 다시 하면 모델을 안 돌림.
+    """
+
+    def __init__(self, maxsize: int = 50_000):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, query: str, text: str) -> str:
+        h = hashlib.sha1()
+        for part in (model, query, text):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[float]:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: str, score: float) -> None:
+        with self._lock:
+            self._data[key] = score
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_PAIR_CACHE = PairScoreCache(maxsize=int(os.getenv("RERANK_CACHE_SIZE", "50000")))
+
+
+def rerank_documents(
+    query: str,
+    docs: List[Document],
+    *,
+    k: int,
+    reranker=None,
+    budget_ms: Optional[float] = None,
+    batch_size: int = 16,
+) -> List[Document]:
+    """
+    rerank_with_budget()에서 문서만 반환 (budget fallback 여부가 필요 없을 때).
+    """
+    return rerank_with_budget(query, docs, k=k, reranker=reranker, budget_ms=budget_ms, batch_size=batch_size)[0]
+
+
+def rerank_with_budget(
+    query: str,
+    docs: List[Document],
+    *,
+    k: int,
+    reranker=None,
+    budget_ms: Optional[float] = None,
+    batch_size: int = 16,
+) -> Tuple[List[Document], bool]:
+    """
+    ANN 후보 docs를 (query, chunk) 점수로 다시 정렬해서 (top-k, reranked) 반환.
+    reranked=False면 budget fallback (ANN 순서) → 결과 캐시에 넣으면 안 됨.
+
+    - 캐시에 있는 쌍은 바로 사용, 나머지만 모델에 보냄
+    - 길이가 비슷한 것끼리 배치로 묶음 (패딩 낭비 감소) → 짧은 것부터 처리
+    - budget_ms를 넘기면 남은 배치는 포기하고 ANN 순서(docs[:k]) 그대로 반환
+      (이미 계산한 점수는 캐시에 남아서 다음 요청에 재사용)
+    - budget은 배치를 시작하기 전에만 확인함 → 이미 시작한 predict()는 못 끊으니
+      최악의 경우 배치 1개 시간만큼 넘길 수 있음 (더 빡빡하게 하려면 batch_size를 줄이기)
+      마지막 배치까지 다 돌았으면 budget을 넘겼어도 rerank 결과를 그대로 씀
+    """
+    if not docs:
+        return [], True
+
+    reranker = reranker or get_reranker()
+    deadline = time.perf_counter() + budget_ms / 1000.0 if budget_ms else None
+
+    keys = [PairScoreCache.make_key(reranker.name, query, d.page_content or "") for d in docs]
+    scores: List[Optional[float]] = [_PAIR_CACHE.get(key) for key in keys]
+
+    pending = sorted(
+        (i for i, s in enumerate(scores) if s is None),
+        key=lambda i: len(docs[i].page_content or ""),
+    )
+
+    for start in range(0, len(pending), batch_size):
+        if deadline is not None and time.perf_counter() > deadline:
+            print(f"[Reranker] budget {budget_ms}ms 초과 → ANN 순서 사용")
+            return docs[:k], False
+
+        batch = pending[start : start + batch_size]
+        batch_scores = reranker.predict(
+            [(query, docs[i].page_content or "") for i in batch],
+            batch_size=batch_size,
+        )
+        for i, score in zip(batch, batch_scores):
+            scores[i] = score
+            _PAIR_CACHE.put(keys[i], score)
+
+    # 점수가 같으면 ANN 순서 유지
+    order = sorted(range(len(docs)), key=lambda i: -scores[i])
+    return [docs[i] for i in order[:k]], True
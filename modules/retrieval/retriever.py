@@ -4,14 +4,31 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Sequence, Tuple
 
-from qdrant_client import QdrantClient
+import numpy as np
+
+from qdrant_client.http import models
 from langchain_qdrant import QdrantVectorStore
 from langchain_core.documents import Document
 
+from modules.embedding.manifest import embeddings_id
+from modules.embedding.profiles import get_profile
 from modules.paths import ProjectPaths
-from modules.embedding.embedder import get_embeddings
+from modules.retrieval.cache import (
+    QUERY_EMBEDDING_CACHE,
+    RESULT_CACHE,
+    collection_version,
+    normalize_query,
+)
+from modules.retrieval.filters import SearchFilters
+from modules.retrieval.fusion import reciprocal_rank_fusion
+from modules.retrieval.lexical import get_lexical_index, lexical_index_version
+from modules.retrieval.numpy_store import get_numpy_index, numpy_index_version
+from modules.retrieval.registry import get_registry
+from modules.retrieval.rerank import get_reranker, rerank_with_budget
+from modules.utils.aio import env_timeout, run_blocking
+from modules.utils.tracing import span, trace_request
 
 
 @dataclass(frozen=True)
@@ -31,6 +48,32 @@ class RetrieverSettings:
     # Qdrant는 로컬 파일 DB로 쓰고 있으니 path만 고정
     qdrant_dir_name: str = os.getenv("QDRANT_DIR", "qdrant_db")
 
+    # dense 검색 backend
+    #    qdrant(기본): Qdrant 컬렉션 (local path 또는 QDRANT_URL)
+    #    numpy: memory-map된 벡터 행렬에서 완전 탐색 (python -m modules.retrieval.numpy_store 로 미리 생성)
+    backend: str = os.getenv("RETRIEVAL_BACKEND", "qdrant").lower()
+
+    # 컬렉션 profile (float32 | int8 | binary | float32_disk): 색인할 때와 같은 값으로
+    # 양자화 profile이면 검색 때 oversampling/rescore 옵션이 붙음
+    profile: str = os.getenv("QDRANT_PROFILE", "float32")
+
+    # Hybrid(BM25 + dense) 검색: 각각 hybrid_candidates개씩 뽑아서 RRF로 합침
+    # (BM25 인덱스는 python -m modules.retrieval.lexical 로 미리 만들어야 함)
+    hybrid: bool = os.getenv("RETRIEVAL_HYBRID", "0") == "1"
+    hybrid_candidates: int = int(os.getenv("HYBRID_CANDIDATES", "20"))
+    rrf_k: int = int(os.getenv("RRF_K", "60"))
+
+    # Rerank: rerank_candidates개 후보를 cross-encoder로 다시 정렬해서 top-k
+    #    RERANK_BACKEND: none(기본) | dummy | hf
+    #    RERANK_BUDGET_MS: 요청당 rerank 시간 제한 (넘기면 ANN 순서 그대로, 0이면 제한 없음)
+    rerank: bool = os.getenv("RERANK_BACKEND", "none").lower() != "none"
+    rerank_candidates: int = int(os.getenv("RERANK_CANDIDATES", "20"))
+    rerank_budget_ms: float = float(os.getenv("RERANK_BUDGET_MS", "0"))
+
+    # 쿼리 임베딩 / 검색 결과 메모리 캐시 (크기·TTL은 modules/retrieval/cache.py의 env 참고)
+    # 결과 캐시 키에 컬렉션 버전이 들어가서 다시 색인하면 예전 결과는 안 씀
+    cache: bool = os.getenv("RETRIEVAL_CACHE", "1") == "1"
+
 
 def get_qdrant_path(settings: RetrieverSettings) -> Path:
     paths = ProjectPaths()
@@ -41,37 +84,453 @@ def get_vectorstore(
     *,
     collection_name: Optional[str] = None,
     qdrant_path: Optional[Path] = None,
+    embeddings_backend: Optional[str] = None,
 ) -> QdrantVectorStore:
     """
     VectorStore 생성 함수.
     - 다른 모듈(Gradio/Eval/RAG chain)에서 store 만드는 방식을 통일해줌.
+    - client/임베딩은 registry에서 재사용 (매 호출마다 Qdrant 로딩/bge-m3 로딩 안 함)
     """
     settings = RetrieverSettings()
 
     qdrant_path = qdrant_path or get_qdrant_path(settings)
     collection_name = collection_name or settings.collection_name
 
-    client = QdrantClient(path=str(qdrant_path))
-    embeddings = get_embeddings()  # dummy/hf 자동 선택
-
-    return QdrantVectorStore(
-        client=client,
+    # 임베딩 backend(dummy/hf)는 embeddings_backend를 안 주면 EMBEDDINGS_BACKEND로 자동 선택
+    return get_registry().get_store(
+        qdrant_path=qdrant_path,
         collection_name=collection_name,
-        embedding=embeddings,
+        backend=embeddings_backend,
+    )
+
+
+_warned_no_lexical: set[str] = set()
+
+
+def _fuse_lexical(
+    query: str,
+    dense: List[Document],
+    *,
+    k: int,
+    collection_name: str,
+    settings: RetrieverSettings,
+    filters: Optional[SearchFilters] = None,
+) -> List[Document]:
+    """
+    dense 결과 + BM25 결과를 RRF로 합쳐 top-k. BM25 인덱스가 없으면 dense 그대로.
+    filters가 있으면 BM25 결과에도 같은 조건 적용 (dense는 Qdrant에서 이미 필터됨).
+    """
+    index = get_lexical_index(collection_name)
+    if index is None:
+        if collection_name not in _warned_no_lexical:
+            _warned_no_lexical.add(collection_name)
+            print(f"[Retriever] BM25 인덱스 없음 → dense만 사용: {collection_name}")
+        return dense[:k]
+
+    with span("fusion", candidates=settings.hybrid_candidates):
+        lexical = index.search(query, k=settings.hybrid_candidates, where=filters.matches if filters else None)
+        return reciprocal_rank_fusion([dense, lexical], k=k, rrf_k=settings.rrf_k)
+
+
+def _candidate_count(k: int, *, hybrid: bool, rerank: bool, settings: RetrieverSettings) -> int:
+    # dense 검색에서 몇 개를 가져올지 (fusion/rerank가 켜져 있으면 더 많이)
+    n = k
+    if hybrid:
+        n = max(n, settings.hybrid_candidates)
+    if rerank:
+        n = max(n, settings.rerank_candidates)
+    return n
+
+
+def _post_retrieve(
+    query: str,
+    dense: List[Document],
+    *,
+    k: int,
+    hybrid: bool,
+    rerank: bool,
+    collection_name: str,
+    settings: RetrieverSettings,
+    filters: Optional[SearchFilters] = None,
+) -> Tuple[List[Document], bool]:
+    """
+    dense 후보 → (BM25 fusion) → (rerank) → (top-k, complete)
+    complete=False면 rerank budget을 넘겨서 ANN 순서로 대신한 결과 (캐시하면 안 됨)
+    """
+    n = max(k, settings.rerank_candidates) if rerank else k
+
+    if hybrid:
+        docs = _fuse_lexical(
+            query,
+            dense,
+            k=n,
+            collection_name=collection_name,
+            settings=settings,
+            filters=filters,
+        )
+    else:
+        docs = dense[:n]
+
+    complete = True
+    if rerank:
+        with span("rerank", candidates=len(docs)) as s:
+            docs, complete = rerank_with_budget(query, docs, k=k, budget_ms=settings.rerank_budget_ms or None)
+            s.set(fallback=not complete)
+
+    return docs, complete
+
+
+def _embed_queries(embeddings, queries: Sequence[str], *, use_cache: bool) -> list:
+    """
+    정규화된 쿼리들의 임베딩. 캐시에 없는 것만 모아서 모델에 1번 요청.
+    """
+    model = embeddings_id(embeddings)
+    vectors: list = [QUERY_EMBEDDING_CACHE.get((model, q)) if use_cache else None for q in queries]
+
+    missing = sorted({q for q, v in zip(queries, vectors) if v is None})
+    if missing:
+        with span("embed", queries=len(missing)):
+            if len(missing) == 1:
+                embedded = {missing[0]: embeddings.embed_query(missing[0])}
+            else:
+                embedded = dict(zip(missing, embeddings.embed_documents(missing)))
+        for q, v in embedded.items():
+            if use_cache:
+                QUERY_EMBEDDING_CACHE.put((model, q), v)
+        vectors = [embedded[q] if v is None else v for q, v in zip(queries, vectors)]
+
+    return vectors
+
+
+def _index_version(settings: RetrieverSettings, collection_name: str) -> int:
+    # 다시 색인하면 바뀌는 값 (backend별로 Qdrant 컬렉션 버전 / NumPy 인덱스 meta.json 수정시각)
+    if settings.backend == "numpy":
+        return numpy_index_version(collection_name)
+    return collection_version(get_qdrant_path(settings), collection_name)
+
+
+def _result_key(
+    collection_name: str,
+    settings: RetrieverSettings,
+    query: str,
+    *,
+    k: int,
+    hybrid: bool,
+    rerank: bool,
+    filters=None,
+) -> tuple:
+    return (
+        str(get_qdrant_path(settings)),
+        settings.backend,
+        collection_name,
+        _index_version(settings, collection_name),
+        lexical_index_version(collection_name) if hybrid else 0,
+        settings.profile,
+        k,
+        hybrid,
+        (settings.hybrid_candidates, settings.rrf_k) if hybrid else None,
+        rerank,
+        (get_reranker().name, settings.rerank_candidates) if rerank else None,
+        filters,
+        query,
     )
 
 
+def retrieval_config(*, k: int, collection_name: Optional[str] = None) -> dict:
+    """
+    search(query, k=k) 결과를 결정하는 설정 묶음 (eval 단계 캐시 키용).
+    컬렉션/인덱스 버전이 들어가서 다시 색인하면 키가 바뀜.
+    """
+    settings = RetrieverSettings()
+    collection_name = collection_name or settings.collection_name
+
+    config = {
+        "backend": settings.backend,
+        "qdrant_path": str(get_qdrant_path(settings)),
+        "collection": collection_name,
+        "collection_version": _index_version(settings, collection_name),
+        "profile": settings.profile,
+        "embeddings": embeddings_id(get_registry().get_embeddings()),
+        "k": k,
+        "hybrid": settings.hybrid,
+        "rerank": settings.rerank,
+    }
+    if settings.hybrid:
+        config.update(
+            lexical_version=lexical_index_version(collection_name),
+            hybrid_candidates=settings.hybrid_candidates,
+            rrf_k=settings.rrf_k,
+        )
+    if settings.rerank:
+        config.update(
+            reranker=get_reranker().name,
+            rerank_candidates=settings.rerank_candidates,
+            rerank_budget_ms=settings.rerank_budget_ms,
+        )
+    return config
+
+
 def search(
     query: str,
     *,
     k: Optional[int] = None,
     collection_name: Optional[str] = None,
+    hybrid: Optional[bool] = None,
+    rerank: Optional[bool] = None,
+    filters: Optional[SearchFilters] = None,
 ) -> List[Document]:
     """
     ✅ 앞으로 검색은 무조건 이 함수만 쓰자.
+    - hybrid=True(기본: RETRIEVAL_HYBRID)면 BM25 결과와 RRF로 합침
+    - rerank=True(기본: RERANK_BACKEND != none)면 후보를 cross-encoder로 재정렬
+      (RERANK_BACKEND=none이면 rerank=True여도 건너뜀 — 설정된 reranker가 없음)
+    - filters(사업 금액/발주 기관/날짜)는 Qdrant ANN 검색 안에서 적용
+      예: search("학사 시스템", filters=SearchFilters(budget_min=1e8))
+    - 같은 질문(공백/유니코드 차이 무시)은 캐시에서 바로 반환 (RETRIEVAL_CACHE=0이면 끔)
+    """
+    return search_many(
+        [query],
+        k=k,
+        collection_name=collection_name,
+        hybrid=hybrid,
+        rerank=rerank,
+        filters=filters,
+    )[0]
+
+
+async def asearch(
+    query: str,
+    *,
+    k: Optional[int] = None,
+    collection_name: Optional[str] = None,
+    hybrid: Optional[bool] = None,
+    rerank: Optional[bool] = None,
+    filters: Optional[SearchFilters] = None,
+    timeout: Optional[float] = None,
+) -> List[Document]:
+    """
+    search()의 async 버전 (Gradio/API 서버용).
+    - 임베딩 + Qdrant 호출은 공용 스레드풀에서 실행 → 이벤트 루프를 막지 않음
+    - timeout(초, 기본 RAG_SEARCH_TIMEOUT)을 넘기면 asyncio.TimeoutError
+    """
+    timeout = timeout if timeout is not None else env_timeout("RAG_SEARCH_TIMEOUT")
+    return await run_blocking(
+        search,
+        query,
+        k=k,
+        collection_name=collection_name,
+        hybrid=hybrid,
+        rerank=rerank,
+        filters=filters,
+        timeout=timeout,
+    )
+
+
+def _point_to_document(store: QdrantVectorStore, point) -> Document:
+    # similarity_search가 돌려주는 Document와 같은 모양으로 맞춤
+    payload = point.payload or {}
+    metadata = dict(payload.get(store.metadata_payload_key) or {})
+    metadata["_id"] = point.id
+    metadata["_collection_name"] = store.collection_name
+    return Document(
+        page_content=payload.get(store.content_payload_key, ""),
+        metadata=metadata,
+    )
+
+
+def _numpy_search(
+    vectors,
+    *,
+    k: int,
+    collection_name: str,
+    batch_size: int,
+    filters,
+    embeddings_backend: Optional[str] = None,
+) -> List[List[Document]]:
+    index = get_numpy_index(collection_name)
+    # build 때와 다른 임베딩 모델이면 (차원이 같아도) 엉뚱한 순위 → 바로 에러
+    index.check_embeddings(get_registry().get_embeddings(embeddings_backend))
+    results: List[List[Document]] = []
+    for i in range(0, len(vectors), batch_size):
+        results.extend(index.search_by_vectors(np.asarray(vectors[i : i + batch_size]), k=k, filters=filters))
+    return results
+
+
+def _qdrant_search(
+    vectors,
+    *,
+    k: int,
+    collection_name: Optional[str],
+    batch_size: int,
+    params,
+    filters,
+    embeddings_backend: Optional[str] = None,
+) -> List[List[Document]]:
+    store = get_vectorstore(collection_name=collection_name, embeddings_backend=embeddings_backend)
+    query_filter = filters.to_qdrant() if filters is not None else None
+
+    results: List[List[Document]] = []
+    for i in range(0, len(vectors), batch_size):
+        requests = [
+            models.QueryRequest(
+                query=v.tolist() if hasattr(v, "tolist") else list(v),
+                limit=k,
+                filter=query_filter,
+                params=params,
+                with_payload=True,
+            )
+            for v in vectors[i : i + batch_size]
+        ]
+        responses = store.client.query_batch_points(
+            collection_name=store.collection_name,
+            requests=requests,
+        )
+        results.extend([_point_to_document(store, p) for p in r.points] for r in responses)
+
+    return results
+
+
+def search_by_vectors(
+    vectors: Sequence[Sequence[float]],
+    *,
+    k: int,
+    collection_name: Optional[str] = None,
+    batch_size: int = 64,
+    params: Optional[models.SearchParams] = None,
+    filters: Optional[SearchFilters] = None,
+    backend: Optional[str] = None,
+    embeddings_backend: Optional[str] = None,
+) -> List[List[Document]]:
+    """
+    이미 임베딩된 쿼리 벡터들로 검색 (Qdrant batch query 1번에 batch_size개씩).
+    결과는 입력 순서 그대로.
+    params를 안 주면 QDRANT_PROFILE의 검색 옵션(oversampling/rescore) 사용.
+    filters는 모든 쿼리에 같은 조건으로 적용.
+    RETRIEVAL_BACKEND=numpy면 NumPy 인덱스에서 완전 탐색 (params는 무시).
+    backend를 주면 RETRIEVAL_BACKEND 대신 사용 (eval sweep에서 backend별 비교용).
+    embeddings_backend는 vectors를 만든 임베딩 backend (안 주면 EMBEDDINGS_BACKEND, Qdrant store 선택 / NumPy 인덱스 모델 확인용).
+    """
+    settings = RetrieverSettings()
+    backend = (backend or settings.backend).lower()
+    with span("vector_search", backend=backend, queries=len(vectors), k=k):
+        if backend == "numpy":
+            return _numpy_search(
+                vectors,
+                k=k,
+                collection_name=collection_name or settings.collection_name,
+                batch_size=batch_size,
+                filters=filters,
+                embeddings_backend=embeddings_backend,
+            )
+        return _qdrant_search(
+            vectors,
+            k=k,
+            collection_name=collection_name,
+            batch_size=batch_size,
+            params=params if params is not None else get_profile(settings.profile).search_params(),
+            filters=filters,
+            embeddings_backend=embeddings_backend,
+        )
+
+
+def search_many(
+    queries: Sequence[str],
+    *,
+    k: Optional[int] = None,
+    collection_name: Optional[str] = None,
+    batch_size: int = 64,
+    hybrid: Optional[bool] = None,
+    rerank: Optional[bool] = None,
+    filters: Optional[SearchFilters] = None,
+) -> List[List[Document]]:
+    """
+    여러 쿼리를 한 번에 검색 (eval처럼 쿼리가 많을 때).
+    - 결과 캐시에 있는 쿼리는 건너뜀
+    - 나머지 쿼리 임베딩은 1번에 배치 처리 (쿼리 임베딩 캐시 사용)
+    - 검색은 Qdrant batch query로 묶어서 요청 (numpy backend면 행렬곱 1번)
+    반환: queries와 같은 순서의 List[List[Document]] (각각 search(q, k=k)와 같은 결과)
+    """
+    return search_many_with_status(
+        queries,
+        k=k,
+        collection_name=collection_name,
+        batch_size=batch_size,
+        hybrid=hybrid,
+        rerank=rerank,
+        filters=filters,
+    )[0]
+
+
+def search_many_with_status(
+    queries: Sequence[str],
+    *,
+    k: Optional[int] = None,
+    collection_name: Optional[str] = None,
+    batch_size: int = 64,
+    hybrid: Optional[bool] = None,
+    rerank: Optional[bool] = None,
+    filters: Optional[SearchFilters] = None,
+) -> Tuple[List[List[Document]], List[bool]]:
+    """
+    search_many() + 쿼리별 complete 여부.
+    complete=False: rerank budget을 넘겨서 ANN 순서로 대신한 결과
+    → 결과 캐시에 안 넣음 (eval 단계 캐시처럼 밖에서 결과를 저장할 때도 건너뛰어야 함)
     """
     settings = RetrieverSettings()
     k = k if k is not None else settings.k
+    hybrid = settings.hybrid if hybrid is None else hybrid
+    # RERANK_BACKEND=none이면 reranker가 없으니 rerank=True여도 건너뜀
+    rerank = settings.rerank if rerank is None else rerank and settings.rerank
+
+    if not queries:
+        return [], []
+
+    with trace_request("search", queries=len(queries)) as request:
+        collection_name = collection_name or settings.collection_name
+        queries = [normalize_query(q) for q in queries]
+        if filters is not None and filters.is_empty():
+            filters = None
+
+        results: List[Optional[List[Document]]] = [None] * len(queries)
+        complete = [True] * len(queries)
+        keys: List[Optional[tuple]] = [None] * len(queries)
+        if settings.cache:
+            for i, q in enumerate(queries):
+                keys[i] = _result_key(collection_name, settings, q, k=k, hybrid=hybrid, rerank=rerank, filters=filters)
+                cached = RESULT_CACHE.get(keys[i])
+                if cached is not None:
+                    results[i] = list(cached)
+
+        todo = [i for i, r in enumerate(results) if r is None]
+        request.set(cached=len(queries) - len(todo))
+        if not todo:
+            return results, complete
+
+        vectors = _embed_queries(get_registry().get_embeddings(), [queries[i] for i in todo], use_cache=settings.cache)
+        dense_lists = search_by_vectors(
+            vectors,
+            k=_candidate_count(k, hybrid=hybrid, rerank=rerank, settings=settings),
+            collection_name=collection_name,
+            batch_size=batch_size,
+            filters=filters,
+        )
+
+        for i, dense in zip(todo, dense_lists):
+            if hybrid or rerank:
+                dense, complete[i] = _post_retrieve(
+                    queries[i],
+                    dense,
+                    k=k,
+                    hybrid=hybrid,
+                    rerank=rerank,
+                    collection_name=collection_name,
+                    settings=settings,
+                    filters=filters,
+                )
+            results[i] = dense
+            # budget fallback은 캐시하지 않음 (다음 요청에서 다시 rerank 시도)
+            if keys[i] is not None and complete[i]:
+                RESULT_CACHE.put(keys[i], tuple(dense))
 
-    store = get_vectorstore(collection_name=collection_name)
-    return store.similarity_search(query, k=k)
+        request.set(fallback=complete.count(False))
+        return results, complete
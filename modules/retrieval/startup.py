@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict
+
+from modules.retrieval.lexical import get_lexical_index
+from modules.retrieval.numpy_store import get_numpy_index
+from modules.retrieval.registry import get_registry
+from modules.retrieval.rerank import get_reranker
+from modules.retrieval.retriever import RetrieverSettings, get_vectorstore, search_many
+
+
+def warmup() -> Dict[str, float]:
+    """
+    첫 요청이 내던 로딩 비용(Qdrant 열기 / 임베딩 모델 / BM25·NumPy 인덱스 / reranker)을 미리 처리.
+    켜져 있는 단계만 로드하고, 마지막에 검색 1번을 끝까지 돌려봄.
+    반환: 단계별 걸린 시간(초). 로딩 실패(컬렉션 없음 등)는 그대로 예외.
+    """
+    settings = RetrieverSettings()
+    timings: Dict[str, float] = {}
+
+    def _timed(name: str, fn: Callable[[], object]) -> None:
+        t0 = time.perf_counter()
+        fn()
+        timings[name] = round(time.perf_counter() - t0, 3)
+
+    _timed("embeddings", lambda: get_registry().get_embeddings().embed_query("warmup"))
+    if settings.backend == "numpy":
+        _timed("numpy_index", lambda: get_numpy_index(settings.collection_name))
+    else:
+        _timed("vectorstore", lambda: get_vectorstore().client.get_collection(settings.collection_name))
+    if settings.hybrid:
+        _timed("lexical_index", lambda: get_lexical_index(settings.collection_name))
+    if settings.rerank:
+        _timed("reranker", lambda: get_reranker().predict([("warmup", "warmup")]))
+    _timed("search", lambda: search_many(["warmup"], k=1))
+    return timings
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import os
-from typing import List, Tuple
+import time
+from typing import AsyncIterator, List, Tuple
 
 import gradio as gr
 from langchain_core.documents import Document
 
-from modules.rag import answer_query
+from modules.rag import answer_query, answer_query_async, answer_query_stream
+from modules.ui.serving import ADMISSION, READINESS
+from modules.utils.admission import Overloaded
+from modules.utils.aio import env_timeout, get_executor, run_blocking
+from modules.utils.tracing import span, trace_request
 
 import re
 
@@ -100,37 +106,128 @@ def _format_sources(docs: List[Document], max_chars: int = 350) -> str:
     return "\n".join(lines).strip()
 
 
-def run(query: str, rag_top_k: int) -> Tuple[str, str]:
-    query = (query or "").strip()
-    if not query:
-        return "질문을 입력해줘.", ""
-
-    rag_top_k = int(rag_top_k)
-
-    # RAG 실행 (더미 generator 사용)
-    answer, docs = answer_query(query, k=rag_top_k)
-
+def _render_header(query: str, rag_top_k: int, docs: List[Document]) -> str:
     # 1) 질문 품질 점수(1~10)
     q_score = _query_quality_score(query)
 
     # 2) 참고 문서(답변에 포함)
     citations = _format_citations(docs, k=rag_top_k)
 
-    # 3) 답변 텍스트를 '보고서 스타일'로 감싸기
-    answer_with_meta = (
+    # 3) 답변 위에 붙는 '보고서 스타일' 머리말
+    return (
         f"질문 품질 점수: {q_score}/10\n\n"
         f"참고 문서(답변 근거, Top-{rag_top_k}):\n"
         f"{citations}\n\n"
         f"---\n"
-        f"{answer}"
     )
 
+
+def _render(query: str, rag_top_k: int, answer: str, docs: List[Document]) -> Tuple[str, str]:
+    answer_with_meta = _render_header(query, rag_top_k, docs) + answer
+
     # 기존 아래 박스(참고문서 요약)도 유지
     sources_text = _format_sources(docs[:rag_top_k])
 
     return answer_with_meta, sources_text
 
 
+def run(query: str, rag_top_k: int) -> Tuple[str, str]:
+    query = (query or "").strip()
+    if not query:
+        return "질문을 입력해줘.", ""
+
+    rag_top_k = int(rag_top_k)
+
+    # RAG 실행 (더미 generator 사용)
+    with trace_request("gradio.run", k=rag_top_k):
+        answer, docs = answer_query(query, k=rag_top_k)
+        with span("format"):
+            return _render(query, rag_top_k, answer, docs)
+
+
+async def arun(query: str, rag_top_k: int) -> Tuple[str, str]:
+    """
+    run()의 async 버전. Gradio는 async 핸들러를 이벤트 루프에서 바로 돌려서
+    요청마다 워커 스레드를 잡아두지 않음 (블로킹 호출은 공용 스레드풀로).
+    """
+    query = (query or "").strip()
+    if not query:
+        return "질문을 입력해줘.", ""
+
+    rag_top_k = int(rag_top_k)
+
+    with trace_request("gradio.arun", k=rag_top_k) as request:
+        try:
+            answer, docs = await answer_query_async(query, k=rag_top_k)
+        except asyncio.TimeoutError:
+            request.set(timeout=True)
+            return "응답 시간이 초과됐어요. 잠시 후 다시 시도해줘.", ""
+
+        with span("format"):
+            return _render(query, rag_top_k, answer, docs)
+
+
+def _close_stream(stream) -> None:
+    # 아직 next()가 스레드에서 돌고 있으면 close가 ValueError → 그 경우는 GC가 정리
+    try:
+        stream.close()
+    except ValueError:
+        pass
+
+
+async def _stream_answer(query: str, rag_top_k: int, *, degraded: bool) -> AsyncIterator[Tuple[str, str]]:
+    timeout = env_timeout("RAG_TIMEOUT")
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    stream = answer_query_stream(query, k=rag_top_k, rerank=False if degraded else None)
+    notice = "※ 요청이 많아 간소화 모드(rerank 생략)로 답변합니다.\n\n" if degraded else ""
+    header, sources_text, answer = "", "", ""
+    try:
+        while True:
+            remaining = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+            try:
+                item = await run_blocking(next, stream, None, timeout=remaining)
+            except asyncio.TimeoutError:
+                yield header + answer + "\n\n(응답 시간이 초과됐어요. 잠시 후 다시 시도해줘.)", sources_text
+                return
+            if item is None:
+                return
+
+            token, docs = item
+            if not header:
+                header = notice + _render_header(query, rag_top_k, docs)
+                sources_text = _format_sources(docs[:rag_top_k])
+            answer += token
+            yield header + answer, sources_text
+    finally:
+        get_executor().submit(_close_stream, stream)
+
+
+async def astream(query: str, rag_top_k: int) -> AsyncIterator[Tuple[str, str]]:
+    """
+    스트리밍 핸들러 (버튼에 연결된 것).
+    - 검색이 끝나면 바로 질문 점수/인용/참고 문서를 보여주고, 답변은 토큰이 오는 대로 이어붙임
+    - 토큰은 공용 스레드풀에서 1개씩 받아옴 → 이벤트 루프를 막지 않음
+    - RAG_TIMEOUT(초)은 검색+생성 전체 제한, 넘기면 그때까지 받은 답변 뒤에 안내 문구
+    - warmup 전이면 / 대기열이 APP_MAX_QUEUE 이상이면 바로 안내 문구 (load shedding)
+    - 대기열이 길거나 최근 p95가 느리면 rerank를 건너뛰는 간소화 모드 (rerank가 켜져 있을 때만, modules/utils/admission.py)
+    TTFT(ttft_ms)와 전체 시간은 answer_query trace에 따로 기록됨.
+    """
+    query = (query or "").strip()
+    if not query:
+        yield "질문을 입력해줘.", ""
+        return
+    if not READINESS.ready:
+        yield "서버 준비 중이에요. 잠시 후 다시 시도해줘.", ""
+        return
+
+    try:
+        async with ADMISSION.admit() as ticket:
+            async for out in _stream_answer(query, int(rag_top_k), degraded=ticket.degraded):
+                yield out
+    except Overloaded:
+        yield "요청이 많아 지금은 처리할 수 없어요. 잠시 후 다시 시도해줘.", ""
+
 
 def build_demo() -> gr.Blocks:
     """
@@ -169,10 +266,14 @@ def build_demo() -> gr.Blocks:
         with gr.Row():
             out_sources = gr.Textbox(label="참고 문서 Top-k(요약)", lines=14)
 
+        # 동시 실행/대기열은 ADMISSION(APP_CONCURRENCY / APP_MAX_QUEUE)이 관리 → Gradio 쪽 제한은 풀어둠
         btn.click(
-            fn=run,
+            fn=astream,
             inputs=[query, rag_top_k],
             outputs=[out_answer, out_sources],
+            concurrency_limit=None,
         )
 
+    s = ADMISSION.settings
+    demo.queue(max_size=s.concurrency + s.max_queue if s.max_queue > 0 else None)
     return demo
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from modules.retrieval import RetrieverSettings, warmup
+from modules.utils.admission import AdmissionController
+
+
+class Readiness:
+    """
+    서버가 요청을 받을 준비가 됐는지 (warmup 완료 여부).
+    - /readyz가 이 값으로 200/503을 돌려줌 (로드밸런서/k8s readiness probe용)
+    - warmup이 실패하면 error에 사유를 남기고 backoff로 다시 시도 (Qdrant 서버가 아직 안 떴을 때 등)
+      재시도까지 다 실패하면 failed → /healthz도 503 (오케스트레이터가 프로세스를 재시작하게)
+    - start_warmup()을 안 불렀으면 (build_demo()만 단독 실행) 처음부터 ready
+      → 첫 요청이 로딩 비용을 냄
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.warming = False
+        self.failed = False
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self.started_at = time.time()
+
+    @property
+    def ready(self) -> bool:
+        return self._event.is_set() or not self.warming
+
+    def mark_ready(self, timings: Optional[Dict[str, float]] = None) -> None:
+        self.timings = timings or {}
+        self._event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "failed": self.failed,
+            "error": self.error,
+            "warmup_attempts": self.attempts,
+            "warmup_s": self.timings,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "admission": ADMISSION.stats(),
+        }
+
+
+READINESS = Readiness()
+# 간소화 모드는 rerank를 빼는 것 → rerank가 꺼져 있으면(RERANK_BACKEND=none) 간소화할 게 없음
+ADMISSION = AdmissionController(degradable=RetrieverSettings().rerank)
+
+
+def _run_warmup(retries: int, retry_s: float) -> None:
+    # 실패하면 retry_s, 2*retry_s, ... (최대 60초) 간격으로 retries번 더 시도
+    delay = retry_s
+    for attempt in range(1, retries + 2):
+        READINESS.attempts = attempt
+        try:
+            timings = warmup()
+        except Exception as e:  # 실패해도 프로세스는 살려두고 /readyz로 알림
+            READINESS.error = f"{type(e).__name__}: {e}"
+            if attempt > retries:
+                break
+            print(f"[Warmup] 실패 ({attempt}/{retries + 1}) → {delay:g}초 뒤 다시 시도: {READINESS.error}")
+            time.sleep(delay)
+            delay = min(delay * 2, 60.0)
+            continue
+        READINESS.error = None
+        print(f"[Warmup] ready ({timings})")
+        READINESS.mark_ready(timings)
+        return
+
+    READINESS.failed = True
+    print(f"[Warmup] 재시도까지 모두 실패 → /healthz 503: {READINESS.error}")
+
+
+def start_warmup() -> Readiness:
+    """
+    Qdrant / 임베딩 / BM25 / reranker를 백그라운드 스레드에서 미리 로드.
+    서버는 바로 뜨고(/healthz 200), 끝나면 /readyz가 200으로 바뀜.
+    APP_WARMUP=0이면 건너뛰고 바로 ready (첫 요청이 로딩 비용을 냄).
+    실패하면 APP_WARMUP_RETRIES번(기본 5) 더 시도, 간격은 APP_WARMUP_RETRY_S초(기본 2)부터 2배씩.
+    """
+    if os.getenv("APP_WARMUP", "1") != "1":
+        READINESS.mark_ready()
+        return READINESS
+    READINESS.warming = True
+    retries = max(0, int(os.getenv("APP_WARMUP_RETRIES", "5")))
+    retry_s = float(os.getenv("APP_WARMUP_RETRY_S", "2"))
+    threading.Thread(target=_run_warmup, args=(retries, retry_s), name="rag-warmup", daemon=True).start()
+    return READINESS
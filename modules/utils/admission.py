@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class AdmissionSettings:
+    """
+    UI 요청 동시 실행 / 대기열 / 과부하 처리 설정.
+    - concurrency: 동시에 검색+생성을 돌리는 요청 수 (나머지는 대기열에서 기다림)
+    - max_queue: 대기 중인 요청이 이 이상이면 새 요청은 바로 거절 (0이면 제한 없음)
+    - degrade_queue: 대기 중인 요청이 이 이상이면 간소화 모드 (rerank 생략, 0이면 끔)
+    - degrade_latency_ms: 최근 latency_window개 요청의 p95가 이 이상이면 간소화 모드 (0이면 끔)
+    """
+    concurrency: int = int(os.getenv("APP_CONCURRENCY", "4"))
+    max_queue: int = int(os.getenv("APP_MAX_QUEUE", "32"))
+    degrade_queue: int = int(os.getenv("APP_DEGRADE_QUEUE", "8"))
+    degrade_latency_ms: float = float(os.getenv("APP_DEGRADE_LATENCY_MS", "0"))
+    latency_window: int = int(os.getenv("APP_LATENCY_WINDOW", "50"))
+
+
+class Overloaded(Exception):
+    """대기열이 가득 차서 요청을 받지 않음."""
+
+
+@dataclass
+class Ticket:
+    # 입장한 요청 1개. degraded면 비싼 단계(rerank)를 건너뜀
+    degraded: bool
+    waited_ms: float = 0.0
+
+
+class AdmissionController:
+    """
+    asyncio 이벤트 루프 1개(Gradio async 핸들러) 안에서 쓰는 입장 제어.
+
+        async with controller.admit() as ticket:
+            ... rerank=False if ticket.degraded else None ...
+
+    - 입장 시점의 대기열 길이 / 최근 p95로 거절(Overloaded) 또는 간소화(degraded)를 결정
+      (degradable=False면 줄일 단계가 없으니 간소화 안 함, 예: RERANK_BACKEND=none)
+    - 동시 실행은 concurrency개로 제한, 나머지는 도착 순서대로 대기
+    - 요청이 끝나면 전체 시간(대기 포함)을 최근 latency 창에 기록
+    """
+
+    def __init__(self, settings: Optional[AdmissionSettings] = None, *, degradable: bool = True):
+        self.settings = settings or AdmissionSettings()
+        self.degradable = degradable
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._latencies: deque = deque(maxlen=max(1, self.settings.latency_window))
+        self.waiting = 0
+        self.running = 0
+        self.admitted = 0
+        self.degraded = 0
+        self.rejected = 0
+
+    def p95_ms(self) -> float:
+        return float(np.percentile(list(self._latencies), 95)) if self._latencies else 0.0
+
+    def _should_degrade(self) -> bool:
+        if not self.degradable:
+            return False
+        s = self.settings
+        if s.degrade_queue > 0 and self.waiting >= s.degrade_queue:
+            return True
+        return s.degrade_latency_ms > 0 and self.p95_ms() >= s.degrade_latency_ms
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[Ticket]:
+        s = self.settings
+        if s.max_queue > 0 and self.waiting >= s.max_queue:
+            self.rejected += 1
+            raise Overloaded(f"queue full (waiting={self.waiting})")
+
+        ticket = Ticket(degraded=self._should_degrade())
+        self.admitted += 1
+        self.degraded += int(ticket.degraded)
+        if self._semaphore is None:
+            # 이벤트 루프 안에서 처음 쓸 때 생성
+            self._semaphore = asyncio.Semaphore(max(1, s.concurrency))
+
+        t0 = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        ticket.waited_ms = (time.perf_counter() - t0) * 1000
+
+        self.running += 1
+        try:
+            yield ticket
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+            self._latencies.append((time.perf_counter() - t0) * 1000)
+
+    def stats(self) -> dict:
+        return {
+            "waiting": self.waiting,
+            "running": self.running,
+            "p95_ms": round(self.p95_ms(), 3),
+            "admitted": self.admitted,
+            "degraded": self.degraded,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    async 경로에서 블로킹 호출(임베딩, Qdrant, LLM)을 돌리는 공용 스레드풀.
+    - 크기 고정(ASYNC_MAX_WORKERS, 기본 8) → 동시 요청이 몰려도 모델 호출 수는 이 이상 안 늘어남
+    """
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            workers = int(os.getenv("ASYNC_MAX_WORKERS", "8"))
+            _EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rag-blocking")
+        return _EXECUTOR
+
+
+async def run_blocking(
+    fn: Callable[..., T],
+    *args: Any,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> T:
+    """
+    블로킹 함수를 공용 스레드풀에서 실행하고 결과를 await.
+
+    - timeout(초)을 넘기면 asyncio.TimeoutError
+    - 호출한 쪽 task가 취소되면 기다리던 future도 같이 취소됨
+      (이미 실행 중인 스레드 작업은 끝까지 돌지만 결과는 버려짐)
+    - contextvars를 복사해서 실행 → 스레드 안에서 열린 tracing span도 같은 요청 trace에 기록됨
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    fut = loop.run_in_executor(get_executor(), functools.partial(ctx.run, fn, *args, **kwargs))
+    return await asyncio.wait_for(fut, timeout)
+
+
+def iterate_in_context(iterator: Iterator[T]) -> Iterator[T]:
+    """
+    iterator(generator)의 모든 단계를 같은 contextvars.Context 1개에서 실행.
+
+    Gradio/run_blocking처럼 next()를 매번 다른 스레드·context에서 부르면
+    generator 안에서 연 trace_request가 yield를 넘어가며 다른 context에서 reset돼서 깨짐.
+    처음 next() 때의 context를 복사해두고 next/close를 항상 그 안에서 실행해서 막음.
+    """
+    ctx = contextvars.copy_context()
+    it = iter(iterator)
+    try:
+        while True:
+            try:
+                item = ctx.run(next, it)
+            except StopIteration:
+                return
+            yield item
+    finally:
+        close = getattr(it, "close", None)
+        if close is not None:
+            ctx.run(close)
+
+
+def env_timeout(name: str) -> Optional[float]:
+    # 환경변수 timeout(초). 비어 있거나 0이면 제한 없음
+    value = float(os.getenv(name, "0") or 0)
+    return value if value > 0 else None
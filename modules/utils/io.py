@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Iterator
 import pandas as pd
 
 
@@ -9,14 +10,45 @@ def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def read_csv(csv_path: Path) -> pd.DataFrame:
+def read_csv(csv_path: Path, **kwargs) -> pd.DataFrame:
     
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV 파일이 없습니다: {csv_path}")
-    return pd.read_csv(csv_path)
+    return pd.read_csv(csv_path, **kwargs)
+
+
+def iter_csv(csv_path: Path, chunksize: int, **kwargs) -> Iterator[pd.DataFrame]:
+    # 큰 CSV를 chunksize 행씩 나눠서 읽음 (전체를 메모리에 올리지 않음)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV 파일이 없습니다: {csv_path}")
+    with pd.read_csv(csv_path, chunksize=chunksize, **kwargs) as reader:
+        yield from reader
 
 
 def write_csv(df: pd.DataFrame, csv_path: Path, index: bool = False) -> None:
     
     ensure_dir(csv_path.parent)
     df.to_csv(csv_path, index=index)
+
+
+def write_csv_stream(frames: Iterator[pd.DataFrame], csv_path: Path) -> int:
+    """
+    DF 조각들을 하나의 CSV로 이어 붙여 저장 (헤더는 처음 1번만).
+    - 임시 파일에 쓰고 끝나면 교체 → 중간에 죽어도 기존 CSV가 반쯤 덮어써지지 않음
+    - 반환: 저장한 총 행 수
+    """
+    ensure_dir(csv_path.parent)
+    tmp_path = csv_path.with_name(csv_path.name + ".tmp")
+
+    total = 0
+    header = True
+    with tmp_path.open("w", encoding="utf-8", newline="") as f:
+        for frame in frames:
+            if frame.empty and not header:
+                continue
+            frame.to_csv(f, index=False, header=header)
+            header = False
+            total += len(frame)
+
+    tmp_path.replace(csv_path)
+    return total
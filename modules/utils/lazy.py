@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    패키지 __init__의 PEP 562 __getattr__ / __dir__ 생성.
+    exports = {"공개 이름": ".하위모듈"} → 그 이름에 처음 접근할 때 하위 모듈을 import.
+    하위 모듈 안의 이름이 다르면 ".하위모듈:이름" (예: {"run_mixed_eval": ".mixed_eval:main"}).
+
+        __getattr__, __dir__ = lazy_exports(__name__, {"search": ".retriever"})
+
+    → `import modules.retrieval`만으로는 qdrant_client 등 무거운 의존성을 안 불러옴.
+    한 번 불러온 값은 패키지 globals에 넣어서 다음부터는 일반 속성 조회.
+    (공개 이름과 하위 모듈 이름이 같으면 submodule import가 속성을 덮으니 이름을 다르게)
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        target = exports.get(name)
+        if target is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module, _, attr = target.partition(":")
+        value = getattr(importlib.import_module(module, package), attr or name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import resource
+import sys
+from typing import Optional
+
+
+def peak_rss_mb() -> float:
+    """
+    이 프로세스의 최대 RSS(high-water mark, MB).
+    ru_maxrss 단위: Linux는 KB, macOS는 bytes
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / scale
+
+
+def current_rss_mb() -> Optional[float]:
+    # 현재 RSS(MB). /proc이 없는 OS(macOS 등)에서는 None
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * resource.getpagesize() / (1024 * 1024)
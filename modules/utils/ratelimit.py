@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    분당 호출 수 제한 (여러 스레드가 같이 써도 됨).
+    acquire()가 다음 호출 가능 시각까지 기다렸다가 반환 → 호출 간격이 60/rpm초 이상으로 유지됨.
+    rpm <= 0이면 제한 없음.
+    """
+
+    def __init__(self, rpm: float):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, Optional
+
+from modules.paths import ProjectPaths
+
+
+@dataclass(frozen=True)
+class TracingSettings:
+    """
+    RAG 경로 단계별 시간 측정 설정.
+    - trace: 요청 1개 = JSONL 1줄 (단계별 span 포함) → logs_dir/rag_traces.jsonl
+    - metrics_port: 0보다 크면 start_metrics_server()가 prometheus_client HTTP 엔드포인트(/metrics)를
+      metrics_addr:metrics_port에 띄움 (import만으로는 안 띄움 → 서버 진입점(app.py)에서 호출)
+    둘 다 꺼져 있으면 span()은 아무것도 안 하는 공용 객체를 돌려줌 (측정 비용 거의 0)
+    """
+    trace: bool = os.getenv("RAG_TRACE", "0") == "1"
+    trace_path: str = os.getenv("RAG_TRACE_PATH", str(ProjectPaths().logs_dir / "rag_traces.jsonl"))
+    metrics_port: int = int(os.getenv("RAG_METRICS_PORT", "0"))
+    metrics_addr: str = os.getenv("RAG_METRICS_ADDR", "127.0.0.1")
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Metrics:
+    # prometheus_client는 start_metrics_server()를 부를 때만 import
+    # 전용 registry를 써서 엔드포인트를 못 띄웠을 때(포트 사용 중 등) 전역 registry에 흔적이 안 남음
+    def __init__(self, port: int, addr: str):
+        from prometheus_client import CollectorRegistry, Counter, Histogram, start_http_server
+
+        registry = CollectorRegistry()
+        buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+        self.stage_seconds = Histogram(
+            "rag_stage_seconds", "RAG 단계별 소요 시간(초)", ["stage"], buckets=buckets, registry=registry
+        )
+        self.stage_errors = Counter("rag_stage_errors_total", "RAG 단계별 예외 수", ["stage"], registry=registry)
+        self.request_seconds = Histogram(
+            "rag_request_seconds", "요청 전체 소요 시간(초)", ["name"], buckets=buckets, registry=registry
+        )
+        self.requests = Counter("rag_requests_total", "요청 수", ["name", "status"], registry=registry)
+        start_http_server(port, addr=addr, registry=registry)
+        print(f"[Tracing] metrics: http://{addr}:{port}/metrics")
+
+
+class _Trace:
+    """
+    요청 1개의 span 모음. contextvar로 전달돼서 같은 요청 안의 span이 여기로 모임
+    (run_blocking이 context를 복사하므로 스레드풀 안에서 열린 span도 포함).
+    """
+
+    def __init__(self, name: str, attrs: dict):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.attrs = attrs
+        self.started_at = datetime.now().isoformat(timespec="milliseconds")
+        self.t0 = time.perf_counter()
+        self.spans: List[dict] = []  # list.append는 스레드 안전
+
+
+_CURRENT: contextvars.ContextVar[Optional[_Trace]] = contextvars.ContextVar("rag_trace", default=None)
+
+
+def _is_error(exc_type) -> bool:
+    # 스트리밍 중 클라이언트가 끊으면(UI 닫기 등) 생성기에 GeneratorExit → 에러가 아니라 취소로 기록
+    return exc_type is not None and not issubclass(exc_type, GeneratorExit)
+
+
+class _Span:
+    __slots__ = ("name", "attrs", "t0", "trace")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.trace = _CURRENT.get()
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        seconds = end - self.t0
+        failed = _is_error(exc_type)
+        if _METRICS is not None:
+            _METRICS.stage_seconds.labels(self.name).observe(seconds)
+            if failed:
+                _METRICS.stage_errors.labels(self.name).inc()
+        if self.trace is not None:
+            record = {
+                "name": self.name,
+                "offset_ms": round((self.t0 - self.trace.t0) * 1000, 3),
+                "duration_ms": round(seconds * 1000, 3),
+            }
+            if self.attrs:
+                record["attrs"] = self.attrs
+            if failed:
+                record["error"] = exc_type.__name__
+            elif exc_type is not None:
+                record["cancelled"] = True
+            self.trace.spans.append(record)
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        # 실행 중에 알게 된 값(캐시 hit 수, 결과 수 등)을 span에 추가
+        self.attrs.update(attrs)
+
+
+class _Request:
+    __slots__ = ("trace", "token")
+
+    def __init__(self, trace: _Trace):
+        self.trace = trace
+
+    def __enter__(self):
+        self.token = _CURRENT.set(self.trace)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _CURRENT.reset(self.token)
+        t = self.trace
+        seconds = time.perf_counter() - t.t0
+        status = "ok" if exc_type is None else "error" if _is_error(exc_type) else "cancelled"
+        if _METRICS is not None:
+            _METRICS.request_seconds.labels(t.name).observe(seconds)
+            _METRICS.requests.labels(t.name, status).inc()
+        if _SETTINGS.trace:
+            record = {
+                "trace_id": t.trace_id,
+                "name": t.name,
+                "started_at": t.started_at,
+                "duration_ms": round(seconds * 1000, 3),
+                "status": status,
+                "attrs": t.attrs,
+                "spans": sorted(t.spans, key=lambda s: s["offset_ms"]),
+            }
+            if status == "error":
+                record["error"] = f"{exc_type.__name__}: {exc}"
+            _write(record)
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        self.trace.attrs.update(attrs)
+
+
+_SETTINGS = TracingSettings()
+_METRICS: Optional[_Metrics] = None
+_ENABLED = False
+_WRITE_LOCK = threading.Lock()
+_CONFIGURE_LOCK = threading.Lock()
+
+
+def _write(record: dict) -> None:
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    path = Path(_SETTINGS.trace_path)
+    with _WRITE_LOCK:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def configure(settings: Optional[TracingSettings] = None) -> None:
+    """
+    설정 적용 (import 때 env로 1번 호출됨). 테스트/벤치에서 켜고 끌 때 다시 호출.
+    metrics 엔드포인트는 여기서 안 띄움 (start_metrics_server).
+    """
+    global _SETTINGS, _ENABLED
+    with _CONFIGURE_LOCK:
+        _SETTINGS = settings or TracingSettings()
+        _ENABLED = _SETTINGS.trace or _METRICS is not None
+
+
+def start_metrics_server(settings: Optional[TracingSettings] = None) -> bool:
+    """
+    RAG_METRICS_PORT > 0이면 Prometheus /metrics 엔드포인트를 띄움 (프로세스당 1번, app.py에서 호출).
+    prometheus_client가 없거나 포트를 못 열면 경고만 남기고 계속 (metrics 없이 동작).
+    반환: 엔드포인트가 떠 있는지
+    """
+    global _SETTINGS, _METRICS, _ENABLED
+    with _CONFIGURE_LOCK:
+        if settings is not None:
+            _SETTINGS = settings
+        if _SETTINGS.metrics_port > 0 and _METRICS is None:
+            try:
+                _METRICS = _Metrics(_SETTINGS.metrics_port, _SETTINGS.metrics_addr)
+            except ImportError:
+                print("[WARN] prometheus_client 없음 → metrics 엔드포인트 생략 (pip install prometheus_client)")
+            except OSError as e:
+                print(
+                    f"[WARN] metrics 엔드포인트를 못 띄움 ({_SETTINGS.metrics_addr}:{_SETTINGS.metrics_port}: {e}) "
+                    "→ metrics 생략"
+                )
+        _ENABLED = _SETTINGS.trace or _METRICS is not None
+        return _METRICS is not None
+
+
+def span(name: str, **attrs: Any):
+    """
+    단계 1개 시간 측정.
+
+        with span("vector_search", backend="qdrant") as s:
+            ...
+            s.set(results=len(docs))
+
+    꺼져 있으면 공용 no-op 객체 (attrs dict 생성 외에는 비용 없음).
+    """
+    if not _ENABLED:
+        return _NOOP
+    return _Span(name, attrs)
+
+
+def trace_request(name: str, **attrs: Any):
+    """
+    요청 1개(answer_query, Gradio run 등)의 trace 시작. 끝나면 JSONL 1줄로 기록.
+    이미 다른 요청 trace 안이면 새 trace를 만들지 않고 span으로 기록 (중첩 호출).
+    """
+    if not _ENABLED:
+        return _NOOP
+    if _CURRENT.get() is not None:
+        return _Span(name, attrs)
+    return _Request(_Trace(name, attrs))
+
+
+configure(_SETTINGS)
@@ -0,0 +1,112 @@
+# scripts/check_import_time.py
+"""
+패키지 import 시간 예산 체크 (python -X importtime 기준).
+
+    python scripts/check_import_time.py
+
+- 각 모듈을 새 프로세스에서 import해서 프로젝트 코드(modules.*)의 self 시간 합(가장 빠른 값)을 예산과 비교
+  (cumulative는 typing 같은 stdlib 로딩이 대부분이라 머신/캐시 상태에 따라 흔들림 → 참고용으로만 출력)
+- 가벼워야 하는 진입점에서 무거운 의존성(qdrant_client, pandas 등)이 import되면 바로 실패
+  (시간은 머신마다 흔들리지만 이건 결정적이라 회귀를 확실히 잡음)
+- IMPORT_BUDGET_SCALE=2 처럼 주면 느린 CI에서 예산을 배로
+하나라도 넘으면 exit 1.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# 패키지 진입점은 import만으로는 아래 의존성을 불러오면 안 됨 (처음 쓸 때 로드)
+HEAVY = (
+    "qdrant_client",
+    "langchain_qdrant",
+    "langchain_core",
+    "langchain_text_splitters",
+    "pandas",
+    "numpy",
+    "gradio",
+    "torch",
+    "sentence_transformers",
+)
+
+# 모듈 -> modules.* self 시간 예산(ms). 지금은 모두 1ms 안팎
+BUDGETS_MS = {
+    "modules.eval.questions": 5,
+    "modules.eval": 5,
+    "modules.retrieval": 5,
+    "modules.rag": 5,
+    "modules.generator": 5,
+    "modules.chunking": 5,
+    "modules.loader": 5,
+}
+
+RUNS = int(os.getenv("IMPORT_TIME_RUNS", "3"))
+
+
+def measure(module: str) -> tuple[float, float, set[str]]:
+    """
+    새 인터프리터에서 module을 import
+    → (modules.* self ms 합, module의 cumulative ms, import된 최상위 패키지 이름들).
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(PROJECT_ROOT), os.getenv("PYTHONPATH")]))}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    self_ms = 0.0
+    cumulative_ms = 0.0
+    imported: set[str] = set()
+    for line in proc.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative, name = line.split("|", 2)
+        self_us = self_us.split(":", 1)[1]
+        name = name.strip()
+        if not cumulative.strip().isdigit():
+            continue
+        imported.add(name.split(".")[0])
+        if name.split(".")[0] == "modules":
+            self_ms += int(self_us) / 1000
+        if name == module:
+            cumulative_ms = int(cumulative) / 1000
+    return self_ms, cumulative_ms, imported
+
+
+def main():
+    scale = float(os.getenv("IMPORT_BUDGET_SCALE", "1"))
+    failed = False
+
+    print(f"{'module':<28}{'self ms':>10}{'cum ms':>10}{'budget':>10}  status")
+    for module, budget in BUDGETS_MS.items():
+        runs = [measure(module) for _ in range(RUNS)]
+        ms = min(r[0] for r in runs)
+        cumulative = min(r[1] for r in runs)
+        heavy = sorted(set(HEAVY) & runs[0][2])
+        limit = budget * scale
+
+        status = "ok"
+        if heavy:
+            status = f"FAIL heavy import: {', '.join(heavy)}"
+        elif ms > limit:
+            status = "FAIL over budget"
+        failed = failed or status != "ok"
+        print(f"{module:<28}{ms:>10.2f}{cumulative:>10.1f}{limit:>10.1f}  {status}")
+
+    if failed:
+        print("\n[FAIL] import 예산 초과. python -X importtime -c 'import <module>' 로 원인 확인")
+        sys.exit(1)
+    print("\n[OK] import 예산 통과")
+
+
+if __name__ == "__main__":
+    main()
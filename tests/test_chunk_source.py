@@ -0,0 +1,33 @@
+# tests/test_chunk_source.py
+"""
+load_chunks_df / iter_chunks_df: Arrow 저장소가 CSV보다 오래됐으면 CSV를 읽는지.
+"""
+import os
+
+import pandas as pd
+
+from modules.loader.chunk_store import write_chunk_store
+from modules.loader.datasets import iter_chunks_df, load_chunks_df
+from modules.paths import ProjectPaths
+
+
+def _chunks(text):
+    return pd.DataFrame({"doc_id": ["d1"], "chunk_id": [0], "text": [text], "source": ["p1"]})
+
+
+def test_newer_csv_wins_over_stale_store(tmp_path):
+    paths = ProjectPaths(
+        csv_chunks_recursive=tmp_path / "chunks.csv",
+        store_chunks_recursive=tmp_path / "chunks.arrow",
+    )
+    _chunks("새 청크").to_csv(paths.csv_chunks_recursive, index=False)
+    write_chunk_store(_chunks("저장소 청크"), paths.store_chunks_recursive)
+
+    # 저장소가 더 새로우면 저장소
+    assert load_chunks_df("recursive", paths)["text"].tolist() == ["저장소 청크"]
+
+    # CSV를 나중에 다시 만들면 (CHUNK_FORMAT=csv 등) CSV
+    st = paths.store_chunks_recursive.stat()
+    os.utime(paths.csv_chunks_recursive, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert load_chunks_df("recursive", paths)["text"].tolist() == ["새 청크"]
+    assert pd.concat(iter_chunks_df("recursive", paths))["text"].tolist() == ["새 청크"]
@@ -0,0 +1,36 @@
+# tests/test_lexical.py
+"""
+BM25 인덱스를 로드해 둔 채로 다시 build해도 예전 인스턴스가 계속 검색되는지 (SIGBUS 회귀).
+"""
+import pandas as pd
+
+from modules.retrieval.lexical import LexicalIndex
+
+
+def _chunks(texts):
+    return pd.DataFrame({
+        "doc_id": [f"d{i}" for i in range(len(texts))],
+        "chunk_id": list(range(len(texts))),
+        "text": texts,
+        "source": [f"p{i}" for i in range(len(texts))],
+    })
+
+
+def test_rebuild_while_loaded(tmp_path):
+    texts = [f"학사 시스템 구축 {i} 단계 요구사항 문서 번호 {i}" for i in range(200)] + ["도서관 전산화 사업"]
+    LexicalIndex.build(_chunks(texts), tokenizer="simple").save(tmp_path)
+    old = LexicalIndex.load(tmp_path)
+    before = [d.metadata["doc_id"] for d in old.search("도서관 전산화", k=3)]
+
+    # 문서 수를 줄여서 다시 build (예전 파일을 제자리에서 덮어쓰면 여기서 old 검색이 SIGBUS)
+    LexicalIndex.build(_chunks(["도서관 전산화 사업", "학사 시스템"]), tokenizer="simple").save(tmp_path)
+    LexicalIndex.build(_chunks(["학사 시스템"]), tokenizer="simple").save(tmp_path)
+
+    assert [d.metadata["doc_id"] for d in old.search("도서관 전산화", k=3)] == before == ["d200"]
+    assert len(old.search("학사 시스템 요구사항", k=5)) == 5
+
+    new = LexicalIndex.load(tmp_path)
+    assert new.n_docs == 1
+    assert [d.metadata["doc_id"] for d in new.search("학사", k=3)] == ["d0"]
+    # 최근 build 2개만 남김
+    assert len(list(tmp_path.glob("build-*"))) == 2
@@ -0,0 +1,51 @@
+# tests/test_metrics.py
+"""
+metrics.evaluate_rankings가 예전 쿼리별 Hit/MRR 계산(retrieval_eval / mixed_eval)과 같은 값을 내는지.
+"""
+import pytest
+
+from modules.eval.metrics import evaluate_rankings
+
+
+def _old_hit_mrr(retrieved, gold, k):
+    # evaluate_rankings 이전 retrieval_eval.hit_mrr_at_k / mixed_eval._hit_mrr_at_k
+    topk = retrieved[:k]
+    hit = 1.0 if any(p in gold for p in topk) else 0.0
+    mrr, first_rank = 0.0, -1
+    for rank, p in enumerate(topk, start=1):
+        if p in gold:
+            mrr, first_rank = 1.0 / rank, rank
+            break
+    return hit, mrr, first_rank
+
+
+CASES = [
+    (["a", "b", "c", "d", "e"], {"c"}),            # 3위에 정답
+    (["a", "a", "b", "a", "c"], {"a"}),            # 같은 사업 chunk가 여러 번
+    (["x", "b", "b", "y", "b"], {"b", "y"}),       # 정답 여러 개 + 중복
+    (["a", "b", "c"], set()),                      # 정답 없음
+    (["a", "b", "c", "d", "e"], {"z"}),            # 못 찾음
+    (["a", "b"], {"b"}),                           # 결과가 k보다 적음
+    ([], {"a"}),                                   # 검색 결과 없음
+]
+KS = [1, 2, 3, 5, 10]
+
+
+@pytest.mark.parametrize("k", KS)
+def test_hit_mrr_match_old_per_query(k):
+    retrieved = [r for r, _ in CASES]
+    golds = [g for _, g in CASES]
+    m = evaluate_rankings(retrieved, golds, KS)
+
+    for i, (r, g) in enumerate(CASES):
+        hit, mrr, _ = _old_hit_mrr(r, g, k)
+        assert m.column("hit", k)[i] == hit, (r, g, k)
+        assert m.column("mrr", k)[i] == pytest.approx(mrr), (r, g, k)
+
+
+@pytest.mark.parametrize("k", KS)
+def test_first_rank_matches_old_for_single_k(k):
+    # mixed_eval은 k 1개로 부르고 first_gold_rank를 저장
+    for r, g in CASES:
+        m = evaluate_rankings([r], [g], [k])
+        assert int(m.first_rank[0]) == _old_hit_mrr(r, g, k)[2], (r, g, k)
@@ -0,0 +1,82 @@
+# tests/test_numpy_store.py
+"""
+NumPy 완전 탐색 backend: brute-force 기준과 같은 top-k인지 (필터 포함), 다른 임베딩 모델이면 에러인지.
+"""
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from modules.embedding.backends.dummy import DummyEmbeddings
+from modules.retrieval.filters import SearchFilters
+from modules.retrieval.numpy_store import NumpyIndex
+
+AGENCIES = ["교육부", "국토부", "조달청"]
+
+
+def _documents(n=300):
+    return [
+        Document(
+            page_content=f"사업 {i} 요구사항 시스템 구축 {i % 7}",
+            metadata={
+                "doc_id": f"d{i}",
+                "chunk_id": 0,
+                "source": f"p{i % 50}",
+                "budget": float(i * 1_000_000),
+                "agency": AGENCIES[i % 3],
+                "published_at": f"2024-{i % 12 + 1:02d}-15",
+            },
+        )
+        for i in range(n)
+    ]
+
+
+def _brute_force(embeddings, docs, queries, k, keep=None):
+    m = embeddings.embed_matrix([d.page_content for d in docs])
+    m /= np.linalg.norm(m, axis=1, keepdims=True)
+    q = embeddings.embed_matrix(queries)
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    scores = q @ m.T
+    if keep is not None:
+        scores[:, ~keep] = -np.inf
+    out = []
+    for row in scores:
+        order = sorted(np.flatnonzero(np.isfinite(row)), key=lambda i: (-row[i], i))[:k]
+        out.append([docs[i].metadata["doc_id"] for i in order])
+    return out
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    out_dir = tmp_path_factory.mktemp("numpy_index")
+    NumpyIndex.build(_documents(), DummyEmbeddings(dim=32), out_dir, batch_size=64)
+    return NumpyIndex.load(out_dir, "test")
+
+
+QUERIES = ["학사 시스템 구축", "사업 17 요구사항", "도서관"]
+
+
+@pytest.mark.parametrize("k", [1, 5, 20])
+def test_exact_top_k(index, k):
+    got = [[d.metadata["doc_id"] for d in hits] for hits in index.search_by_vectors(
+        DummyEmbeddings(dim=32).embed_matrix(QUERIES), k=k)]
+    assert got == _brute_force(DummyEmbeddings(dim=32), _documents(), QUERIES, k)
+
+
+def test_filters_match_brute_force(index):
+    docs = _documents()
+    filters = SearchFilters(budget_min=50e6, agencies=["교육부", "조달청"], published_to="2024-06-30")
+    keep = np.array([filters.matches(d.metadata) for d in docs])
+
+    got = index.search_by_vectors(DummyEmbeddings(dim=32).embed_matrix(QUERIES), k=10, filters=filters)
+    assert [[d.metadata["doc_id"] for d in hits] for hits in got] == _brute_force(
+        DummyEmbeddings(dim=32), docs, QUERIES, 10, keep
+    )
+    assert all(len(hits) == 10 and all(filters.matches(d.metadata) for d in hits) for hits in got)
+
+
+def test_other_embeddings_rejected(index):
+    index.check_embeddings(DummyEmbeddings(dim=32))
+    with pytest.raises(ValueError, match="임베딩 모델 불일치"):
+        index.check_embeddings(DummyEmbeddings(dim=16))
+    with pytest.raises(ValueError, match="차원 불일치"):
+        index.search_vectors(DummyEmbeddings(dim=16).embed_matrix(QUERIES), k=3)
@@ -0,0 +1,68 @@
+# tests/test_result_cache.py
+"""
+search_many 결과 캐시: rerank budget fallback은 캐시하지 않고, reranker가 바뀌면 키가 바뀌는지.
+Qdrant/임베딩 없이 retriever 모듈의 의존 함수만 바꿔서 확인.
+"""
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.documents import Document
+
+from modules.retrieval import retriever
+from modules.retrieval.cache import RESULT_CACHE
+
+
+@pytest.fixture
+def fake_search(monkeypatch):
+    state = SimpleNamespace(searches=0, reranked=True, reranker="fake-a")
+    docs = [Document(page_content=f"doc {i}", metadata={"chunk_id": i}) for i in range(5)]
+
+    def search_by_vectors(vectors, **kwargs):
+        state.searches += len(vectors)
+        return [list(docs) for _ in vectors]
+
+    def rerank_with_budget(query, docs, *, k, budget_ms=None):
+        if not state.reranked:
+            return docs[:k], False
+        return list(reversed(docs))[:k], True
+
+    settings = retriever.RetrieverSettings(rerank=True, rerank_budget_ms=1, hybrid=False, cache=True)
+    monkeypatch.setattr(retriever, "RetrieverSettings", lambda: settings)
+    monkeypatch.setattr(retriever, "get_registry", lambda: SimpleNamespace(get_embeddings=lambda: None))
+    monkeypatch.setattr(retriever, "_embed_queries", lambda emb, qs, use_cache: [[0.0] for _ in qs])
+    monkeypatch.setattr(retriever, "_index_version", lambda settings, name: 1)
+    monkeypatch.setattr(retriever, "search_by_vectors", search_by_vectors)
+    monkeypatch.setattr(retriever, "rerank_with_budget", rerank_with_budget)
+    monkeypatch.setattr(retriever, "get_reranker", lambda: SimpleNamespace(name=state.reranker))
+    RESULT_CACHE.clear()
+    yield state
+    RESULT_CACHE.clear()
+
+
+def test_budget_fallback_is_not_cached(fake_search):
+    fake_search.reranked = False
+    results, complete = retriever.search_many_with_status(["질문"], k=3)
+    assert complete == [False]
+    assert [d.metadata["chunk_id"] for d in results[0]] == [0, 1, 2]
+    assert len(RESULT_CACHE) == 0
+
+    # 다음 요청은 다시 검색 + rerank (fallback 결과를 돌려주지 않음)
+    fake_search.reranked = True
+    results, complete = retriever.search_many_with_status(["질문"], k=3)
+    assert complete == [True]
+    assert [d.metadata["chunk_id"] for d in results[0]] == [4, 3, 2]
+    assert fake_search.searches == 2
+
+    # rerank된 결과는 캐시에서 반환
+    assert retriever.search_many(["질문"], k=3) == results
+    assert fake_search.searches == 2
+
+
+def test_result_key_includes_reranker(fake_search):
+    retriever.search_many(["질문"], k=3)
+    retriever.search_many(["질문"], k=3)
+    assert fake_search.searches == 1
+
+    fake_search.reranker = "fake-b"
+    retriever.search_many(["질문"], k=3)
+    assert fake_search.searches == 2
@@ -0,0 +1,28 @@
+# tests/test_resume.py
+"""
+mixed_eval 이어하기: checkpoint jsonl에서 어떤 기록을 건너뛰는지.
+"""
+import json
+
+from modules.eval.mixed_eval import _load_checkpoint, _write_jsonl
+
+
+def test_load_checkpoint_keeps_only_matching_records(tmp_path):
+    path = tmp_path / "judgments.jsonl"
+    _write_jsonl(path, [
+        {"query_id": 1, "answer": "a", "config_hash": "h1"},
+        {"query_id": 2, "answer": "b", "config_hash": "old"},  # 설정이 바뀜
+        {"query_id": 9, "answer": "c", "config_hash": "h9"},   # 평가셋에 없음
+        {"query_id": 3, "answer": "d"},                        # config_hash 없는 예전 기록
+    ])
+    # 중간에 죽어서 잘린 마지막 줄
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"query_id": 4, "answer": "잘린"}, ensure_ascii=False)[:-5])
+
+    done = _load_checkpoint(path, {1: "h1", 2: "h2", 3: "h3", 4: "h4"})
+    assert list(done) == [1]
+    assert done[1]["answer"] == "a"
+
+
+def test_load_checkpoint_missing_file(tmp_path):
+    assert _load_checkpoint(tmp_path / "none.jsonl", {1: "h1"}) == {}
@@ -0,0 +1,31 @@
+# tests/test_stage_cache.py
+"""
+mixed_eval retrieval 단계 캐시: rerank budget fallback 결과는 sqlite에 저장하지 않는지.
+"""
+from langchain_core.documents import Document
+
+from modules.eval import mixed_eval
+from modules.eval.stage_cache import StageCache
+
+
+def test_retrieval_fallback_is_not_stored(tmp_path, monkeypatch):
+    calls = []
+
+    def search_many_with_status(queries, *, k):
+        calls.append(list(queries))
+        docs = [[Document(page_content=q, metadata={"source": q})] for q in queries]
+        # 두 번째 쿼리는 budget fallback
+        return docs, [i != 1 for i in range(len(queries))]
+
+    monkeypatch.setattr(mixed_eval, "retrieval_config", lambda k: {"k": k})
+    monkeypatch.setattr(mixed_eval, "search_many_with_status", search_many_with_status)
+    cache = StageCache(tmp_path / "stages.sqlite")
+
+    first = mixed_eval._retrieve_cached(["a", "b", "c"], top_k=5, cache=cache)
+    assert [d[0].page_content for d in first] == ["a", "b", "c"]
+
+    # 다시 실행하면 fallback이었던 쿼리만 다시 검색
+    second = mixed_eval._retrieve_cached(["a", "b", "c"], top_k=5, cache=cache)
+    assert calls == [["a", "b", "c"], ["b"]]
+    assert [d[0].page_content for d in second] == ["a", "b", "c"]
+    cache.close()